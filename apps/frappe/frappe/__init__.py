@@ -139,8 +139,18 @@ if TYPE_CHECKING:  # pragma: no cover
 	lang: str
 
 
-def init(site: str, sites_path: str = ".", new_site: bool = False, force: bool = False) -> None:
-	"""Initialize frappe for the current site. Reset thread locals `frappe.local`"""
+def init(
+	site: str,
+	sites_path: str = ".",
+	new_site: bool = False,
+	force: bool = False,
+	*,
+	cached_config: bool = False,
+) -> None:
+	"""Initialize frappe for the current site. Reset thread locals `frappe.local`
+
+	:param cached_config: Use site config cached in this process (refreshed every minute), always done
+	for requests."""
 	if getattr(local, "initialised", None) and not force:
 		return
 
@@ -178,7 +188,9 @@ def init(site: str, sites_path: str = ".", new_site: bool = False, force: bool =
 	local.response_headers = Headers()
 	local.task_id = None
 
-	local.conf = get_site_config(sites_path=sites_path, site_path=site_path, cached=bool(frappe.request))
+	local.conf = get_site_config(
+		sites_path=sites_path, site_path=site_path, cached=bool(frappe.request) or cached_config
+	)
 	local.lang = local.conf.lang or "en"
 
 	local.module_app = None
@@ -262,33 +274,31 @@ def connect(site: str | None = None, db_name: str | None = None, set_admin_as_us
 
 
 def connect_replica() -> bool:
-	from frappe.database import get_db
+	"""Switch `frappe.db` to read replica, see `frappe.database.replica`.
 
-	if hasattr(local, "replica_db") and hasattr(local, "primary_db"):
-		return False
+	Return `False` if connection wasn't switched: replica is already in use or can't be used right now."""
+	from frappe.database.replica import can_read_from_replica, get_replica_db
 
-	user = local.conf.db_user
-	password = local.conf.db_password
-	port = local.conf.replica_db_port
+	replica_db = getattr(local, "replica_db", None)
+	if replica_db is not None and local.db is replica_db:
+		return False
 
-	if local.conf.different_credentials_for_replica:
-		user = local.conf.replica_db_user or local.conf.replica_db_name
-		password = local.conf.replica_db_password
+	# Replica connection is reused for the rest of request/job
+	new_connection = replica_db is None
+	if new_connection:
+		replica_db = get_replica_db()
 
-	local.replica_db = get_db(
-		socket=None,
-		host=local.conf.replica_host,
-		port=port,
-		user=user,
-		password=password,
-		cur_db_name=local.conf.db_name,
-	)
+	if not can_read_from_replica(replica_db):
+		if new_connection:
+			replica_db.close()
+		return False
 
 	# swap db connections
+	local.replica_db = replica_db
 	local.primary_db = local.db
 	local.db = local.replica_db
 
-	if hasattr(frappe.local, "_recorder"):
+	if new_connection and hasattr(frappe.local, "_recorder"):
 		frappe.local._recorder._patch_sql(local.db)
 
 	return True
@@ -311,6 +321,10 @@ def destroy():
 	"""Closes connection and releases werkzeug local."""
 	if db:
 		db.close()
+	if replica_db := getattr(local, "replica_db", None):
+		replica_db.close()
+	if primary_db := getattr(local, "primary_db", None):
+		primary_db.close()
 
 	release_local(local)
 
@@ -402,6 +416,7 @@ whitelisted: set[Callable] = set()
 guest_methods: set[Callable] = set()
 xss_safe_methods: set[Callable] = set()
 allowed_http_methods_for_whitelisted_func: dict[Callable, list[str]] = {}
+read_only_methods: set[Callable] = set()
 
 
 def _in_request_or_test():
@@ -414,13 +429,14 @@ def _in_request_or_test():
 	return getattr(local, "request", None) or in_test
 
 
-def whitelist(allow_guest=False, xss_safe=False, methods=None):
+def whitelist(allow_guest=False, xss_safe=False, methods=None, read_only=False):
 	"""
 	Decorator for whitelisting a function and making it accessible via HTTP.
 	Standard request will be `/api/method/[path.to.method]`
 
 	:param allow_guest: Allow non logged-in user to access this method.
 	:param methods: Allowed http method to access the method.
+	:param read_only: Method doesn't write to database, GET requests can be served from read replica.
 
 	Use as:
 
@@ -436,6 +452,7 @@ def whitelist(allow_guest=False, xss_safe=False, methods=None):
 		from frappe.utils.typing_validations import validate_argument_types
 
 		global whitelisted, guest_methods, xss_safe_methods, allowed_http_methods_for_whitelisted_func
+		global read_only_methods
 
 		# validate argument types if request is present or in test context
 		fn = validate_argument_types(fn, apply_condition=_in_request_or_test)
@@ -443,6 +460,9 @@ def whitelist(allow_guest=False, xss_safe=False, methods=None):
 		whitelisted.add(fn)
 		allowed_http_methods_for_whitelisted_func[fn] = methods
 
+		if read_only:
+			read_only_methods.add(fn)
+
 		if allow_guest:
 			guest_methods.add(fn)
 
@@ -486,7 +506,6 @@ def read_only():
 				retval = fn(*args, **get_newargs(fn, kwargs))
 			finally:
 				if switched_connection and hasattr(local, "primary_db"):
-					local.db.close()
 					local.db = local.primary_db
 
 			return retval
@@ -1568,6 +1587,7 @@ from frappe.config import get_common_site_config, get_conf, get_site_config
 from frappe.core.doctype.system_settings.system_settings import get_system_settings
 from frappe.model.document import (
 	get_doc,
+	get_docs,
 	get_lazy_doc,
 	copy_doc,
 	new_doc,
@@ -1584,7 +1604,7 @@ from frappe.model.document import (
 from frappe.model.meta import get_meta
 from frappe.realtime import publish_progress, publish_realtime
 from frappe.utils import get_traceback, mock, parse_json, safe_eval, create_folder
-from frappe.utils.background_jobs import enqueue, enqueue_doc
+from frappe.utils.background_jobs import enqueue, enqueue_doc, enqueue_many
 from frappe.utils.error import log_error
 from frappe.utils.formatters import format_value
 from frappe.utils.print_utils import get_print, attach_print
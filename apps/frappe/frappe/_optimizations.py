@@ -92,6 +92,41 @@ def freeze_gc():
 	_gc_frozen = True
 
 
+def preload_meta_cache():
+	"""Build metas of all doctypes in master process so that forked web workers can share them.
+
+	Enabled by setting `FRAPPE_PRELOAD_META` to `1` (all sites) or comma separated list of sites.
+	This is only useful when app is preloaded in master process, e.g. `gunicorn --preload`.
+	"""
+	preload_sites = os.environ.get("FRAPPE_PRELOAD_META")
+	if not preload_sites:
+		return
+
+	import frappe
+	from frappe.model.meta import preload_meta_cache as preload_site_meta_cache
+	from frappe.utils import get_sites
+
+	sites_path = os.environ.get("SITES_PATH", ".")
+	if preload_sites == "1":
+		sites = get_sites(sites_path)
+	else:
+		sites = [site.strip() for site in preload_sites.split(",") if site.strip()]
+
+	for site in sites:
+		try:
+			preload_site_meta_cache(site, sites_path)
+		except Exception as e:
+			frappe.logger(with_more_info=True).error(f"failed to preload meta for {site}: {e}")
+
+	# Metas are frozen by `freeze_gc` before forking. Redis connections and the invalidator thread
+	# can't be shared with workers, they set up their own on first request. Workers only read
+	# doctypes that were modified after this from redis.
+	if frappe.client_cache:
+		frappe.client_cache.close()
+		frappe.cache.connection_pool.disconnect()
+	frappe.cache = frappe.client_cache = None
+
+
 def optimize_for_gil_contention():
 	if not os.environ.get("FRAPPE_PERF_PIN_WORKERS"):
 		return
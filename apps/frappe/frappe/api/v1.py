@@ -4,7 +4,8 @@ from werkzeug.routing import Rule
 
 import frappe
 from frappe import _
-from frappe.utils import attach_expanded_links
+from frappe.database.pagination import add_keyset_fields, get_keyset_order, get_next_cursor
+from frappe.utils import attach_expanded_links, cint
 from frappe.utils.data import sbool
 
 
@@ -27,8 +28,21 @@ def document_list(doctype: str):
 		if param_val is not None:
 			frappe.form_dict[param] = sbool(param_val)
 
+	# keyset pagination, sort columns are needed to build cursor of the next page
+	keyset_order = None
+	if frappe.form_dict.get("cursor") is not None:
+		keyset_order = get_keyset_order(doctype, frappe.form_dict.get("order_by"))
+		frappe.form_dict["fields"] = add_keyset_fields(doctype, frappe.form_dict.get("fields"), keyset_order)
+
 	# evaluate frappe.get_list
-	return frappe.call(frappe.client.get_list, doctype, **frappe.form_dict)
+	data = frappe.call(frappe.client.get_list, doctype, **frappe.form_dict)
+
+	if keyset_order:
+		frappe.response["next_cursor"] = get_next_cursor(
+			keyset_order, data, cint(frappe.form_dict.limit_page_length)
+		)
+
+	return data
 
 
 def handle_rpc_call(method: str):
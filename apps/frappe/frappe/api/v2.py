@@ -17,6 +17,8 @@ import frappe
 import frappe.client
 from frappe import _, cint, cstr, get_newargs, is_whitelisted
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
+from frappe.database.pagination import add_keyset_fields, get_keyset_order, get_next_cursor
+from frappe.database.replica import is_read_only_request
 from frappe.handler import is_valid_http_method, run_server_script, upload_file
 
 PERMISSION_MAP = {
@@ -41,14 +43,17 @@ def handle_rpc_call(method: str, doctype: str | None = None):
 		return run_server_script(server_script)
 
 	try:
-		method = frappe.get_attr(method)
+		fn = frappe.get_attr(method)
 	except Exception as e:
 		frappe.throw(_("Failed to get method {0} with {1}").format(method, e))
 
-	is_whitelisted(method)
-	is_valid_http_method(method)
+	is_whitelisted(fn)
+	is_valid_http_method(fn)
 
-	return frappe.call(method, **frappe.form_dict)
+	if is_read_only_request(method, fn):
+		fn = frappe.read_only()(fn)
+
+	return frappe.call(fn, **frappe.form_dict)
 
 
 def login():
@@ -92,10 +97,13 @@ def document_list(doctype: str) -> list[dict[str, Any]]:
 		limit: Maximum number of records to fetch (default: 20)
 		group_by: Group by field
 		as_dict: Return results as dictionary (default: True)
+		cursor: Fetch records after this position instead of skipping `start` records, pass an empty
+			cursor for the first page
 
 	Response:
 		frappe.response["data"]: List of document records as dicts
 		frappe.response["has_next_page"]: Indicates if more pages are available
+		frappe.response["next_cursor"]: Cursor of the next page, only when `cursor` is passed
 
 	Controller Customization:
 		Doctype controllers can customize queries by implementing a static get_list(query) method
@@ -123,6 +131,12 @@ def document_list(doctype: str) -> list[dict[str, Any]]:
 	group_by: str | None = args.get("group_by", None)
 	debug: bool = args.get("debug", False)
 	as_dict: bool = args.get("as_dict", True)
+	cursor: str | None = args.get("cursor", None)
+
+	keyset_order = None
+	if cursor is not None:
+		keyset_order = get_keyset_order(doctype, order_by)
+		fields = add_keyset_fields(doctype, fields, keyset_order)
 
 	query = frappe.qb.get_query(
 		table=doctype,
@@ -133,6 +147,7 @@ def document_list(doctype: str) -> list[dict[str, Any]]:
 		limit=limit + 1,  # Fetch one extra to check if there's a next page
 		group_by=group_by,
 		ignore_permissions=False,
+		cursor=cursor,
 	)
 
 	# Check if the doctype controller has a static get_list method
@@ -157,7 +172,10 @@ def document_list(doctype: str) -> list[dict[str, Any]]:
 
 	data = query.run(as_dict=as_dict, debug=debug)
 	frappe.response["has_next_page"] = len(data) > limit
-	return data[:limit]
+	data = data[:limit]
+	if keyset_order and frappe.response["has_next_page"]:
+		frappe.response["next_cursor"] = get_next_cursor(keyset_order, data)
+	return data
 
 
 def count(doctype: str) -> int:
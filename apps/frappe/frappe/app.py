@@ -67,6 +67,8 @@ import frappe.website.website_generator  # web page doctypes
 
 # end: module pre-loading
 
+frappe._optimizations.preload_meta_cache()
+
 # better werkzeug default
 # this is necessary because frappe desk sends most requests as form data
 # and some of them can exceed werkzeug's default limit of 500kb
@@ -215,9 +217,7 @@ def setup_read_only_mode():
 	frappe.flags.read_only = True
 
 	# If replica is available then just connect replica, else setup read only transaction.
-	if frappe.conf.read_from_replica:
-		frappe.connect_replica()
-	else:
+	if not (frappe.conf.read_from_replica and frappe.connect_replica()):
 		frappe.db.begin(read_only=True)
 
 
@@ -36,6 +36,7 @@ def get_bootinfo():
 	from frappe.translate import get_lang_dict, get_translated_doctypes
 
 	frappe.set_user_lang(frappe.session.user)
+	prefetch_boot_cache()
 	bootinfo = frappe._dict()
 	hooks = frappe.get_hooks()
 	doclist = []
@@ -128,6 +129,18 @@ def get_bootinfo():
 	return bootinfo
 
 
+def prefetch_boot_cache():
+	"""Load cache keys that are read while building bootinfo in a couple of round trips.
+
+	Values end up in `frappe.local.cache` and are used from there by individual `get_value`/`hget`
+	calls for the rest of the request."""
+	frappe.cache.get_values(("domain_restricted_doctypes", "domain_restricted_pages"))
+	frappe.cache.hget_names(
+		("roles", "user_doc", "user_permissions", "desktop_icons", "home_page", "notification_config"),
+		frappe.session.user,
+	)
+
+
 def get_icon_style():
 	icon_style = frappe.db.get_single_value("Desktop Settings", "icon_style")
 	if icon_style not in ["Subtle", "Solid"]:
@@ -1,6 +1,8 @@
 # Copyright (c) 2018, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import time
+
 import frappe
 
 common_default_keys = ["__default", "__global"]
@@ -53,6 +55,7 @@ user_cache_keys = (
 	"lang",
 	"defaults",
 	"user_permissions",
+	"permission_conditions",
 	"home_page",
 	"linked_with",
 	"desktop_icons",
@@ -111,8 +114,7 @@ def clear_global_cache():
 
 def clear_defaults_cache(user=None):
 	if user:
-		for key in [user, *common_default_keys]:
-			frappe.client_cache.delete_value(f"defaults::{key}")
+		frappe.client_cache.delete_value([f"defaults::{key}" for key in [user, *common_default_keys]])
 	elif frappe.flags.in_install != "frappe":
 		frappe.client_cache.delete_keys("defaults::*")
 
@@ -132,7 +134,8 @@ def _clear_doctype_cache_from_redis(doctype: str | None = None):
 	from frappe.email.doctype.notification.notification import clear_notification_cache
 	from frappe.model.meta import clear_meta_cache
 
-	to_del = ["is_table", "doctype_modules"]
+	# compiled permission conditions of every user depend on doctype permissions
+	to_del = ["is_table", "doctype_modules", "permission_conditions"]
 
 	if doctype:
 
@@ -182,6 +185,16 @@ def _clear_doctype_cache_from_redis(doctype: str | None = None):
 	frappe.cache.delete_value(to_del)
 
 
+def mark_doctype_modified(doctype: str):
+	"""Record that documents of `doctype` have changed, values cached earlier (e.g. list counts) are stale."""
+	frappe.cache.hset("last_modified", doctype, time.time())
+
+
+def get_doctype_modified(doctype: str) -> float | None:
+	"""Return when documents of `doctype` were last changed, `None` if that isn't known."""
+	return frappe.cache.hget("last_modified", doctype)
+
+
 def clear_controller_cache(doctype=None, *, site=None):
 	if not doctype:
 		frappe.controllers.pop(site or frappe.local.site, None)
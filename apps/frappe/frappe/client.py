@@ -37,6 +37,7 @@ def get_list(
 	as_dict: bool = True,
 	or_filters=None,
 	expand=None,
+	cursor=None,
 ):
 	"""Return a list of records by filters, fields, ordering and limit.
 
@@ -45,7 +46,8 @@ def get_list(
 	:param filters: filter list by this dict
 	:param order_by: Order by this fieldname
 	:param limit_start: Start at this index
-	:param limit_page_length: Number of records to be returned (default 20)"""
+	:param limit_page_length: Number of records to be returned (default 20)
+	:param cursor: Return records after this position instead of starting at `limit_start`"""
 
 	args = frappe._dict(
 		doctype=doctype,
@@ -59,6 +61,7 @@ def get_list(
 		limit_page_length=limit_page_length,
 		debug=debug,
 		as_list=not as_dict,
+		cursor=cursor,
 	)
 
 	validate_args(args)
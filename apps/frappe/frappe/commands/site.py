@@ -626,6 +626,52 @@ def describe_database_table(context, doctype, column):
 		raise SiteNotSpecifiedError
 
 
+@click.command("suggest-indexes")
+@click.option("--top", default=20, type=int, help="Number of queries with most total time to analyze")
+@click.option("--apply", is_flag=True, default=False, help="Create the suggested indexes")
+@click.option("--reset", is_flag=True, default=False, help="Discard statistics of sampled queries")
+@pass_context
+def suggest_indexes(context: CliCtxObj, top, apply, reset):
+	"""Suggest indexes for queries sampled from requests and background jobs.
+
+	Set `query_sample_rate` in site config (e.g. 0.01 to sample 1% of requests and jobs) and run this
+	once enough queries have been sampled. Only MariaDB is supported."""
+	from frappe.core.doctype.recorder.index_advisor import apply_index_suggestions, get_index_suggestions
+	from frappe.recorder import reset_query_stats
+	from frappe.utils.commands import render_table
+
+	for site in context.sites:
+		frappe.init(site)
+		frappe.connect()
+		try:
+			if reset:
+				reset_query_stats()
+				continue
+
+			suggestions = get_index_suggestions(top)
+			if not suggestions:
+				click.echo(f"No index suggestions for {site}")
+				continue
+
+			render_table(
+				[
+					["DocType", "Columns", "Calls", "Time (ms)", "Estimated Savings (ms)"],
+					*(
+						[s.doctype, ", ".join(s.columns), s.calls, round(s.duration), round(s.savings)]
+						for s in suggestions
+					),
+				]
+			)
+			if apply:
+				apply_index_suggestions(suggestions)
+				click.secho(f"Added {len(suggestions)} indexes on {site}", fg="green")
+		finally:
+			frappe.destroy()
+
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
 @click.command("add-system-manager")
 @click.argument("email")
 @click.option("--first-name")
@@ -1615,6 +1661,7 @@ commands = [
 	add_user_for_sites,
 	add_db_index,
 	describe_database_table,
+	suggest_indexes,
 	backup,
 	drop_site,
 	install_app,
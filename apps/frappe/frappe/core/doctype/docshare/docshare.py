@@ -80,10 +80,15 @@ class DocShare(Document):
 				"Shared", _("{0} shared this document with {1}").format(owner, get_fullname(self.user))
 			)
 
+	def on_update(self):
+		self.clear_permission_conditions()
+
 	def on_trash(self):
 		if not self.flags.ignore_share_permission:
 			self.check_share_permission()
 
+		self.clear_permission_conditions()
+
 		self.get_doc().add_comment(
 			"Unshared",
 			_("{0} un-shared this document with {1}").format(
@@ -91,6 +96,14 @@ class DocShare(Document):
 			),
 		)
 
+	def clear_permission_conditions(self):
+		"""Shared documents are part of permission conditions compiled for list queries."""
+		previous = self.get_doc_before_save()
+		if self.everyone or (previous and previous.everyone):
+			frappe.permissions.clear_compiled_permission_conditions()
+		else:
+			frappe.permissions.clear_compiled_permission_conditions(self.user)
+
 
 def on_doctype_update():
 	"""Add index in `tabDocShare` for `(user, share_doctype)`"""
@@ -16,6 +16,8 @@ from frappe.utils import flt
 INDEX_SCORE_THRESHOLD = 0.3
 # Anything reading less than this percent of table is considered optimal
 OPTIMIZATION_THRESHOLD = 0.1
+# Maximum number of columns in suggested multi-column indexes
+MAX_INDEX_COLUMNS = 3
 
 T = TypeVar("T")
 
@@ -244,8 +246,43 @@ class DBOptimizer:
 		if missing_tables := (set(self.tables_examined()) - set(self.tables.keys())):
 			frappe.throw("DBTable infomation missing for: " + ", ".join(missing_tables))
 
-		potential_indexes = self.potential_indexes()
+		potential_indexes = self._indexable(self.potential_indexes())
 
+		for index in potential_indexes:
+			index._score = self.index_score(index)
+
+		potential_indexes.sort(key=lambda i: i._score)
+		if (
+			potential_indexes
+			and (best_index := potential_indexes[0])
+			and best_index._score < INDEX_SCORE_THRESHOLD
+		):
+			return best_index
+
+	def suggest_composite_index(self, max_columns: int = MAX_INDEX_COLUMNS) -> list[DBIndex]:
+		"""Suggest columns of a multi-column index given query and table stats, most selective first.
+
+		Conditions on multiple columns of a table can all be served by a single index, this picks the
+		table where such an index reads the smallest part of the table."""
+		if missing_tables := (set(self.tables_examined()) - set(self.tables.keys())):
+			frappe.throw("DBTable infomation missing for: " + ", ".join(missing_tables))
+
+		tablewise_indexes = defaultdict(list)
+		for index in self._indexable(self.potential_indexes()):
+			if index not in tablewise_indexes[index.table]:
+				tablewise_indexes[index.table].append(index)
+
+		best_indexes, best_score = [], INDEX_SCORE_THRESHOLD
+		for indexes in tablewise_indexes.values():
+			indexes = sorted(indexes, key=lambda i: i.cardinality or 0, reverse=True)[:max_columns]
+			if (score := self.composite_index_score(indexes)) < best_score:
+				best_indexes, best_score = indexes, score
+
+		for sequence, index in enumerate(best_indexes, start=1):
+			index.sequence = sequence
+		return best_indexes
+
+	def _indexable(self, potential_indexes: list[DBIndex]) -> list[DBIndex]:
 		for index in list(potential_indexes):
 			table = self.tables[index.table]
 
@@ -256,16 +293,23 @@ class DBOptimizer:
 			# Update cardinality from column so scoring can be done
 			index.cardinality = column.cardinality
 
-		for index in potential_indexes:
-			index._score = self.index_score(index)
+		return potential_indexes
 
-		potential_indexes.sort(key=lambda i: i._score)
-		if (
-			potential_indexes
-			and (best_index := potential_indexes[0])
-			and best_index._score < INDEX_SCORE_THRESHOLD
-		):
-			return best_index
+	def composite_index_score(self, indexes: list[DBIndex]) -> float:
+		"""Score a multi-column index from 0 to 1 like `index_score`.
+
+		Columns are assumed to be independent, so distinct values of the index are product of distinct
+		values of its columns (but never more than rows in table)."""
+		table = self.tables[indexes[0].table]
+
+		cardinality = 1
+		for index in indexes:
+			cardinality *= index.cardinality or 2
+		total_rows = table.total_rows or cardinality or 1
+		cardinality = min(cardinality, total_rows)
+
+		rows_fetched_on_average = total_rows / cardinality
+		return rows_fetched_on_average / total_rows
 
 	def index_score(self, index: DBIndex) -> float:
 		"""Score an index from 0 to 1 based on usefulness.
@@ -0,0 +1,105 @@
+"""Suggest indexes using queries sampled across all requests and jobs.
+
+Queries are sampled by `frappe.recorder.QuerySampler` when `query_sample_rate` is set in site config.
+Queries with most total time are `EXPLAIN`ed, for the ones reading big tables without an index a
+(multi-column) index is suggested using `DBOptimizer`. Suggestions are ranked by estimated time saved.
+"""
+
+from dataclasses import dataclass, field
+
+import frappe
+from frappe import _
+from frappe.core.doctype.recorder.recorder import _get_optimizer, get_doctype_name
+from frappe.database.utils import is_query_type
+from frappe.recorder import SAMPLED_QUERY_TYPES, get_query_stats
+from frappe.utils import cint
+
+DEFAULT_TOP_QUERIES = 20
+# Queries are only analyzed if EXPLAIN shows that they scan at least this many rows of a table
+MIN_SCANNED_ROWS = 1000
+
+
+@dataclass
+class IndexSuggestion:
+	table: str
+	columns: tuple[str, ...]
+	calls: int = 0
+	duration: float = 0.0  # total time of queries using this index in ms
+	savings: float = 0.0  # estimated time saved by this index in ms
+	queries: list[str] = field(default_factory=list)
+
+	@property
+	def doctype(self) -> str:
+		return get_doctype_name(self.table)
+
+
+def get_index_suggestions(top_n: int = DEFAULT_TOP_QUERIES) -> list[IndexSuggestion]:
+	"""Suggest indexes for `top_n` sampled queries with most total time, most useful first."""
+	if frappe.db.db_type != "mariadb":
+		frappe.throw(_("Index suggestions are only available for MariaDB"))
+
+	suggestions: dict[tuple, IndexSuggestion] = {}
+	for stat in get_query_stats(top_n):
+		if not is_query_type(stat.sample, SAMPLED_QUERY_TYPES):
+			continue
+		if not (scanned_tables := get_scanned_tables(stat.sample)):
+			continue
+		try:
+			optimizer = _get_optimizer(stat.sample)
+			indexes = optimizer and optimizer.suggest_composite_index()
+		except Exception:
+			# queries that can't be parsed are skipped
+			continue
+		if not indexes or indexes[0].table not in scanned_tables:
+			continue
+
+		key = (indexes[0].table, tuple(index.column for index in indexes))
+		suggestion = suggestions.setdefault(key, IndexSuggestion(*key))
+		suggestion.calls += stat.calls
+		suggestion.duration += stat.duration
+		suggestion.savings += stat.duration * (1 - optimizer.composite_index_score(indexes))
+		suggestion.queries.append(stat.query)
+
+	return sorted(_merge_prefixes(list(suggestions.values())), key=lambda s: s.savings, reverse=True)
+
+
+def get_scanned_tables(query: str) -> set[str]:
+	"""Return tables that `query` reads without using an index, according to `EXPLAIN`."""
+	try:
+		plan = frappe.db.sql(f"EXPLAIN {query}", as_dict=True)
+	except Exception:
+		return set()
+
+	return {
+		row.table
+		for row in plan
+		if row.table and row.type in ("ALL", "index") and cint(row.rows) >= MIN_SCANNED_ROWS
+	}
+
+
+def _merge_prefixes(suggestions: list[IndexSuggestion]) -> list[IndexSuggestion]:
+	"""Index on (a, b) can be used by queries that need index on (a), suggest only the longer one."""
+	suggestions.sort(key=lambda s: len(s.columns), reverse=True)
+	merged: list[IndexSuggestion] = []
+	for suggestion in suggestions:
+		longer = next(
+			(
+				s
+				for s in merged
+				if s.table == suggestion.table and s.columns[: len(suggestion.columns)] == suggestion.columns
+			),
+			None,
+		)
+		if longer:
+			longer.calls += suggestion.calls
+			longer.duration += suggestion.duration
+			longer.savings += suggestion.savings
+			longer.queries.extend(suggestion.queries)
+		else:
+			merged.append(suggestion)
+	return merged
+
+
+def apply_index_suggestions(suggestions: list[IndexSuggestion]):
+	for suggestion in suggestions:
+		frappe.db.add_index(suggestion.doctype, list(suggestion.columns))
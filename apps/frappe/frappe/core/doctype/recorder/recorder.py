@@ -32,10 +32,13 @@ class Recorder(Document):
 		duration: DF.Float
 		event_type: DF.Data | None
 		form_dict: DF.Code | None
+		identity_map_hits: DF.Int
 		method: DF.Literal["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
 		number_of_queries: DF.Int
 		path: DF.Data | None
 		profile: DF.Code | None
+		query_cache_hits: DF.Int
+		query_cache_misses: DF.Int
 		request_headers: DF.Code | None
 		sql_queries: DF.Table[RecorderQuery]
 		suggested_indexes: DF.Table[RecorderSuggestedIndex]
@@ -189,6 +192,12 @@ def _optimize(recorder_id):
 
 
 def _optimize_query(query):
+	if optimizer := _get_optimizer(query):
+		return optimizer.suggest_index()
+
+
+def _get_optimizer(query) -> DBOptimizer | None:
+	"""Return optimizer for `query` with stats of all examined tables, `None` if a table doesn't exist."""
 	optimizer = DBOptimizer(query=query)
 	tables = optimizer.tables_examined()
 
@@ -215,7 +224,7 @@ def _optimize_query(query):
 		db_table = DBTable.from_frappe_ouput(stats)
 		optimizer.update_table_data(db_table)
 
-	return optimizer.suggest_index()
+	return optimizer
 
 
 def _fetch_table_stats(doctype: str, columns: list[str]) -> dict | None:
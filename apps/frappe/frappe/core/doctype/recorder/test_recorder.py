@@ -2,10 +2,11 @@
 # See license.txt
 
 import re
+from unittest.mock import patch
 
 import frappe
 import frappe.recorder
-from frappe.core.doctype.recorder.recorder import _optimize_query, serialize_request
+from frappe.core.doctype.recorder.recorder import _get_optimizer, _optimize_query, serialize_request
 from frappe.query_builder.utils import db_type_is
 from frappe.recorder import get as get_recorder_data
 from frappe.tests import IntegrationTestCase
@@ -79,6 +80,48 @@ class TestRecorder(IntegrationTestCase):
 		self.assertIsInstance(serialize_request(request_doc), dict)
 
 
+class TestQuerySampler(IntegrationTestCase):
+	def test_query_stats(self):
+		frappe.recorder.reset_query_stats()
+		self.addCleanup(frappe.recorder.reset_query_stats)
+
+		sampler = frappe.recorder.QuerySampler(frappe.db)
+		for name in ("Administrator", "Guest"):
+			frappe.db.sql("select name from tabUser where name = %s", name)
+		frappe.db.sql(f"select name from tabUser where name = '{frappe.generate_hash()}'")
+		frappe.db.sql(f"select name from tabUser where name = '{frappe.generate_hash()}'")
+		sampler.dump()
+		self.assertNotEqual(frappe.db.sql, sampler.sql)
+
+		stats = {stat.query: stat for stat in frappe.recorder.get_query_stats()}
+		self.assertEqual(stats["select name from tabUser where name = %s"].calls, 2)
+		# queries with inlined values are merged using normalized form
+		self.assertEqual(stats["select name from tabUser where name = ?"].calls, 2)
+
+	def test_query_stats_eviction(self):
+		frappe.recorder.reset_query_stats()
+		self.addCleanup(frappe.recorder.reset_query_stats)
+
+		def sample_queries(queries):
+			sampler = frappe.recorder.QuerySampler(frappe.db)
+			for idx in queries:
+				frappe.db.sql(f"select name from tabUser where name = '{idx}'")
+			sampler.dump()
+
+		duration_key = frappe.cache.make_key(frappe.recorder.QUERY_STATS_DURATION)
+		with patch.object(frappe.recorder, "QUERY_STATS_MAX_QUERIES", 2):
+			# new queries aren't evicted right away
+			sample_queries(range(3))
+			self.assertEqual(frappe.cache.zcard(duration_key), 3)
+
+			sample_queries(range(3, 5))
+
+		# calls and samples are only kept for queries still in the sorted set
+		self.assertEqual(frappe.cache.zcard(duration_key), 2)
+		self.assertEqual(frappe.cache.hlen(frappe.cache.make_key(frappe.recorder.QUERY_STATS_CALLS)), 2)
+		self.assertEqual(frappe.cache.hlen(frappe.cache.make_key(frappe.recorder.QUERY_STATS_SAMPLES)), 2)
+
+
 class TestQueryOptimization(IntegrationTestCase):
 	@run_only_if(db_type_is.MARIADB)
 	def test_query_optimizer(self):
@@ -94,3 +137,13 @@ class TestQueryOptimization(IntegrationTestCase):
 		)
 		self.assertEqual(suggested_index.table, "tabUser")
 		self.assertEqual(suggested_index.column, "email")
+
+	@run_only_if(db_type_is.MARIADB)
+	def test_composite_index(self):
+		optimizer = _get_optimizer(
+			"select name from `tabToDo` where allocated_to='xyz' and reference_type='Note' and status='Open'"
+		)
+		indexes = optimizer.suggest_composite_index(max_columns=2)
+		self.assertLessEqual(len(indexes), 2)
+		self.assertLessEqual({index.table for index in indexes}, {"tabToDo"})
+		self.assertEqual([index.sequence for index in indexes], list(range(1, len(indexes) + 1)))
@@ -14,6 +14,7 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import get_datetime, now_datetime
 from frappe.utils.background_jobs import enqueue, is_job_enqueued
+from frappe.utils.scheduler import clear_timetable
 
 parse_cron = lru_cache(croniter)  # Cache parsed cron-expressions
 
@@ -104,7 +105,7 @@ class ScheduledJobType(Document):
 	def next_execution(self):
 		return self.get_next_execution()
 
-	def get_next_execution(self):
+	def get_next_execution(self, last_execution=None):
 		# Maintenance jobs run at random time, the time is specific to the site though.
 		# This is done to avoid scheduling all maintenance task on all sites at the same time in
 		# multitenant deployments.
@@ -133,7 +134,7 @@ class ScheduledJobType(Document):
 		# Creation is set as fallback because if very old fallback is set job might trigger
 		# immediately, even when it's meant to be daily.
 		# A dynamic fallback like current time might miss the scheduler interval and job will never start.
-		last_execution = get_datetime(self.last_execution or self.creation)
+		last_execution = get_datetime(last_execution or self.last_execution or self.creation)
 
 		next_execution = parse_cron(self.cron_format).get_next(datetime, start_time=last_execution)
 		if self.frequency in ("Hourly Maintenance", "Daily Maintenance"):
@@ -187,8 +188,12 @@ class ScheduledJobType(Document):
 	def get_queue_name(self):
 		return "long" if ("Long" in self.frequency or "Maintenance" in self.frequency) else "default"
 
+	def on_update(self):
+		clear_timetable()
+
 	def on_trash(self):
 		frappe.db.delete("Scheduled Job Log", {"scheduled_job_type": self.name})
+		clear_timetable()
 
 
 @frappe.whitelist()
@@ -1239,6 +1239,7 @@ def get_active_website_users():
 	)[0][0]
 
 
+@frappe.permissions.cacheable_permission_query
 def get_permission_query_conditions(user):
 	if user == "Administrator":
 		return ""
@@ -35,10 +35,12 @@ class UserPermission(Document):
 
 	def on_update(self):
 		frappe.cache.hdel("user_permissions", self.user)
+		frappe.permissions.clear_compiled_permission_conditions(self.user)
 		frappe.publish_realtime("update_user_permissions", user=self.user, after_commit=True)
 
 	def on_trash(self):
 		frappe.cache.hdel("user_permissions", self.user)
+		frappe.permissions.clear_compiled_permission_conditions(self.user)
 		frappe.publish_realtime("update_user_permissions", user=self.user, after_commit=True)
 
 	def validate_user_permission(self):
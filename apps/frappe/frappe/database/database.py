@@ -8,7 +8,7 @@ import re
 import string
 import traceback
 import warnings
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from contextlib import contextmanager, suppress
 from time import time
 from typing import TYPE_CHECKING, Any, Literal
@@ -18,6 +18,8 @@ from pypika.queries import QueryBuilder, Table
 import frappe
 import frappe.defaults
 from frappe import _, _dict
+from frappe.database.identity_map import IdentityMap
+from frappe.database.pool import DEFAULT_MAX_LIFETIME, PooledConnection, pool
 from frappe.database.utils import (
 	DefaultOrderBy,
 	EmptyQueryValues,
@@ -26,6 +28,7 @@ from frappe.database.utils import (
 	LazyMogrify,
 	Query,
 	QueryValues,
+	cached_query_transform,
 	convert_to_value,
 	get_doctype_sort_info,
 	get_query_type,
@@ -70,10 +73,15 @@ DDL_QUERY_TYPES = frozenset(("alter", "drop", "create", "truncate", "rename"))
 IMPLICIT_COMMIT_QUERY_TYPES = frozenset(("start", "alter", "drop", "create", "begin", "truncate"))
 CREATE_OR_DROP = frozenset(("create", "drop"))
 COMMIT_OR_ROLLBACK = frozenset(("commit", "rollback"))
-WRITE_QUERY_TYPES = frozenset(("update", "insert", "delete"))
-QUERY_TYPES_FOR_LOG_TOUCHED_TABLES = frozenset(("insert", "delete", "update", "alter", "drop", "rename"))
+# "load" is `LOAD DATA` used by streaming `bulk_insert` on MariaDB
+WRITE_QUERY_TYPES = frozenset(("update", "insert", "delete", "load"))
+QUERY_TYPES_FOR_LOG_TOUCHED_TABLES = frozenset(
+	("insert", "delete", "update", "alter", "drop", "rename", "load")
+)
 
 SQL_ITERATOR_BATCH_SIZE = 1000
+BULK_INSERT_CHUNK_SIZE = 1000
+BULK_LOAD_CHUNK_SIZE = 50_000
 
 
 TRANSACTION_DISABLED_MSG = """Commit/rollback are disabled during certain events. This command will
@@ -97,6 +105,7 @@ class Database:
 	DEFAULT_COLUMNS = ("name", "creation", "modified", "modified_by", "owner", "docstatus", "idx")
 	CHILD_TABLE_COLUMNS = ("parent", "parenttype", "parentfield")
 	MAX_WRITES_PER_TRANSACTION = 200_000
+	SUPPORTS_CONNECTION_POOL = True
 
 	class InvalidColumnName(frappe.ValidationError):
 		pass
@@ -118,11 +127,15 @@ class Database:
 		self.password = password
 		self.cur_db_name = cur_db_name
 		self._conn = None
+		self._pooled_connection: PooledConnection | None = None
+		# session level statement timeout set on connection, kept when it's returned to pool
+		self._session_timeout = 0
 
 		self.transaction_writes = 0
 		self.auto_commit_on_many_writes = 0
 
 		self.value_cache = recursive_defaultdict()
+		self.identity_map = IdentityMap(enabled=bool(frappe.conf.get("db_identity_map")))
 		self.logger = frappe.logger("database")
 		self.logger.setLevel("WARNING")
 
@@ -143,13 +156,22 @@ class Database:
 
 	def connect(self):
 		"""Connects to a database as set in `site_config.json`."""
-		self._conn: MySQLdbConnection | MariadbConnection | PostgresConnection | SQLiteConnection = (
-			self.get_connection()
-		)
+		if pool_key := self.get_pool_key():
+			self._pooled_connection = pool.acquire(
+				pool_key, self.get_connection, self.is_connection_usable, self.pool_max_lifetime
+			)
+			self._conn = self._pooled_connection.conn
+			self._session_timeout = self._pooled_connection.session_timeout
+		else:
+			self._conn: MySQLdbConnection | MariadbConnection | PostgresConnection | SQLiteConnection = (
+				self.get_connection()
+			)
+			self._session_timeout = 0
 		self._cursor: MySQLdbCursor | MariadbCursor | PostgresCursor | SQLiteCursor = self._conn.cursor()
 
 		try:
-			if execution_timeout := get_query_execution_timeout():
+			# pooled connections keep timeout of their last session, it's only changed if required
+			if (execution_timeout := get_query_execution_timeout()) != self._session_timeout:
 				self.set_execution_timeout(execution_timeout)
 		except Exception as e:
 			self.logger.warning(f"Couldn't set execution timeout {e}")
@@ -163,6 +185,40 @@ class Database:
 		"""`USE` db_name."""
 		self._conn.select_db(db_name)
 		self.cur_db_name = db_name
+		# connection was pooled for previous database
+		self._pooled_connection = None
+
+	def get_pool_key(self) -> tuple | None:
+		"""Return key identifying connections that can be reused by this database, `None` if pooling is
+		disabled. See `frappe.database.pool`."""
+		if not self.SUPPORTS_CONNECTION_POOL or cint(frappe.conf.get("db_pool_size")) <= 0:
+			return None
+
+		return (self.db_type, self.host, self.port, self.socket, self.user, self.password, self.cur_db_name)
+
+	@property
+	def pool_max_lifetime(self) -> float:
+		return cint(frappe.conf.get("db_pool_max_lifetime")) or DEFAULT_MAX_LIFETIME
+
+	def is_connection_usable(self, conn) -> bool:
+		"""Check if idle pooled connection is still alive."""
+		try:
+			conn.ping()
+		except Exception:
+			return False
+		return True
+
+	def reset_connection(self) -> bool:
+		"""Rollback connection so that it can be reused, return `False` if that isn't possible.
+
+		Session timeout isn't reset, it's remembered on the pooled connection and set again by `connect`
+		only if next session needs a different one."""
+		try:
+			self._conn.rollback()
+		except Exception:
+			return False
+		self._pooled_connection.session_timeout = self._session_timeout
+		return True
 
 	def get_connection(self):
 		"""Return a Database connection object that conforms with https://peps.python.org/pep-0249/#connection-objects."""
@@ -195,6 +251,7 @@ class Database:
 		run=True,
 		pluck=False,
 		as_iterator=False,
+		as_columns=False,
 	):
 		"""Execute a SQL query and fetch all rows.
 
@@ -212,6 +269,8 @@ class Database:
 		:param as_iterator: Returns iterator over results instead of fetching all results at once.
 		        This should be used with unbuffered cursor as default cursors used by pymysql and postgres
 		        buffer the results internally. See `Database.unbuffered_cursor`.
+		:param as_columns: Return a dict of column name and list of its values instead of rows. This
+		        is much faster for queries returning lots of rows as no object is created per row.
 		Examples:
 
 		        # return customer names as dicts
@@ -224,6 +283,9 @@ class Database:
 		        frappe.db.sql("select name from tabCustomer where name like %(name)s and owner=%(owner)s",
 		                {"name": "a%", "owner":"test@example.com"})
 
+		        # return columns, e.g. {"name": ["CUST-1", "CUST-2"], "credit_limit": [100.0, 0.0]}
+		        frappe.db.sql("select name, credit_limit from tabCustomer", as_columns=True)
+
 		"""
 		if isinstance(query, QueryBuilder):
 			frappe.log("Use run method to execute SQL queries generated by Query Builder")
@@ -234,16 +296,14 @@ class Database:
 		if not run:
 			return query
 
-		query_type = get_query_type(query)
+		normalized_query, query_type = normalize_query(query)
 
 		if explain:
 			if debug and query_type == "select":
 				self.explain_query(query, values)
 			return
 
-		# remove whitespace / indentation from start and end of query
-		# and replace ifnull in query with coalesce
-		query = IFNULL_PATTERN.sub("coalesce(", query.strip())
+		query = normalized_query
 
 		if not self._conn:
 			self.connect()
@@ -251,6 +311,7 @@ class Database:
 		# in transaction validations
 		self.check_transaction_status(query, query_type)
 		self.clear_db_table_cache(query_type)
+		self.identity_map.invalidate(query_type)
 
 		if auto_commit:
 			self.commit()
@@ -325,6 +386,8 @@ class Database:
 			return ()
 
 		if as_iterator:
+			if as_columns:
+				frappe.throw(_("`as_iterator` can't be used with `as_columns=True`"))
 			return self._return_as_iterator(pluck=pluck, as_dict=as_dict, as_list=as_list, update=update)
 
 		last_result = self._transform_result(self._cursor.fetchall())
@@ -334,7 +397,10 @@ class Database:
 			return last_result
 
 		# scrub output if required
-		if as_dict:
+		if as_columns:
+			last_result = self.fetch_as_columns(last_result)
+
+		elif as_dict:
 			last_result = self.fetch_as_dict(last_result)
 			if update:
 				for r in last_result:
@@ -493,6 +559,14 @@ class Database:
 		keys = [column[0] for column in self._cursor.description]
 		return [_dict(zip(keys, row, strict=False)) for row in result]
 
+	def fetch_as_columns(self, result) -> _dict:
+		"""Internal. Convert results to dict of column name and list of its values."""
+		keys = [column[0] for column in self._cursor.description]
+		if not result:
+			return _dict((key, []) for key in keys)
+
+		return _dict(zip(keys, map(list, zip(*result, strict=True)), strict=True))
+
 	@staticmethod
 	def clear_db_table_cache(query_type: str):
 		if query_type in CREATE_OR_DROP:
@@ -544,6 +618,8 @@ class Database:
 		:param skip_locked: Skip selecting currently locked rows.
 		:param wait: Wait for aquiring lock
 
+		Reads by document name are served from `self.identity_map` when it is enabled.
+
 		Example:
 
 		        # return first customer starting with a
@@ -558,6 +634,20 @@ class Database:
 		        # returns default date_format
 		        frappe.db.get_value("System Settings", None, "date_format")
 		"""
+		fields = [fieldname] if isinstance(fieldname, str) else fieldname
+		if (
+			run
+			and not (ignore or debug or for_update or pluck or distinct)
+			and (filters != doctype or doctype == "DocType")
+			and self.identity_map.is_cacheable(filters, fields)
+		):
+			row = self.identity_map.get(
+				doctype, filters, fields, lambda missing: self._get_row_by_name(doctype, filters, missing)
+			)
+			if row is None or as_dict:
+				return row
+			return tuple(row[f] for f in fields) if len(fields) > 1 else row[fields[0]]
+
 		result = self.get_values(
 			doctype,
 			filters,
@@ -589,6 +679,10 @@ class Database:
 		# single field is requested, send it without wrapping in containers
 		return row[0]
 
+	def _get_row_by_name(self, doctype: str, name: str, fields: list[str]) -> dict | None:
+		result = self.get_values(doctype, name, fields, order_by=None, limit=1)
+		return dict(zip(fields, result[0], strict=True)) if result else None
+
 	def get_values(
 		self,
 		doctype: str,
@@ -1188,6 +1282,7 @@ class Database:
 		self.after_rollback.reset()
 
 		self.before_commit.run()
+		has_writes = self.transaction_writes
 
 		if chain:
 			self.sql("commit and chain")
@@ -1195,6 +1290,10 @@ class Database:
 			self.sql("commit")
 			self.begin()
 
+		if has_writes:
+			# rest of the request/job shouldn't read from a replica which might not have these changes yet
+			frappe.local.committed_writes = True
+
 		self.value_cache.clear()
 		self.after_commit.run()
 
@@ -1308,6 +1407,12 @@ class Database:
 		"""Get estimated count of total rows in a table."""
 		raise NotImplementedError
 
+	def get_replication_lag(self) -> float | None:
+		"""Return seconds this replica is behind primary, `None` if replication isn't running.
+
+		Databases that aren't replicas are never behind."""
+		return 0.0
+
 	@staticmethod
 	def format_date(date):
 		return getdate(date).strftime("%Y-%m-%d")
@@ -1383,11 +1488,21 @@ class Database:
 		return frappe.get_system_settings(key)
 
 	def close(self):
-		"""Close database connection."""
+		"""Close database connection, pooled connections are returned to the pool instead."""
 		if self._conn:
-			self._conn.close()
+			pool_key = self._pooled_connection and self.get_pool_key()
+			if pool_key and self.reset_connection():
+				pool.release(
+					pool_key,
+					self._pooled_connection,
+					max_idle=cint(frappe.conf.get("db_pool_size")),
+					max_lifetime=self.pool_max_lifetime,
+				)
+			else:
+				self._conn.close()
 			self._cursor = None
 			self._conn = None
+			self._pooled_connection = None
 
 	@staticmethod
 	def escape(s, percent=True):
@@ -1485,29 +1600,65 @@ class Database:
 		values: Iterable[Sequence[Any]],
 		ignore_duplicates=False,
 		*,
-		chunk_size=1000,
+		chunk_size: int | None = None,
+		stream: bool = False,
+		progress_callback: Callable[[int, float], None] | None = None,
 	):
 		"""
 		Insert multiple records at a time
 
 		:param doctype: Doctype name
 		:param fields: list of fields
-		:params values: iterable of values
+		:params values: iterable of values, can be a generator
+		:param chunk_size: Number of rows sent to database at once.
+		:param stream: Use the database's bulk loading protocol instead of `INSERT` queries:
+		        `LOAD DATA LOCAL INFILE` on MariaDB (requires `local_infile` in site config),
+		        `COPY ... FROM STDIN` on Postgres and `executemany` on SQLite.
+		        Only one chunk of rows is held in memory at a time.
+		:param progress_callback: Called after every chunk with total rows written and rows per second.
 		"""
-		table = frappe.qb.DocType(doctype)
+		if stream and self._can_bulk_load(ignore_duplicates):
+			chunk_size = chunk_size or BULK_LOAD_CHUNK_SIZE
 
-		query = frappe.qb.into(table).columns(fields)
+			def insert_chunk(value_chunk):
+				self.identity_map.invalidate("insert")
+				self._bulk_load(doctype, fields, value_chunk, ignore_duplicates)
+
+		else:
+			chunk_size = chunk_size or BULK_INSERT_CHUNK_SIZE
+			table = frappe.qb.DocType(doctype)
 
-		if ignore_duplicates:
-			# Pypika does not have same api for ignoring duplicates
-			if frappe.conf.db_type in ("mariadb", "sqlite"):
-				query = query.ignore()
-			elif frappe.conf.db_type == "postgres":
-				query = query.on_conflict().do_nothing()
+			query = frappe.qb.into(table).columns(fields)
 
+			if ignore_duplicates:
+				# Pypika does not have same api for ignoring duplicates
+				if frappe.conf.db_type in ("mariadb", "sqlite"):
+					query = query.ignore()
+				elif frappe.conf.db_type == "postgres":
+					query = query.on_conflict().do_nothing()
+
+			def insert_chunk(value_chunk):
+				query.insert(*value_chunk).run()
+
+		start_time = time()
+		inserted_rows = 0
 		value_iterator = iter(values)
 		while value_chunk := tuple(itertools.islice(value_iterator, chunk_size)):
-			query.insert(*value_chunk).run()
+			insert_chunk(value_chunk)
+
+			if progress_callback:
+				inserted_rows += len(value_chunk)
+				progress_callback(inserted_rows, inserted_rows / max(time() - start_time, 1e-6))
+
+	def _can_bulk_load(self, ignore_duplicates: bool) -> bool:
+		"""Return True if `_bulk_load` can be used for streaming `bulk_insert`."""
+		return False
+
+	def _bulk_load(
+		self, doctype: str, fields: list[str], rows: Sequence[Sequence[Any]], ignore_duplicates: bool
+	):
+		"""Write `rows` using the database specific bulk loading protocol."""
+		raise NotImplementedError
 
 	def create_sequence(self, *args, **kwargs):
 		from frappe.database.sequence import create_sequence
@@ -1586,6 +1737,15 @@ def savepoint(catch: type | tuple[type, ...] = Exception):
 		frappe.db.release_savepoint(savepoint)
 
 
+@cached_query_transform
+def normalize_query(query: str) -> tuple[str, str]:
+	"""Return the query ready for execution along with its type.
+
+	Whitespace / indentation is removed from start and end of query and `ifnull` is replaced
+	with `coalesce`."""
+	return IFNULL_PATTERN.sub("coalesce(", query.strip()), get_query_type(query)
+
+
 def get_query_execution_timeout() -> int:
 	"""Get execution timeout based on current timeout in different contexts.
 
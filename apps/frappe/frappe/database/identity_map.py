@@ -0,0 +1,70 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Per request/job identity map for point reads done using `frappe.db.get_value`.
+
+Rows read by name are remembered as `{fieldname: value}`, keyed by `(doctype, name)`. Later reads of the
+same document are served from memory, only fields that weren't read before are fetched from database and
+merged into the remembered row. Documents that don't exist are remembered too.
+
+The map lives on the database connection, which is created for every request and job. It is cleared
+whenever a query other than a read runs on the connection (including commit and rollback), so values
+can never be older than the last write made by the current request/job.
+
+Disabled by default, enable it for a site with `db_identity_map` in site config or for the current
+request/job by setting `frappe.db.identity_map.enabled = True`.
+"""
+
+import re
+
+import frappe
+
+# Query types which don't modify data, other queries clear the map.
+READ_QUERY_TYPES = frozenset(("select", "show", "explain", "describe", "desc"))
+
+FIELDNAME_PATTERN = re.compile(r"^\w+$")
+
+
+class IdentityMap:
+	def __init__(self, enabled: bool = False):
+		self.enabled = enabled
+		self.rows: dict[tuple[str, str], dict | None] = {}
+		# number of queries that weren't run because rows were found in the map
+		self.hits = 0
+
+	def is_cacheable(self, filters, fields: list[str]) -> bool:
+		"""Check if a read of `fields` using `filters` can be served from the map."""
+		return (
+			self.enabled
+			and isinstance(filters, str)
+			and bool(fields)
+			and all(isinstance(f, str) and FIELDNAME_PATTERN.match(f) for f in fields)
+		)
+
+	def get(self, doctype: str, name: str, fields: list[str], fetch) -> frappe._dict | None:
+		"""Return `fields` of document as dict, `None` if document doesn't exist.
+
+		Missing fields are read using `fetch(fields)` which should return a dict or `None`."""
+		key = (doctype, name)
+		row = self.rows.get(key, {})
+		if row is None:
+			self.hits += 1
+			return None
+
+		if missing := list(dict.fromkeys(f for f in fields if f not in row)):
+			fetched = fetch(missing)
+			if fetched is None:
+				self.rows[key] = None
+				return None
+			row = self.rows[key] = {**row, **fetched}
+		else:
+			self.hits += 1
+
+		return frappe._dict({f: row[f] for f in fields})
+
+	def invalidate(self, query_type: str):
+		"""Forget all rows if a query of `query_type` could have modified data."""
+		if self.rows and query_type not in READ_QUERY_TYPES:
+			self.rows.clear()
+
+	def clear(self):
+		self.rows.clear()
@@ -1,3 +1,4 @@
+import tempfile
 from contextlib import contextmanager
 
 import pymysql
@@ -7,8 +8,11 @@ from pymysql.converters import conversions, escape_string
 import frappe
 from frappe.database.database import Database
 from frappe.database.mariadb.schema import MariaDBTable
+from frappe.database.utils import encode_bulk_load_row
 from frappe.utils import UnicodeWithAttrs, cstr, get_datetime, get_table_name
 
+BULK_LOAD_SAVEPOINT = "bulk_load"
+
 
 class MariaDBExceptionUtil:
 	ProgrammingError = pymysql.ProgrammingError
@@ -116,6 +120,7 @@ class MariaDBConnectionUtil:
 
 	def set_execution_timeout(self, seconds: int):
 		self.sql("set session max_statement_time = %s", int(seconds))
+		self._session_timeout = int(seconds)
 
 	def get_connection_settings(self) -> dict:
 		conn_settings = {
@@ -564,6 +569,40 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 			self._cursor = original_cursor
 			new_cursor.close()
 
+	def _can_bulk_load(self, ignore_duplicates: bool) -> bool:
+		return bool(frappe.conf.local_infile)
+
+	def _bulk_load(self, doctype: str, fields: list[str], rows, ignore_duplicates: bool):
+		# Note: with LOCAL, rows conflicting with existing keys are always skipped with a warning, those
+		# are detected using count of loaded rows to fail like `INSERT` does. Rows that were loaded are
+		# rolled back to savepoint so that failing chunk isn't partially written.
+		if not ignore_duplicates:
+			self.savepoint(BULK_LOAD_SAVEPOINT)
+
+		with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".tsv") as f:
+			f.writelines(encode_bulk_load_row(row) for row in rows)
+			f.flush()
+			self.sql(
+				"""LOAD DATA LOCAL INFILE %s {ignore} INTO TABLE {table}
+				CHARACTER SET utf8mb4 ({columns})""".format(
+					ignore="IGNORE" if ignore_duplicates else "",
+					table=get_table_name(doctype, wrap_in_backticks=True),
+					columns=", ".join(f"`{field}`" for field in fields),
+				),
+				(f.name,),
+			)
+
+		if ignore_duplicates:
+			return
+
+		if (skipped := len(rows) - self._cursor.rowcount) > 0:
+			self.rollback(save_point=BULK_LOAD_SAVEPOINT)
+			raise frappe.DuplicateEntryError(
+				doctype, None, f"{skipped} rows conflicted with existing keys, chunk wasn't loaded"
+			)
+
+		self.release_savepoint(BULK_LOAD_SAVEPOINT)
+
 	def estimate_count(self, doctype: str):
 		"""Get estimated count of total rows in a table."""
 		from frappe.utils.data import cint
@@ -576,3 +615,14 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 			(table, frappe.db.cur_db_name),
 		)
 		return cint(count[0][0]) if count else 0
+
+	def get_replication_lag(self) -> float | None:
+		"""Return seconds this replica is behind primary, `None` if replication isn't running.
+
+		Needs global `REPLICATION CLIENT` / `SLAVE MONITOR` privilege, see `frappe.database.replica`."""
+		status = self.sql("show slave status", as_dict=True)
+		if not status:
+			# not a replica
+			return 0.0
+		lag = status[0].get("Seconds_Behind_Master")
+		return None if lag is None else float(lag)
@@ -118,6 +118,7 @@ class MariaDBConnectionUtil:
 
 	def set_execution_timeout(self, seconds: int):
 		self.sql("set session max_statement_time = %s", int(seconds))
+		self._session_timeout = int(seconds)
 
 	def get_connection_settings(self) -> dict:
 		conn_settings = {
@@ -602,3 +603,14 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 			(table, frappe.db.cur_db_name),
 		)
 		return cint(count[0][0]) if count else 0
+
+	def get_replication_lag(self) -> float | None:
+		"""Return seconds this replica is behind primary, `None` if replication isn't running.
+
+		Needs global `REPLICATION CLIENT` / `SLAVE MONITOR` privilege, see `frappe.database.replica`."""
+		status = self.sql("show slave status", as_dict=True)
+		if not status:
+			# not a replica
+			return 0.0
+		lag = status[0].get("Seconds_Behind_Master")
+		return None if lag is None else float(lag)
@@ -0,0 +1,155 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Keyset (seek) pagination.
+
+Instead of skipping `offset` rows, the next page is selected using values of the sort columns in the
+last row of the previous page, e.g. `where creation < %(last_creation)s or (creation = %(last_creation)s
+and name < %(last_name)s)`. With an index on the sort columns the database seeks directly to that
+position, so deep pages cost as much as the first one.
+
+The position is passed around as an opaque cursor. An empty cursor requests the first page. `name` is
+always added as the last sort column so that every row has a unique position.
+"""
+
+import base64
+import binascii
+import re
+
+import orjson
+
+import frappe
+from frappe import _
+from frappe.database.utils import DefaultOrderBy, get_doctype_sort_info
+
+# Standard columns that can never be NULL
+KEYSET_STANDARD_FIELDS = ("name", "creation", "modified", "idx", "docstatus")
+# Columns of these types are created with `not null default 0`
+KEYSET_FIELDTYPES = ("Int", "Float", "Currency", "Percent", "Check")
+
+ORDER_FIELD_PATTERN = re.compile(r"^(?:`?tab(?P<doctype>[^`.]+)`?\.)?`?(?P<fieldname>\w+)`?$")
+
+
+class InvalidCursor(frappe.ValidationError):
+	pass
+
+
+def get_keyset_order(doctype: str, order_by: str | None = None) -> list[tuple[str, str]]:
+	"""Return `[(fieldname, "asc"|"desc"), ...]` to sort `doctype` by for keyset pagination.
+
+	Raise `frappe.ValidationError` if rows can't be paginated using a cursor with `order_by`, sort
+	columns must belong to `doctype` and can't contain NULL values."""
+	if not order_by or order_by == DefaultOrderBy:
+		sort_field, sort_order = get_doctype_sort_info(doctype)
+		order_by = ", ".join(
+			spec if len(spec.split()) > 1 else f"{spec} {sort_order}"
+			for spec in (s.strip() for s in sort_field.split(","))
+			if spec
+		)
+
+	meta = frappe.get_meta(doctype)
+	order = []
+	for spec in order_by.split(","):
+		column, _sep, direction = spec.strip().partition(" ")
+		direction = direction.strip().lower() or "asc"
+		match = ORDER_FIELD_PATTERN.match(column)
+		if (
+			not match
+			or direction not in ("asc", "desc")
+			or match["doctype"] not in (None, doctype)
+			or not is_keyset_field(meta, match["fieldname"])
+		):
+			frappe.throw(
+				_("Cannot paginate using a cursor when sorting by {0}").format(spec.strip()),
+				InvalidCursor,
+			)
+		order.append((match["fieldname"], direction))
+
+	fields = [fieldname for fieldname, _direction in order]
+	if "name" in fields:
+		# columns after name can't change the order
+		order = order[: fields.index("name") + 1]
+	else:
+		order.append(("name", order[-1][1]))
+
+	return order
+
+
+def is_keyset_order(doctype: str, order_by: str | None = None) -> bool:
+	"""Check if rows of `doctype` sorted by `order_by` can be paginated using a cursor."""
+	try:
+		get_keyset_order(doctype, order_by)
+	except InvalidCursor:
+		return False
+	return True
+
+
+def is_keyset_field(meta, fieldname: str) -> bool:
+	if fieldname in KEYSET_STANDARD_FIELDS:
+		return True
+
+	df = meta.get_field(fieldname)
+	return bool(df and (df.fieldtype in KEYSET_FIELDTYPES or getattr(df, "not_nullable", False)))
+
+
+def encode_cursor(order: list[tuple[str, str]], values: list) -> str:
+	payload = orjson.dumps(
+		[[fieldname for fieldname, _direction in order], values],
+		default=str,
+		option=orjson.OPT_PASSTHROUGH_DATETIME,
+	)
+	return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(order: list[tuple[str, str]], cursor: str) -> list:
+	"""Return values of sort columns stored in `cursor`, the cursor must have been created for `order`."""
+	try:
+		fields, values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+	except (ValueError, TypeError, binascii.Error):
+		frappe.throw(_("Invalid cursor"), InvalidCursor)
+
+	if fields != [fieldname for fieldname, _direction in order] or len(values) != len(order):
+		frappe.throw(_("Cursor doesn't match the sort order"), InvalidCursor)
+
+	if not all(isinstance(value, str | int | float) for value in values):
+		frappe.throw(_("Invalid cursor"), InvalidCursor)
+
+	return values
+
+
+def get_next_cursor(
+	order: list[tuple[str, str]], rows: list[dict], page_length: int | None = None
+) -> str | None:
+	"""Return cursor pointing after the last row, `None` if there are no more rows."""
+	if not rows or (page_length and len(rows) < page_length):
+		return None
+
+	last_row = rows[-1]
+	if not isinstance(last_row, dict):
+		frappe.throw(_("Rows must be fetched as dicts to paginate using a cursor"), InvalidCursor)
+
+	try:
+		return encode_cursor(order, [last_row[fieldname] for fieldname, _direction in order])
+	except KeyError:
+		frappe.throw(
+			_("Fields {0} must be selected to paginate using a cursor").format(
+				", ".join(fieldname for fieldname, _direction in order)
+			),
+			InvalidCursor,
+		)
+
+
+def add_keyset_fields(doctype: str, fields: list | None, order: list[tuple[str, str]]) -> list:
+	"""Return `fields` with sort columns added, these are required to build the next cursor."""
+	fields = list(fields or ["name"])
+	if "*" in fields or f"`tab{doctype}`.*" in fields:
+		return fields
+
+	selected = {
+		match["fieldname"]
+		for field in fields
+		if isinstance(field, str)
+		and (match := ORDER_FIELD_PATTERN.match(field.strip()))
+		and match["doctype"] in (None, doctype)
+	}
+	fields.extend(fieldname for fieldname, _direction in order if fieldname not in selected)
+	return fields
@@ -0,0 +1,166 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Per-process pool of database connections reused across requests and jobs.
+
+Without a pool every request/job opens a new connection (TCP + auth handshake) in `Database.connect`
+and closes it in `frappe.destroy`. With pooling enabled, `Database.close` rolls back whatever was left
+open and keeps the connection idle in this process, the next `Database.connect` with the same
+credentials picks it up again.
+
+Enable it by setting `db_pool_size` in site config, that's the maximum number of idle connections kept
+per site (database credentials) in each process. Connections are closed instead of being reused:
+	- when they are older than `db_pool_max_lifetime` seconds (default 600), idle connections of all
+	  sites are checked for this whenever a connection is returned.
+	- if they fail a health check (ping), which is only done if they were idle for a while.
+	- if rollback fails when returning them.
+
+Connections are never shared between forked processes, a pool inherited from parent is discarded.
+"""
+
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from time import monotonic
+
+DEFAULT_MAX_LIFETIME = 600
+# Connections idle for longer than this are pinged before being handed out
+HEALTH_CHECK_INTERVAL = 30
+
+
+@dataclass
+class PooledConnection:
+	conn: object
+	created_at: float = field(default_factory=monotonic)
+	released_at: float = 0.0
+	# statement timeout (seconds) left set on the session by last user, see `Database.connect`
+	session_timeout: int = 0
+
+	def is_expired(self, max_lifetime: float, now: float | None = None) -> bool:
+		return ((now or monotonic()) - self.created_at) > max_lifetime
+
+
+@dataclass
+class PoolStats:
+	created: int = 0
+	reused: int = 0
+	# closed because they were too old, unhealthy, couldn't be reset or pool was full
+	discarded: int = 0
+	health_checks: int = 0
+
+
+class ConnectionPool:
+	def __init__(self):
+		self._idle: dict[Hashable, deque[PooledConnection]] = {}
+		self._lock = threading.Lock()
+		self._pid = os.getpid()
+		self.stats = PoolStats()
+
+	def acquire(
+		self,
+		key: Hashable,
+		create: Callable[[], object],
+		is_usable: Callable[[object], bool],
+		max_lifetime: float = DEFAULT_MAX_LIFETIME,
+	) -> PooledConnection:
+		"""Return an idle connection for `key`, or a new one created using `create()`.
+
+		Most recently used connection is reused first so that rarely needed ones expire."""
+		while entry := self._pop(key):
+			now = monotonic()
+			if entry.is_expired(max_lifetime, now):
+				self._discard(entry)
+				continue
+
+			if now - entry.released_at > HEALTH_CHECK_INTERVAL:
+				self.stats.health_checks += 1
+				if not is_usable(entry.conn):
+					self._discard(entry)
+					continue
+
+			self.stats.reused += 1
+			return entry
+
+		conn = create()
+		self.stats.created += 1
+		return PooledConnection(conn)
+
+	def release(
+		self,
+		key: Hashable,
+		entry: PooledConnection,
+		max_idle: int,
+		max_lifetime: float = DEFAULT_MAX_LIFETIME,
+	):
+		"""Keep `entry` for reuse, connection should already be rolled back by caller."""
+		now = monotonic()
+		entry.released_at = now
+
+		with self._lock:
+			self._check_pid()
+			self._reap(now, max_lifetime)
+			idle = self._idle.setdefault(key, deque())
+			if len(idle) < max_idle and not entry.is_expired(max_lifetime, now):
+				idle.append(entry)
+				return
+
+		self._discard(entry)
+
+	def clear(self):
+		"""Close all idle connections."""
+		with self._lock:
+			idle, self._idle = self._idle, {}
+
+		for entries in idle.values():
+			for entry in entries:
+				self._discard(entry)
+
+	def get_stats(self) -> dict:
+		with self._lock:
+			idle = sum(len(entries) for entries in self._idle.values())
+		return {**self.stats.__dict__, "idle": idle}
+
+	def _pop(self, key: Hashable) -> PooledConnection | None:
+		with self._lock:
+			self._check_pid()
+			if idle := self._idle.get(key):
+				return idle.pop()
+
+	def _reap(self, now: float, max_lifetime: float):
+		for key, entries in list(self._idle.items()):
+			# entries are ordered by release time, not by age
+			alive = deque()
+			for entry in entries:
+				if entry.is_expired(max_lifetime, now):
+					self._discard(entry)
+				else:
+					alive.append(entry)
+
+			if alive:
+				self._idle[key] = alive
+			else:
+				del self._idle[key]
+
+	def _check_pid(self):
+		# connections inherited from parent process are still used by the parent, closing them
+		# here would close them for the parent too, so they are just forgotten.
+		if self._pid != os.getpid():
+			self._idle = {}
+			self.stats = PoolStats()
+			self._pid = os.getpid()
+
+	def _discard(self, entry: PooledConnection):
+		self.stats.discarded += 1
+		try:
+			entry.conn.close()
+		except Exception:
+			pass
+
+
+pool = ConnectionPool()
+
+
+def get_pool_stats() -> dict:
+	"""Return counts of connections created, reused, discarded and currently idle in this process."""
+	return pool.get_stats()
@@ -1,3 +1,4 @@
+import io
 import re
 from contextlib import contextmanager
 
@@ -26,7 +27,12 @@ from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
 import frappe
 from frappe.database.database import Database
 from frappe.database.postgres.schema import PostgresTable
-from frappe.database.utils import EmptyQueryValues, LazyDecode
+from frappe.database.utils import (
+	EmptyQueryValues,
+	LazyDecode,
+	cached_query_transform,
+	encode_bulk_load_row,
+)
 from frappe.utils import cstr, get_table_name
 
 # cast decimals as floats
@@ -197,6 +203,17 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 
 		return conn
 
+	def is_connection_usable(self, conn) -> bool:
+		if conn.closed:
+			return False
+		try:
+			with conn.cursor() as cursor:
+				cursor.execute("select 1")
+			conn.rollback()
+		except Exception:
+			return False
+		return True
+
 	def set_execution_timeout(self, seconds: int):
 		# Postgres expects milliseconds as input
 		self.sql("set local statement_timeout = %s", int(seconds) * 1000)
@@ -231,7 +248,8 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 
 	# pylint: disable=W0221
 	def sql(self, query, values=EmptyQueryValues, *args, **kwargs):
-		return super().sql(modify_query(query), modify_values(values), *args, **kwargs)
+		query = cached_modify_query(query) if isinstance(query, str) else modify_query(query)
+		return super().sql(query, modify_values(values), *args, **kwargs)
 
 	def lazy_mogrify(self, *args, **kwargs) -> str:
 		return self.last_query
@@ -486,6 +504,25 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 	def get_database_list(self):
 		return self.sql("SELECT datname FROM pg_database", pluck=True)
 
+	def _can_bulk_load(self, ignore_duplicates: bool) -> bool:
+		# COPY can't skip conflicting rows
+		return not ignore_duplicates
+
+	def _bulk_load(self, doctype: str, fields: list[str], rows, ignore_duplicates: bool):
+		if not self._conn:
+			self.connect()
+
+		query = sql.SQL("COPY {table} ({columns}) FROM STDIN").format(
+			table=sql.Identifier(get_table_name(doctype)),
+			columns=sql.SQL(", ").join(sql.Identifier(field) for field in fields),
+		)
+		self.check_transaction_status("COPY", "insert")
+
+		buffer = io.StringIO()
+		buffer.writelines(encode_bulk_load_row(row) for row in rows)
+		buffer.seek(0)
+		self._cursor.copy_expert(query, buffer)
+
 	def estimate_count(self, doctype: str):
 		"""Get estimated count of total rows in a table."""
 		from frappe.utils.data import cint
@@ -499,6 +536,18 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 		)
 		return cint(count[0][0]) if count else 0
 
+	def get_replication_lag(self) -> float | None:
+		"""Return seconds this replica is behind primary, `None` if replication isn't running.
+
+		Replica that has replayed everything it received is up to date, time since last replayed
+		transaction only grows while primary is idle."""
+		lag = self.sql(
+			"""select case when not pg_is_in_recovery() then 0
+			when pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() then 0
+			else extract(epoch from now() - pg_last_xact_replay_timestamp()) end"""
+		)[0][0]
+		return None if lag is None else float(lag)
+
 	@contextmanager
 	def unbuffered_cursor(self):
 		"""Unbuffered cursor in Postgres can only call .execute() once,
@@ -535,6 +584,9 @@ def modify_query(query):
 	return PG_TRANSFORM_PATTERN.sub(r"\1 '\2'", query)
 
 
+cached_modify_query = cached_query_transform(modify_query)
+
+
 def modify_values(values):
 	def modify_value(value):
 		if isinstance(value, list | tuple):
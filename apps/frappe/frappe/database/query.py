@@ -1,7 +1,6 @@
 import datetime
 import re
 import warnings
-from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Literal
 
 from pypika.enums import Arithmetic
@@ -11,9 +10,11 @@ from pypika.terms import AggregateFunction, ArithmeticExpression, Star, Term, Va
 import frappe
 from frappe import _
 from frappe.database.operator_map import NESTED_SET_OPERATORS, OPERATOR_MAP
+from frappe.database.pagination import InvalidCursor, decode_cursor, get_keyset_order
 from frappe.database.utils import (
 	DefaultOrderBy,
 	FilterValue,
+	cached_query_transform,
 	convert_to_value,
 	get_doctype_name,
 	get_doctype_sort_info,
@@ -237,6 +238,7 @@ class Engine:
 		reference_doctype: str | None = None,
 		or_filters: dict[str, FilterValue] | FilterValue | list[list | FilterValue] | None = None,
 		db_query_compat: bool = False,
+		cursor: str | None = None,
 	) -> QueryBuilder:
 		"""Build a query with optional compatibility mode for legacy db_query behavior.
 
@@ -245,6 +247,8 @@ class Engine:
 			This is kept optional to not break existing code that relies on the original query builder behaviour.
 			ignore_user_permissions: Ignore user permissions for the query.
 				Useful for link search queries when the link field has `ignore_user_permissions` set.
+			cursor: Paginate using a cursor instead of `offset`, pass an empty string for the first page.
+				Sort columns are stored as `query._keyset_order`, see `frappe.database.pagination`.
 			validate_filters: DEPRECATED. Will be removed in future versions.
 		"""
 
@@ -294,6 +298,12 @@ class Engine:
 		self.apply_filters(filters)
 		self.apply_or_filters(or_filters)
 
+		keyset_order = None
+		if cursor is not None:
+			keyset_order = self.apply_cursor(cursor, order_by, group_by=group_by, distinct=distinct)
+			order_by = ", ".join(f"{fieldname} {direction}" for fieldname, direction in keyset_order)
+			offset = None
+
 		if limit:
 			if not isinstance(limit, int) or limit < 0:
 				frappe.throw(_("Limit must be a non-negative integer"), TypeError)
@@ -333,10 +343,33 @@ class Engine:
 		# Store metadata for masked field processing during execution
 		self.query._doctype = self.doctype
 		self.query._fields_list = getattr(self, "fields", [])
+		self.query._keyset_order = keyset_order
 
 		self.query.immutable = True
 		return self.query
 
+	def apply_cursor(self, cursor: str, order_by: str | None, group_by=None, distinct=False) -> list:
+		"""Select rows after the position stored in `cursor` and return the sort order to use."""
+		if group_by or distinct:
+			frappe.throw(_("Cannot paginate using a cursor with group by or distinct"), InvalidCursor)
+
+		keyset_order = get_keyset_order(self.doctype, order_by)
+		if not cursor:
+			return keyset_order
+
+		conditions = []
+		preceding = []
+		for (fieldname, direction), value in zip(
+			keyset_order, decode_cursor(keyset_order, cursor), strict=True
+		):
+			field = self.table[fieldname]
+			after = field > value if direction == "asc" else field < value
+			conditions.append(Criterion.all([*preceding, after]))
+			preceding.append(field == value)
+
+		self.query = self.query.where(Criterion.any(conditions))
+		return keyset_order
+
 	def validate_doctype(self):
 		if not TABLE_NAME_PATTERN.match(self.doctype):
 			frappe.throw(_("Invalid DocType: {0}").format(self.doctype))
@@ -1006,39 +1039,31 @@ class Engine:
 		initial_field_list = []
 		if isinstance(fields, str):
 			# Split comma-separated fields passed as a single string
-			initial_field_list.extend(f.strip() for f in COMMA_PATTERN.split(fields) if f.strip())
+			initial_field_list.extend(_split_select_fields(fields))
 		elif isinstance(fields, list | tuple | set):
 			for item in fields:
 				if item is None:
 					continue
 				if isinstance(item, str) and "," in item:
 					# Split comma-separated strings within the list
-					initial_field_list.extend(f.strip() for f in COMMA_PATTERN.split(item) if f.strip())
+					initial_field_list.extend(_split_select_fields(item))
+				elif isinstance(item, str):
+					initial_field_list.append(_validate_select_field(item.strip()))
 				else:
-					# Add non-comma-separated items directly
+					# Add non-string items (like dict for child query, or pre-parsed Field/Function) directly
 					initial_field_list.append(item)
 
 		else:
 			frappe.throw(_("Fields must be a string, list, tuple, pypika Field, or pypika Function"))
 
 		_fields = []
-		# Iterate through the list where each item could be a single field, criterion, or a comma-separated string
+		# Iterate through the list where each item could be a validated field string, criterion or dict
 		for item in initial_field_list:
-			if isinstance(item, str):
-				# Sanitize and split potentially comma-separated strings within the list
-				if sanitized_item := _validate_select_field(item.strip()):
-					parsed = self._parse_single_field_item(sanitized_item)
-					if isinstance(parsed, list):  # Result from parsing a child query dict
-						_fields.extend(parsed)
-					elif parsed:
-						_fields.append(parsed)
-			else:
-				# Handle non-string items (like dict for child query, or pre-parsed Field/Function)
-				parsed = self._parse_single_field_item(item)
-				if isinstance(parsed, list):
-					_fields.extend(parsed)
-				elif parsed:
-					_fields.append(parsed)
+			parsed = self._parse_single_field_item(item)
+			if isinstance(parsed, list):  # Result from parsing a child query dict
+				_fields.extend(parsed)
+			elif parsed:
+				_fields.append(parsed)
 
 		return _fields
 
@@ -1209,51 +1234,25 @@ class Engine:
 		if not isinstance(group_by, str):
 			frappe.throw(_("Group By must be a string"), TypeError)
 
-		parsed_fields = []
-		for part in group_by.split(","):
-			field_name = part.strip()
-			if not field_name:
-				continue
-
-			parsed_field = self._validate_and_parse_field_for_clause(field_name, "Group By")
-			parsed_fields.append(parsed_field)
-
-		return parsed_fields
+		return [
+			self._validate_and_parse_field_for_clause(field_name, "Group By")
+			for field_name in _split_group_by(group_by)
+		]
 
 	def _validate_order_by(self, order_by: str) -> list[tuple[Field | str, Order]]:
 		"""Validate the order_by string argument, apply joins for dynamic fields, and return parsed Field objects with directions."""
 		if not isinstance(order_by, str):
 			frappe.throw(_("Order By must be a string"), TypeError)
 
-		valid_directions = {"asc", "desc"}
 		parsed_order_fields = []
+		for field_name, direction in _split_order_by(order_by):
+			if self.db_query_compat:
+				order_direction = Order.desc if direction == "desc" else Order.asc
+			else:
+				order_direction = Order.asc if direction == "asc" else Order.desc
 
-		for declaration in order_by.split(","):
-			if _order_by := declaration.strip():
-				# Extract direction from end of declaration (handles backtick identifiers with spaces)
-				# Check if the last word is a valid direction
-				parts = _order_by.split()
-				direction = None
-				field_name = _order_by
-
-				if len(parts) > 1 and parts[-1].lower() in valid_directions:
-					# Last part is a direction, so field_name is everything before it
-					direction = parts[-1].lower()
-					field_name = " ".join(parts[:-1])
-
-				if self.db_query_compat:
-					order_direction = Order.desc if direction == "desc" else Order.asc
-				else:
-					order_direction = Order.asc if direction == "asc" else Order.desc
-
-				parsed_field = self._validate_and_parse_field_for_clause(field_name, "Order By")
-				parsed_order_fields.append((parsed_field, order_direction))
-
-				if direction and direction not in valid_directions:
-					frappe.throw(
-						_("Invalid direction in Order By: {0}. Must be 'ASC' or 'DESC'.").format(direction),
-						ValueError,
-					)
+			parsed_field = self._validate_and_parse_field_for_clause(field_name, "Order By")
+			parsed_order_fields.append((parsed_field, order_direction))
 
 		return parsed_order_fields
 
@@ -1349,20 +1348,55 @@ class Engine:
 		return allowed_fields
 
 	def get_user_permission_conditions(
-		self, doctype: str | None = None, table: Table | None = None
+		self,
+		doctype: str | None = None,
+		table: Table | None = None,
+		user_permission_filters: list[tuple] | None = None,
 	) -> list[Criterion]:
 		"""Build conditions for user permissions."""
 		doctype = doctype or self.permission_doctype
 		table = table or self.permission_table
 		conditions = []
 
-		if self.ignore_user_permissions:
+		if user_permission_filters is None:
+			user_permission_filters = self.get_user_permission_filters(doctype)
+
+		if not user_permission_filters:
 			return conditions
 
+		strict_user_permissions = frappe.get_system_settings("apply_strict_user_permissions")
+		for field_name, allow, applicable_for, docs in user_permission_filters:
+			if frappe.permissions.use_permission_subquery(docs):
+				value_condition = Criterion.any(
+					table[field_name].isin(subquery)
+					for subquery in frappe.permissions.get_user_permission_subqueries(
+						self.user, allow, applicable_for
+					)
+				)
+			else:
+				value_condition = table[field_name].isin(docs)
+
+			if strict_user_permissions:
+				conditions.append(value_condition)
+			else:
+				empty_value_condition = functions.IfNull(table[field_name], "") == ""
+				conditions.append(empty_value_condition | value_condition)
+
+		return conditions
+
+	def get_user_permission_filters(self, doctype: str | None = None) -> list[tuple]:
+		"""Return `(fieldname, allowed doctype, applicable for, allowed docs)` for each link field of
+		`doctype` restricted by user permissions."""
+		doctype = doctype or self.permission_doctype
+		filters = []
+
+		if self.ignore_user_permissions:
+			return filters
+
 		user_permissions = frappe.permissions.get_user_permissions(self.user)
 
 		if not user_permissions:
-			return conditions
+			return filters
 
 		doctype_link_fields = self.get_doctype_link_fields(doctype)
 		for df in doctype_link_fields:
@@ -1387,15 +1421,12 @@ class Engine:
 
 				if docs:
 					field_name = df.get("fieldname")
-					strict_user_permissions = frappe.get_system_settings("apply_strict_user_permissions")
-					if strict_user_permissions:
-						conditions.append(table[field_name].isin(docs))
-					else:
-						empty_value_condition = functions.IfNull(table[field_name], "") == ""
-						value_condition = table[field_name].isin(docs)
-						conditions.append(empty_value_condition | value_condition)
+					applicable_for = (
+						self.reference_doctype if field_name == "name" and self.reference_doctype else doctype
+					)
+					filters.append((field_name, df.get("options"), applicable_for, docs))
 
-		return conditions
+		return filters
 
 	def get_doctype_link_fields(self, doctype: str | None = None):
 		doctype = doctype or self.permission_doctype
@@ -1449,28 +1480,32 @@ class Engine:
 			self.query = self.query.where(condition)
 
 	def get_permission_conditions(self, doctype: str, table: Table) -> Criterion | None:
-		role_permissions = frappe.permissions.get_role_permissions(doctype, user=self.user)
-		has_role_permission = role_permissions.get("read") or role_permissions.get("select")
+		compiled = frappe.permissions.get_compiled_permission_conditions(
+			self.user,
+			("Engine", doctype, self.reference_doctype, bool(self.ignore_user_permissions)),
+			lambda: self.compile_permission_conditions(doctype),
+		)
 
-		if not has_role_permission:
+		if not compiled.has_role_permission:
 			# no role permissions, apply only share permissions
-			shared_docs = frappe.share.get_shared(doctype, self.user)
-			if not shared_docs:
+			if not compiled.shared:
 				# no permissions at all
 				self._raise_permission_error(doctype=doctype)
 
-			return table.name.isin(shared_docs)
+			return self.get_share_condition(doctype, table, compiled.shared)
 
 		# build conditions from: if_owner constraint OR user permissions
 		conditions = []
 
-		if self.requires_owner_constraint(role_permissions):
+		if compiled.owner_constraint:
 			# skip user perm check if owner constraint is required
 			conditions.append(table.owner == self.user)
-		elif user_perm_conditions := self.get_user_permission_conditions(doctype, table):
+		elif user_perm_conditions := self.get_user_permission_conditions(
+			doctype, table, compiled.user_permission_filters
+		):
 			conditions.extend(user_perm_conditions)
 
-		conditions.extend(self.get_permission_query_conditions(doctype))
+		conditions.extend(self.get_permission_query_conditions(doctype, compiled.permission_query_conditions))
 
 		if not conditions:
 			# no conditions to apply, all documents are accessible
@@ -1479,24 +1514,51 @@ class Engine:
 		where_condition = Criterion.all(conditions)
 
 		# since some conditions apply, we need to consider shared docs as well
-		shared_docs = frappe.share.get_shared(doctype, self.user)
-		if shared_docs:
+		if compiled.shared:
 			# shared docs trump all other restrictions
-			where_condition |= table.name.isin(shared_docs)
+			where_condition |= self.get_share_condition(doctype, table, compiled.shared)
 
 		return where_condition
 
-	def get_permission_query_conditions(self, doctype: str | None = None) -> list["RawCriterion"]:
+	def compile_permission_conditions(self, doctype: str) -> frappe._dict:
+		"""Evaluate role permissions, user permissions, shares and cacheable permission query hooks of
+		the user on `doctype`. The result is cached, see `get_compiled_permission_conditions`."""
+		role_permissions = frappe.permissions.get_role_permissions(doctype, user=self.user)
+		has_role_permission = bool(role_permissions.get("read") or role_permissions.get("select"))
+		owner_constraint = has_role_permission and bool(self.requires_owner_constraint(role_permissions))
+
+		return frappe._dict(
+			has_role_permission=has_role_permission,
+			owner_constraint=owner_constraint,
+			user_permission_filters=(
+				self.get_user_permission_filters(doctype)
+				if has_role_permission and not owner_constraint
+				else []
+			),
+			permission_query_conditions=(
+				self.get_cacheable_permission_query_conditions(doctype) if has_role_permission else []
+			),
+			shared=frappe.share.get_shared(doctype, self.user),
+		)
+
+	def get_share_condition(self, doctype: str, table: Table, shared_docs: list[str]) -> Criterion:
+		if frappe.permissions.use_permission_subquery(shared_docs):
+			return table.name.isin(frappe.share.get_shared_query(doctype, self.user))
+		return table.name.isin(shared_docs)
+
+	def get_permission_query_conditions(
+		self, doctype: str | None = None, cached_conditions: list[str] | None = None
+	) -> list["RawCriterion"]:
 		"""Add permission query conditions from hooks and server scripts"""
 		from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
 
 		doctype = doctype or self.permission_doctype
-		conditions = []
-		hooks = frappe.get_hooks("permission_query_conditions", {})
-		condition_methods = hooks.get(doctype, []) + hooks.get("*", [])
+		if cached_conditions is None:
+			cached_conditions = self.get_cacheable_permission_query_conditions(doctype)
 
-		for method in condition_methods:
-			if c := frappe.call(frappe.get_attr(method), self.user, doctype=doctype):
+		conditions = [RawCriterion(f"({c})") for c in cached_conditions]
+		for method in frappe.permissions.get_permission_query_methods(doctype, cacheable=False):
+			if c := frappe.call(method, self.user, doctype=doctype):
 				conditions.append(RawCriterion(f"({c})"))
 
 		# Get conditions from server scripts
@@ -1506,6 +1568,13 @@ class Engine:
 				conditions.append(RawCriterion(f"({condition})"))
 		return conditions
 
+	def get_cacheable_permission_query_conditions(self, doctype: str) -> list[str]:
+		return [
+			c
+			for method in frappe.permissions.get_permission_query_methods(doctype, cacheable=True)
+			if (c := frappe.call(method, self.user, doctype=doctype))
+		]
+
 	def get_permission_type(
 		self, doctype: str, parent_doctype: str | None = None
 	) -> Literal["read", "select"]:
@@ -1909,7 +1978,35 @@ def _is_function_call(field_str: str) -> bool:
 	return bool(FUNCTION_CALL_PATTERN.match(field_str))
 
 
-@lru_cache(maxsize=1024)
+@cached_query_transform
+def _split_select_fields(fields: str) -> tuple[str, ...]:
+	"""Split comma-separated `fields` and validate each of them for use in a SELECT clause."""
+	return tuple(_validate_select_field(field) for f in COMMA_PATTERN.split(fields) if (field := f.strip()))
+
+
+@cached_query_transform
+def _split_group_by(group_by: str) -> tuple[str, ...]:
+	"""Split comma-separated `group_by` into field names."""
+	return tuple(field_name for part in group_by.split(",") if (field_name := part.strip()))
+
+
+@cached_query_transform
+def _split_order_by(order_by: str) -> tuple[tuple[str, str | None], ...]:
+	"""Split comma-separated `order_by` into `(field name, "asc" | "desc" | None)` pairs."""
+	parsed = []
+	for declaration in order_by.split(","):
+		if _order_by := declaration.strip():
+			# Extract direction from end of declaration (handles backtick identifiers with spaces)
+			parts = _order_by.split()
+			if len(parts) > 1 and parts[-1].lower() in ("asc", "desc"):
+				parsed.append((" ".join(parts[:-1]), parts[-1].lower()))
+			else:
+				parsed.append((_order_by, None))
+
+	return tuple(parsed)
+
+
+@cached_query_transform
 def _validate_select_field(field: str):
 	"""Validate a field string intended for use in a SELECT clause."""
 	if field == "*":
@@ -0,0 +1,91 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Routing of reads to a read replica.
+
+Reads are sent to the replica configured in site config (`read_from_replica`, `replica_host` etc.) for:
+	- functions decorated with `@frappe.read_only()`
+	- GET requests to methods whitelisted with `@frappe.whitelist(read_only=True)` or listed in
+	  `read_from_replica_methods` in site config.
+
+Primary is used instead when:
+	- current request/job has written something, replica might not have those changes yet.
+	- replica is more than `replica_max_lag` seconds (default 10, 0 disables the check) behind primary or
+	  isn't replicating. Lag is checked at most once every few seconds per site.
+
+Checking lag on MariaDB needs `REPLICATION CLIENT` (`SLAVE MONITOR` since MariaDB 10.5) privilege, which
+has to be granted globally to the replica user, e.g. `GRANT SLAVE MONITOR ON *.* TO 'user'@'%'`. If lag
+can't be checked, replica is used like it was before lag checks and the check is retried after a while.
+"""
+
+import frappe
+from frappe.utils import flt
+
+REPLICA_LAG_CACHE_KEY = "replica_lag"
+REPLICA_LAG_CHECK_INTERVAL = 5
+REPLICA_LAG_CHECK_RETRY_INTERVAL = 10 * 60
+DEFAULT_MAX_REPLICA_LAG = 10
+
+
+def get_replica_db():
+	from frappe.database import get_db
+
+	conf = frappe.local.conf
+	user = conf.db_user
+	password = conf.db_password
+
+	if conf.different_credentials_for_replica:
+		user = conf.replica_db_user or conf.replica_db_name
+		password = conf.replica_db_password
+
+	return get_db(
+		socket=None,
+		host=conf.replica_host,
+		port=conf.replica_db_port,
+		user=user,
+		password=password,
+		cur_db_name=conf.db_name,
+	)
+
+
+def can_read_from_replica(replica_db) -> bool:
+	"""Check if reads can be sent to `replica_db` instead of current (primary) connection."""
+	if frappe.local.db.transaction_writes or getattr(frappe.local, "committed_writes", False):
+		return False
+
+	max_lag = frappe.local.conf.replica_max_lag
+	max_lag = DEFAULT_MAX_REPLICA_LAG if max_lag is None else flt(max_lag)
+	if not max_lag:
+		return True
+
+	lag = frappe.cache.get_value(REPLICA_LAG_CACHE_KEY)
+	if lag is None:
+		lag = get_replication_lag(replica_db)
+
+	return lag <= max_lag
+
+
+def get_replication_lag(replica_db) -> float:
+	"""Check and cache lag of `replica_db`, infinite if replication isn't running."""
+	expires_in_sec = REPLICA_LAG_CHECK_INTERVAL
+	try:
+		lag = replica_db.get_replication_lag()
+	except Exception as e:
+		# usually missing privilege, see module docstring
+		frappe.logger("database").warning(f"Could not check replication lag of replica, ignoring it: {e}")
+		lag, expires_in_sec = 0.0, REPLICA_LAG_CHECK_RETRY_INTERVAL
+
+	if lag is None:
+		lag = float("inf")
+
+	frappe.cache.set_value(REPLICA_LAG_CACHE_KEY, lag, expires_in_sec=expires_in_sec)
+	return lag
+
+
+def is_read_only_request(cmd: str, method) -> bool:
+	"""Check if request to whitelisted `method` can be served from replica, see module docstring."""
+	conf = frappe.local.conf
+	request = getattr(frappe.local, "request", None)
+	if not conf.read_from_replica or not request or request.method != "GET":
+		return False
+
+	return method in frappe.read_only_methods or cmd in (conf.read_from_replica_methods or ())
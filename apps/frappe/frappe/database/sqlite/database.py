@@ -11,6 +11,7 @@ from frappe.database.database import (
 	ImplicitCommitError,
 )
 from frappe.database.sqlite.schema import SQLiteTable
+from frappe.database.utils import cached_query_transform
 from frappe.utils import get_table_name
 
 _PARAM_COMP = re.compile(r"%\([\w]*\)s")
@@ -102,6 +103,7 @@ class SQLiteDatabase(SQLiteExceptionUtil, Database):
 	REGEX_CHARACTER = "regexp"
 	default_port = None
 	MAX_ROW_SIZE_LIMIT = None
+	SUPPORTS_CONNECTION_POOL = False
 
 	def get_connection(self, read_only: bool = False):
 		conn = self.create_connection(read_only)
@@ -446,10 +448,10 @@ class SQLiteDatabase(SQLiteExceptionUtil, Database):
 		if args:
 			# since tuple is immutable
 			args = list(args)
-			args[0] = modify_query(args[0])
+			args[0] = _modify_query(args[0])
 			args = tuple(args)
 		elif kwargs.get("query"):
-			kwargs["query"] = modify_query(kwargs.get("query"))
+			kwargs["query"] = _modify_query(kwargs.get("query"))
 
 		return super().sql(*args, **kwargs)
 
@@ -543,6 +545,22 @@ class SQLiteDatabase(SQLiteExceptionUtil, Database):
 				raise
 		return 0
 
+	def _can_bulk_load(self, ignore_duplicates: bool) -> bool:
+		return True
+
+	def _bulk_load(self, doctype: str, fields: list[str], rows, ignore_duplicates: bool):
+		if not self._conn:
+			self.connect()
+
+		query = 'INSERT {ignore} INTO "{table}" ({columns}) VALUES ({values})'.format(
+			ignore="OR IGNORE" if ignore_duplicates else "",
+			table=get_table_name(doctype),
+			columns=", ".join(f'"{field}"' for field in fields),
+			values=", ".join(["?"] * len(fields)),
+		)
+		self.check_transaction_status(query, "insert")
+		self._cursor.executemany(query, rows)
+
 	def truncate(self, doctype: str):
 		"""Truncate a table."""
 		table = get_table_name(doctype)
@@ -570,6 +588,13 @@ def modify_query(query):
 	return query
 
 
+cached_modify_query = cached_query_transform(modify_query)
+
+
+def _modify_query(query):
+	return cached_modify_query(query) if isinstance(query, str) else modify_query(query)
+
+
 def replace_locate_with_instr(query: str) -> str:
 	# instr is the locate equivalent in SQLite
 	if re.search(r"locate\(", query, flags=re.IGNORECASE):
@@ -3,8 +3,8 @@
 
 import re
 import string
-from collections.abc import KeysView, ValuesView
-from functools import cached_property, wraps
+from collections.abc import KeysView, Sequence, ValuesView
+from functools import cached_property, lru_cache, wraps
 
 import frappe
 from frappe.query_builder.builder import MariaDB, Postgres, SQLite
@@ -28,6 +28,12 @@ NestedSetHierarchy = (
 # split when non-alphabetical character is found
 QUERY_TYPE_PATTERN = re.compile(r"\s*([A-Za-z]*)")
 
+# Memoization of textual query transformations, see `cached_query_transform`
+QUERY_CACHE_SIZE = 2048
+# Longer queries usually have inlined values and are unlikely to be repeated verbatim
+MAX_CACHED_QUERY_LENGTH = 8192
+_cached_query_transforms = []
+
 
 def convert_to_value(o: FilterValue):
 	if isinstance(o, bool):
@@ -47,6 +53,53 @@ def is_query_type(query: str, query_type: str | tuple[str, ...]) -> bool:
 	return get_query_type(query).startswith(query_type)
 
 
+def cached_query_transform(func):
+	"""Memoize a pure `query -> result` transformation keyed on the raw query text.
+
+	Queries run in loops (e.g. `frappe.db.get_value` for every row) are preprocessed only once per
+	process. Hits and misses of all such caches are reported by `get_query_cache_info`."""
+	cached_func = lru_cache(maxsize=QUERY_CACHE_SIZE)(func)
+
+	@wraps(func)
+	def wrapper(query: str):
+		if len(query) > MAX_CACHED_QUERY_LENGTH:
+			return func(query)
+		return cached_func(query)
+
+	wrapper.cache_info = cached_func.cache_info
+	wrapper.cache_clear = cached_func.cache_clear
+	_cached_query_transforms.append(wrapper)
+	return wrapper
+
+
+def get_query_cache_info() -> dict[str, int]:
+	"""Return process-wide hit and miss counts of query preprocessing caches."""
+	hits = misses = 0
+	for transform in _cached_query_transforms:
+		info = transform.cache_info()
+		hits += info.hits
+		misses += info.misses
+	return {"hits": hits, "misses": misses}
+
+
+# Text format shared by MariaDB's `LOAD DATA` and Postgres' `COPY`
+BULK_LOAD_NULL = "\\N"
+BULK_LOAD_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def encode_bulk_load_row(row: Sequence) -> str:
+	"""Encode a row as a tab separated line for `LOAD DATA` / `COPY`."""
+	return "\t".join(_encode_bulk_load_value(value) for value in row) + "\n"
+
+
+def _encode_bulk_load_value(value) -> str:
+	if value is None:
+		return BULK_LOAD_NULL
+	if isinstance(value, bool):
+		value = int(value)
+	return str(value).translate(BULK_LOAD_ESCAPES)
+
+
 def is_pypika_function_object(field: str) -> bool:
 	return getattr(field, "__module__", None) == "pypika.functions" or isinstance(field, Function)
 
@@ -1,15 +1,39 @@
+"""Insert records later, in bulk, from a queue kept in redis.
+
+Records are pushed to a redis list per doctype by `deferred_insert` and inserted by `save_to_db` which runs
+from scheduler. Queues are drained in chunks of `CHUNK_SIZE` entries, each doctype independently.
+
+Doctypes listed in `bulk_deferred_insert` hook skip the document lifecycle (validations, controller hooks)
+and are written using `frappe.model.document.bulk_insert`. If a bulk write fails, records of that chunk
+are inserted one by one instead.
+
+Records that can't be inserted are moved to a dead-letter list (`failed_insert_queue_for_<doctype>`),
+they can be put back in queue using `retry_failed_inserts`. Queue depth and drain rate of every doctype
+are available from `get_deferred_insert_stats`.
+"""
+
 import json
+import time
 from typing import TYPE_CHECKING, Union
 
 import redis
 
 import frappe
-from frappe.utils import cstr
+from frappe.utils import cstr, now
 
 if TYPE_CHECKING:
 	from frappe.model.document import Document
 
 queue_prefix = "insert_queue_for_"
+failed_queue_prefix = "failed_insert_queue_for_"
+stats_key = "deferred_insert_stats"
+
+# Number of queue entries (each of them can have multiple records) read from redis at once
+CHUNK_SIZE = 500
+# Maximum records inserted per doctype in one run, so that one busy doctype doesn't hold up the rest
+MAX_RECORDS_PER_RUN = 10000
+# Only the most recent failed records are kept
+MAX_FAILED_RECORDS = 10000
 
 
 def deferred_insert(doctype: str, records: list[dict | "Document"] | str):
@@ -28,32 +52,142 @@ def deferred_insert(doctype: str, records: list[dict | "Document"] | str):
 def save_to_db():
 	queue_keys = frappe.cache.get_keys(queue_prefix)
 	for key in queue_keys:
-		record_count = 0
-		queue_key = get_key_name(key)
 		doctype = get_doctype_name(key)
-		while frappe.cache.llen(queue_key) > 0 and record_count <= 10000:
-			records = frappe.cache.lpop(queue_key)
-			records = json.loads(records.decode("utf-8"))
-			if isinstance(records, dict):
-				record_count += 1
-				insert_record(records, doctype)
-				continue
-			for record in records:
-				record_count += 1
-				insert_record(record, doctype)
-				if record_count % 100 == 0:
-					frappe.db.commit()
-
-			if record_count % 100 == 0:
-				frappe.db.commit()
-
-
-def insert_record(record: dict | "Document", doctype: str):
+		try:
+			flush_queue(doctype)
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(f"Failed to insert deferred {doctype} records")
+
+
+def flush_queue(doctype: str) -> int:
+	"""Insert queued records of `doctype`, return number of records inserted."""
+	queue_key = f"{queue_prefix}{doctype}"
+	use_bulk_insert = doctype in frappe.get_hooks("bulk_deferred_insert")
+
+	start = time.monotonic()
+	inserted = failed = 0
+	while inserted + failed < MAX_RECORDS_PER_RUN and (records := pop_records(queue_key, CHUNK_SIZE)):
+		if use_bulk_insert:
+			failed_records = bulk_insert_records(records, doctype)
+		else:
+			failed_records = [record for record in records if not insert_record(record, doctype)]
+
+		frappe.db.commit()
+		move_to_failed_queue(failed_records, doctype)
+		inserted += len(records) - len(failed_records)
+		failed += len(failed_records)
+
+	if inserted or failed:
+		update_stats(doctype, inserted, failed, time.monotonic() - start)
+
+	return inserted
+
+
+def pop_records(queue_key: str, count: int) -> list[dict]:
+	"""Remove first `count` entries of queue and return records in them."""
+	key = frappe.cache.make_key(queue_key)
+	pipeline = frappe.cache.pipeline()
+	pipeline.lrange(key, 0, count - 1)
+	pipeline.ltrim(key, count, -1)
+	entries, _ = pipeline.execute()
+
+	records = []
+	for entry in entries:
+		entry = json.loads(entry.decode("utf-8"))
+		if isinstance(entry, dict):
+			records.append(entry)
+		else:
+			records.extend(entry)
+	return records
+
+
+def insert_record(record: dict | "Document", doctype: str) -> bool:
 	try:
 		record.update({"doctype": doctype})
 		frappe.get_doc(record).insert()
+		return True
 	except Exception as e:
 		frappe.logger().error(f"Error while inserting deferred {doctype} record: {e}")
+		return False
+
+
+def bulk_insert_records(records: list[dict], doctype: str) -> list[dict]:
+	"""Insert `records` without running document lifecycle, return records which couldn't be inserted."""
+	from frappe.model.document import bulk_insert
+
+	save_point = "deferred_insert"
+	frappe.db.savepoint(save_point)
+	try:
+		bulk_insert(doctype, [_make_doc(record, doctype) for record in records], chunk_size=CHUNK_SIZE)
+	except Exception as e:
+		frappe.db.rollback(save_point=save_point)
+		frappe.logger().error(f"Error while bulk inserting deferred {doctype} records: {e}")
+		return [record for record in records if not insert_record(record, doctype)]
+
+	frappe.db.release_savepoint(save_point)
+	return []
+
+
+def _make_doc(record: dict, doctype: str) -> "Document":
+	doc = frappe.get_doc({**record, "doctype": doctype})
+	doc._set_defaults()
+	doc.set_new_name()
+
+	# timestamps are set when the record is queued by `Document.deferred_insert`
+	doc.creation = doc.creation or now()
+	doc.modified = doc.modified or doc.creation
+	doc.owner = doc.owner or frappe.session.user
+	doc.modified_by = doc.modified_by or doc.owner
+	return doc
+
+
+def move_to_failed_queue(records: list[dict], doctype: str):
+	if not records:
+		return
+
+	key = frappe.cache.make_key(f"{failed_queue_prefix}{doctype}")
+	pipeline = frappe.cache.pipeline()
+	# one record per entry, so that trimming keeps `MAX_FAILED_RECORDS` records
+	pipeline.rpush(key, *(json.dumps(record, default=str) for record in records))
+	pipeline.ltrim(key, -MAX_FAILED_RECORDS, -1)
+	pipeline.execute()
+
+
+def retry_failed_inserts(doctype: str):
+	"""Put records which couldn't be inserted back in queue."""
+	key = f"{failed_queue_prefix}{doctype}"
+	while entry := frappe.cache.lpop(key):
+		frappe.cache.rpush(f"{queue_prefix}{doctype}", entry)
+
+
+def update_stats(doctype: str, inserted: int, failed: int, duration: float):
+	frappe.cache.hset(
+		stats_key,
+		doctype,
+		{
+			"last_run": now(),
+			"inserted": inserted,
+			"failed": failed,
+			"duration": duration,
+			"rate": inserted / duration if duration else 0.0,
+		},
+	)
+
+
+def get_deferred_insert_stats() -> dict[str, dict]:
+	"""Return queue depth, failed records and last drain rate (records/second) of every doctype."""
+	stats = {}
+	last_runs = {cstr(doctype): run for doctype, run in frappe.cache.hgetall(stats_key).items()}
+	doctypes = {get_doctype_name(key) for key in frappe.cache.get_keys(queue_prefix)} | set(last_runs)
+
+	for doctype in sorted(doctypes):
+		stats[doctype] = {
+			"queued": frappe.cache.llen(f"{queue_prefix}{doctype}"),
+			"failed": frappe.cache.llen(f"{failed_queue_prefix}{doctype}"),
+			"last_run": last_runs.get(doctype),
+		}
+	return stats
 
 
 def get_key_name(key: str) -> str:
@@ -6,6 +6,7 @@ import json
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.permissions import cacheable_permission_query
 
 
 class KanbanBoard(Document):
@@ -45,6 +46,7 @@ class KanbanBoard(Document):
 				frappe.msgprint(_("Column Name cannot be empty"), raise_exception=True)
 
 
+@cacheable_permission_query
 def get_permission_query_conditions(user):
 	if not user:
 		user = frappe.session.user
@@ -3,6 +3,7 @@
 
 import frappe
 from frappe.model.document import Document
+from frappe.permissions import cacheable_permission_query
 
 UNSEEN_NOTES_KEY = "unseen_notes::"
 
@@ -59,6 +60,7 @@ def mark_as_seen(note: str):
 	note.save(ignore_permissions=True, ignore_version=True)
 
 
+@cacheable_permission_query
 def get_permission_query_conditions(user):
 	if not user:
 		user = frappe.session.user
@@ -8,6 +8,7 @@ from frappe.desk.doctype.notification_settings.notification_settings import (
 	is_notifications_enabled,
 )
 from frappe.model.document import Document
+from frappe.permissions import cacheable_permission_query
 from frappe.utils.caching import http_cache
 
 
@@ -51,6 +52,7 @@ class NotificationLog(Document):
 		frappe.db.delete(table, filters=(table.creation < (Now() - Interval(days=days))))
 
 
+@cacheable_permission_query
 def get_permission_query_conditions(for_user):
 	if not for_user:
 		for_user = frappe.session.user
@@ -3,6 +3,7 @@
 
 import frappe
 from frappe.model.document import Document
+from frappe.permissions import cacheable_permission_query
 
 
 class NotificationSettings(Document):
@@ -100,6 +101,7 @@ def get_subscribed_documents():
 	return []
 
 
+@cacheable_permission_query
 def get_permission_query_conditions(user):
 	if not user:
 		user = frappe.session.user
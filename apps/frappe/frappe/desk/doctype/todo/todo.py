@@ -5,7 +5,7 @@ import json
 
 import frappe
 from frappe.model.document import Document
-from frappe.permissions import AUTOMATIC_ROLES
+from frappe.permissions import AUTOMATIC_ROLES, cacheable_permission_query
 from frappe.utils import get_fullname, parse_addr
 
 exclude_from_linked_with = True
@@ -146,6 +146,7 @@ def on_doctype_update():
 	frappe.db.add_index("ToDo", ["reference_type", "reference_name"])
 
 
+@cacheable_permission_query
 def get_permission_query_conditions(user):
 	if not user:
 		user = frappe.session.user
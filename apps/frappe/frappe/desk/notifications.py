@@ -39,8 +39,9 @@ def get_notifications():
 	notification_count = {}
 	notification_percent = {}
 
+	counts = frappe.cache.hget_names([f"notification_count:{name}" for name in groups], frappe.session.user)
 	for name in groups:
-		count = frappe.cache.hget("notification_count:" + name, frappe.session.user)
+		count = counts[f"notification_count:{name}"]
 		if count is not None:
 			notification_count[name] = count
 
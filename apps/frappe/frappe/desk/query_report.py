@@ -130,19 +130,17 @@ def generate_report_result(
 
 
 def normalize_result(result, columns):
-	# Convert to list of dicts from list of lists/tuples
-	data = []
+	# Convert to list of dicts from list of lists/tuples or dict of columns (`as_columns=True`)
 	column_names = [column["fieldname"] for column in columns]
+	if isinstance(result, dict):
+		length = len(next(iter(result.values()), ()))
+		values = [result.get(column_name) or [None] * length for column_name in column_names]
+		return [dict(zip(column_names, row, strict=True)) for row in zip(*values, strict=True)]
+
 	if result and isinstance(result[0], list | tuple):
-		for row in result:
-			row_obj = {}
-			for idx, column_name in enumerate(column_names):
-				row_obj[column_name] = row[idx]
-			data.append(row_obj)
-	else:
-		data = result
+		return [dict(zip(column_names, row, strict=False)) for row in result]
 
-	return data
+	return result
 
 
 @frappe.whitelist()
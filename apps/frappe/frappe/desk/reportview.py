@@ -4,6 +4,7 @@
 """build query for doclistview and return results"""
 
 import json
+import time
 from functools import lru_cache
 
 from sql_metadata import Parser
@@ -11,16 +12,28 @@ from sql_metadata import Parser
 import frappe
 import frappe.permissions
 from frappe import _
+from frappe.cache_manager import get_doctype_modified, mark_doctype_modified
 from frappe.core.doctype.access_log.access_log import make_access_log
+from frappe.database.pagination import (
+	add_keyset_fields,
+	get_keyset_order,
+	get_next_cursor,
+	is_keyset_order,
+)
 from frappe.model import child_table_fields, default_fields, get_permitted_fields, optional_fields
 from frappe.model.base_document import get_controller
 from frappe.model.qb_query import DatabaseQuery
 from frappe.model.utils import is_virtual_doctype
-from frappe.utils import add_user_info, cint, format_duration
+from frappe.utils import add_user_info, cint, format_duration, sha256_hash
 from frappe.utils.data import sbool
 
 DISALLOWED_PARAMS = ("cmd", "data", "ignore_permissions", "view", "user", "csrf_token", "join")
 
+# Counts of list queries are cached for this many seconds, see `get_cached_count`
+COUNT_CACHE_TTL = 60
+# Unfiltered counts aren't run if table statistics show this many times more rows than requested
+ESTIMATED_COUNT_MARGIN = 2
+
 
 @frappe.whitelist()
 @frappe.read_only()
@@ -31,7 +44,12 @@ def get():
 		controller = get_controller(args.doctype)
 		data = compress(frappe.call(controller.get_list, args=args, **args))
 	else:
-		data = compress(execute(**args), args=args)
+		keyset_order = setup_cursor_pagination(args)
+		result = execute(**args)
+		data = compress(result, args=args)
+		# sort columns may have been dropped because of field level permissions
+		if keyset_order and data and all(fieldname in result[-1] for fieldname, _order in keyset_order):
+			data["next_cursor"] = get_next_cursor(keyset_order, result, cint(args.page_length))
 	return data
 
 
@@ -63,16 +81,53 @@ def get_count() -> int | None:
 	args.limit = cint(args.limit)
 	fieldname = f"`tab{args.doctype}`.name"
 	args.order_by = None
+	args.pop("cursor", None)
+
+	args.fields = [fieldname]
+	query = execute(**args, run=0)
+	count_query = f"select count(*) from ( {query.get_sql()} ) p"
 
 	# args.limit is specified to avoid getting accurate count.
 	if not args.limit:
-		args.fields = [fieldname]
-		partial_query = execute(**args, run=0).get_sql()
-		return frappe.db.sql(f"select count(*) from ( {partial_query} ) p")[0][0]
+		return get_cached_count(args.doctype, count_query, lambda q: frappe.db.sql(q)[0][0])
 
-	args.fields = [fieldname]
-	partial_query = execute(**args, run=0)
+	if is_unfiltered(query) and frappe.db.estimate_count(args.doctype) >= args.limit * ESTIMATED_COUNT_MARGIN:
+		# table statistics show far more rows than requested, no need to count
+		count = args.limit
+	else:
+		count = get_cached_count(args.doctype, count_query, run_count_with_timeout)
+
+	if count == args.limit or count is None:
+		frappe.local.response_headers.set("Cache-Control", "private,max-age=600,stale-while-revalidate=10800")
+
+	return count
+
+
+def execute(doctype, *args, **kwargs):
+	return DatabaseQuery(doctype).execute(*args, **kwargs)
+
+
+def get_cached_count(doctype: str, query: str, run) -> int | None:
+	"""Return `run(query)`, cached for a short while and until documents of `doctype` change.
 
+	Permission conditions of the user are part of the query, so counts are only shared by users with the
+	same restrictions."""
+	key = f"list_count::{doctype}::{sha256_hash(query)}"
+	modified = get_doctype_modified(doctype)
+	if modified is None:
+		mark_doctype_modified(doctype)
+	elif (cached := frappe.cache.get_value(key)) and cached[1] >= modified:
+		return cached[0]
+
+	started = time.time()
+	count = run(query)
+	frappe.cache.set_value(
+		key, (count, started), expires_in_sec=cint(frappe.conf.list_count_cache_ttl) or COUNT_CACHE_TTL
+	)
+	return count
+
+
+def run_count_with_timeout(query: str) -> int | None:
 	# Count queries are notoriously unpredictable based on the type of filters used.
 	# We should not attempt to fetch accurate count for 2 entire minutes! (default timeout)
 	# Very short timeout is used to here to set an upper bound on damage a bad request can do.
@@ -80,21 +135,31 @@ def get_count() -> int | None:
 	timeout_clause = "SET STATEMENT max_statement_time=1 FOR" if frappe.db.db_type == "mariadb" else ""
 
 	try:
-		count = frappe.db.sql(f"{timeout_clause} select count(*) from ( {partial_query} ) p")[0][0]
+		return frappe.db.sql(f"{timeout_clause} {query}")[0][0]
 	except Exception as e:
 		if frappe.db.is_statement_timeout(e):  # Skip fetching accurate count
-			count = None
-		else:
-			raise
+			return None
+		raise
 
-	if count == args.limit or count is None:
-		frappe.local.response_headers.set("Cache-Control", "private,max-age=600,stale-while-revalidate=10800")
 
-	return count
+def is_unfiltered(query) -> bool:
+	"""Check if `query` selects every row of its table."""
+	return not (query._wheres or query._joins or query._groupbys or query._havings)
 
 
-def execute(doctype, *args, **kwargs):
-	return DatabaseQuery(doctype).execute(*args, **kwargs)
+def setup_cursor_pagination(data) -> list | None:
+	"""Use keyset pagination if a cursor is passed and the sort order allows it, offset pagination is used
+	otherwise. Sort columns are added to fields, these are needed to build the next cursor."""
+	if data.get("cursor") is None:
+		return
+
+	if data.group_by or sbool(data.distinct) or not is_keyset_order(data.doctype, data.order_by):
+		del data["cursor"]
+		return
+
+	keyset_order = get_keyset_order(data.doctype, data.order_by)
+	data.fields = add_keyset_fields(data.doctype, data.fields, keyset_order)
+	return keyset_order
 
 
 def get_form_params():
@@ -268,8 +268,12 @@ class SendMailContext:
 		return self
 
 	def __exit__(self, exc_type, exc_val, exc_tb):
-		if exc_type:
-			update_fields = {"error": frappe.get_traceback()}
+		self.finish(error=frappe.get_traceback() if exc_type else None)
+
+	def finish(self, error: str | None = None):
+		"""Update status of queue once sending is done, `error` is the traceback if sending failed."""
+		if error:
+			update_fields = {"error": error}
 			if self.queue_doc.retry < get_email_retry_limit():
 				update_fields.update(
 					{
@@ -304,6 +308,22 @@ class SendMailContext:
 		self.sent_to_atleast_one_recipient = True
 		recipient.update_db(status="Sent", commit=True)
 
+	def update_recipients_status_to_sent(self, recipients: list):
+		"""Mark all `recipients` as sent using a single query."""
+		if not recipients:
+			return
+
+		self.sent_to_atleast_one_recipient = True
+		email_queue_recipient = DocType("Email Queue Recipient")
+		(
+			frappe.qb.update(email_queue_recipient)
+			.set(email_queue_recipient.status, "Sent")
+			.set(email_queue_recipient.modified, now())
+			.where(email_queue_recipient.name.isin([recipient.name for recipient in recipients]))
+		).run()
+		for recipient in recipients:
+			recipient.status = "Sent"
+
 	def get_message_object(self, message):
 		return Parser(policy=SMTP).parsestr(message)
 
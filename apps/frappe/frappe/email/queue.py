@@ -4,7 +4,7 @@ from datetime import timedelta
 
 import frappe
 from frappe import _, msgprint
-from frappe.utils import cint, cstr, get_url, now_datetime
+from frappe.utils import cint, cstr, get_datetime, get_url, now_datetime
 from frappe.utils.data import getdate
 from frappe.utils.verified_command import get_signed_params, verify_request
 
@@ -129,55 +129,120 @@ def return_unsubscribed_page(email, doctype, name):
 def flush():
 	"""flush email queue, every time: called from scheduler.
 
+	Emails are sent concurrently over pooled SMTP sessions, see `frappe.email.sender`. Several workers can
+	flush at the same time, each one claims a different batch.
+
 	This should not be called outside of background jobs.
 	"""
 	from frappe.email.doctype.email_queue.email_queue import EmailQueue
+	from frappe.email.sender import EmailSender
 
 	# To avoid running jobs inside unit tests
 	if frappe.are_emails_muted():
 		msgprint(_("Emails are muted"))
+		return
 
 	if cint(frappe.db.get_default("suspend_email_queue")) == 1:
 		return
 
-	email_queue_batch = get_queue()
+	claimed_at = now_datetime()
+	email_queue_batch = claim_queue(claimed_at)
 	if not email_queue_batch:
 		return
 
 	failed_email_queues = []
-	for row in email_queue_batch:
-		try:
-			email_queue: EmailQueue = frappe.get_doc("Email Queue", row.name, for_update=True)
-			email_queue.send()
-		except Exception:
-			frappe.get_doc("Email Queue", row.name).log_error()
-			failed_email_queues.append(row.name)
-
+	with EmailSender() as sender:
+		for idx, row in enumerate(email_queue_batch):
+			if not renew_claim(row.name, claimed_at):
+				continue
+
+			try:
+				email_queue: EmailQueue = frappe.get_doc("Email Queue", row.name)
+				# status in database was changed to "Sending" while claiming the batch
+				email_queue.status = row.status
+				if not sender.send(email_queue):
+					email_queue.send()
+			except Exception:
+				frappe.get_doc("Email Queue", row.name).log_error()
+				failed_email_queues.append(row.name)
+
+			failures = len(failed_email_queues) + len(sender.failed)
 			if (
-				len(failed_email_queues) / len(email_queue_batch)
-				> EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT
-				and len(failed_email_queues) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT
+				failures / len(email_queue_batch) > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_PERCENT
+				and failures > EMAIL_QUEUE_BATCH_FAILURE_THRESHOLD_COUNT
 			):
+				release_claimed_queue(email_queue_batch[idx + 1 :], claimed_at)
 				frappe.throw(_("Email Queue flushing aborted due to too many failures."))
 
 
-def get_queue():
+def get_queue(for_update: bool = False):
 	batch_size = cint(frappe.conf.email_queue_batch_size) or 500
-
-	return frappe.db.sql(
-		f"""select
-			name, sender
-		from
-			`tabEmail Queue`
-		where
-			(status='Not Sent' or status='Partially Sent') and
-			(send_after is null or send_after < %(now)s)
-		order
-			by priority desc, retry asc, creation asc
-		limit {batch_size}""",
-		{"now": now_datetime()},
-		as_dict=True,
+	email_queue = frappe.qb.DocType("Email Queue")
+
+	query = (
+		frappe.qb.from_(email_queue)
+		.select(email_queue.name, email_queue.sender, email_queue.status)
+		.where(email_queue.status.isin(("Not Sent", "Partially Sent")))
+		.where(email_queue.send_after.isnull() | (email_queue.send_after < now_datetime()))
+		.orderby(email_queue.priority, order=frappe.qb.desc)
+		.orderby(email_queue.retry)
+		.orderby(email_queue.creation)
+		.limit(batch_size)
+	)
+	if for_update:
+		# rows being claimed by other workers are skipped instead of waiting for them
+		query = query.for_update(skip_locked=True)
+
+	return query.run(as_dict=True)
+
+
+def claim_queue(claimed_at):
+	"""Get a batch of email queues to send and mark them as "Sending" so that other workers skip them.
+
+	Queues stuck in "Sending" are put back in queue by `retry_sending_emails`, `renew_claim` has to be
+	called before sending each of them."""
+	email_queue_batch = get_queue(for_update=True)
+	if email_queue_batch:
+		frappe.db.set_value(
+			"Email Queue",
+			{"name": ("in", [row.name for row in email_queue_batch])},
+			{"status": "Sending", "modified": claimed_at},
+			update_modified=False,
+		)
+	frappe.db.commit()
+	return email_queue_batch
+
+
+def renew_claim(name: str, claimed_at) -> bool:
+	"""Mark queue claimed at `claimed_at` as being sent now, return `False` if it was put back in queue
+	by `retry_sending_emails` meanwhile (it might have been claimed by another worker already).
+
+	Sending a large batch can take longer than the time after which `retry_sending_emails` considers a
+	queue stuck, claims are renewed one queue at a time just before sending it."""
+	status, modified = frappe.db.get_value("Email Queue", name, ["status", "modified"], for_update=True) or (
+		None,
+		None,
 	)
+	if status != "Sending" or get_datetime(modified) != claimed_at:
+		frappe.db.commit()
+		return False
+
+	frappe.db.set_value("Email Queue", name, "modified", now_datetime(), update_modified=False)
+	frappe.db.commit()
+	return True
+
+
+def release_claimed_queue(email_queue_batch, claimed_at):
+	"""Put back queues claimed by `claim_queue` at `claimed_at` which weren't sent."""
+	for row in email_queue_batch:
+		frappe.db.set_value(
+			"Email Queue",
+			{"name": row.name, "status": "Sending", "modified": claimed_at},
+			"status",
+			row.status,
+			update_modified=False,
+		)
+	frappe.db.commit()
 
 
 def retry_sending_emails():
@@ -187,7 +252,12 @@ def retry_sending_emails():
 	for e in emails_in_sending:
 		if now_datetime() - e["modified"] > timedelta(minutes=15):
 			update_fields = {}
-			email_queue = frappe.get_doc("Email Queue", e["name"])
+			# claim might have been renewed by the worker sending it, see `renew_claim`
+			email_queue = frappe.get_doc("Email Queue", e["name"], for_update=True)
+			if email_queue.status != "Sending" or email_queue.modified != e["modified"]:
+				frappe.db.commit()
+				continue
+
 			sent_to_atleast_one_recipient = any(
 				rec.recipient for rec in email_queue.recipients if rec.is_mail_sent()
 			)
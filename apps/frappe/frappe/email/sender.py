@@ -0,0 +1,210 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Concurrent sending of email queues over pooled SMTP sessions, used by `frappe.email.queue.flush`.
+
+Messages are built and all database writes are done in the calling thread, sender threads only talk to
+SMTP servers. Every Email Account gets up to `smtp_sessions_per_account` authenticated sessions which are
+reused for the whole batch, each session is used by one thread at a time.
+
+Site config:
+	- `email_sender_threads`: number of threads sending emails (default 4).
+	- `smtp_sessions_per_account`: maximum SMTP sessions opened per Email Account (default 2).
+	- `email_rate_limit`: maximum emails sent per second per Email Account by each worker (default no limit).
+"""
+
+import smtplib
+import threading
+import traceback
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from time import monotonic, sleep
+
+import frappe
+from frappe.email.doctype.email_queue.email_queue import EmailQueue, SendMailContext
+from frappe.email.smtp import SMTPServer
+from frappe.utils import cint, flt, get_hook_method
+
+DEFAULT_SENDER_THREADS = 4
+DEFAULT_SESSIONS_PER_ACCOUNT = 2
+
+
+@dataclass
+class SendResult:
+	sent: list = field(default_factory=list)
+	error: str | None = None
+	# session is unusable and shouldn't be reused
+	disconnected: bool = False
+
+
+class SMTPSessionPool:
+	"""Authenticated SMTP sessions of an Email Account.
+
+	Sessions are only opened and handed out by the calling thread, sender threads just use them."""
+
+	def __init__(self, email_account, max_sessions: int, rate_limit: float = 0):
+		self.email_account = email_account
+		self.max_sessions = max_sessions
+		self.rate_limit = rate_limit
+		self.idle: list[SMTPServer] = []
+		self.busy = 0
+		self._lock = threading.Lock()
+		self._next_send_at = 0.0
+
+	def acquire(self) -> SMTPServer | None:
+		"""Return a session which isn't in use, `None` if all sessions are busy."""
+		if self.idle:
+			server = self.idle.pop()
+		elif self.busy < self.max_sessions:
+			server = SMTPServer(**self.email_account.sendmail_config())
+		else:
+			return None
+
+		self.busy += 1
+		return server
+
+	def release(self, server: SMTPServer, disconnected: bool = False):
+		self.busy -= 1
+		if disconnected:
+			server.quit()
+		else:
+			self.idle.append(server)
+
+	def close(self):
+		while self.idle:
+			self.idle.pop().quit()
+
+	def throttle(self):
+		"""Wait until next email can be sent as per `rate_limit`, called from sender threads."""
+		if not self.rate_limit:
+			return
+
+		with self._lock:
+			now = monotonic()
+			send_at = max(now, self._next_send_at)
+			self._next_send_at = send_at + 1 / self.rate_limit
+
+		if send_at > now:
+			sleep(send_at - now)
+
+
+class EmailSender:
+	"""Send email queues concurrently, use as a context manager which waits for all sends on exit.
+
+	Usage:
+		with EmailSender() as sender:
+			for queue in queues:
+				if not sender.send(queue):
+					queue.send()
+	"""
+
+	def __init__(self):
+		conf = frappe.conf
+		self.max_threads = cint(conf.email_sender_threads) or DEFAULT_SENDER_THREADS
+		self.sessions_per_account = cint(conf.smtp_sessions_per_account) or DEFAULT_SESSIONS_PER_ACCOUNT
+		self.rate_limit = flt(conf.email_rate_limit)
+		self.pools: dict[str, SMTPSessionPool] = {}
+		self.pending: dict[Future, tuple] = {}
+		self.failed: list[str] = []
+		self.executor = None
+
+	def __enter__(self):
+		self.executor = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="email-sender")
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		try:
+			self.wait(ALL_COMPLETED)
+		finally:
+			self.executor.shutdown()
+			for pool in self.pools.values():
+				pool.close()
+
+	def send(self, queue_doc: EmailQueue) -> bool:
+		"""Start sending `queue_doc` in a sender thread.
+
+		Return `False` if it has to be sent using `EmailQueue.send` instead, which is the case for Frappe
+		Mail accounts, overridden email sending and tests."""
+		if get_hook_method("override_email_send") or (frappe.in_test and not frappe.flags.testing_email):
+			return False
+
+		email_account = queue_doc.get_email_account(raise_error=True)
+		if email_account.service == "Frappe Mail":
+			return False
+
+		if not queue_doc.can_send_now():
+			return True
+
+		ctx = SendMailContext(queue_doc)
+		ctx.email_account_doc = email_account
+		pool = self.get_pool(email_account)
+		server = None
+		try:
+			while not (server := pool.acquire()):
+				self.wait(FIRST_COMPLETED)
+
+			# connects, or reconnects if server closed an idle session
+			session = server.session
+			messages = [
+				(recipient, ctx.build_message(recipient.recipient))
+				for recipient in queue_doc.recipients
+				if not recipient.is_mail_sent()
+			]
+		except Exception:
+			if server:
+				pool.release(server)
+			ctx.finish(error=frappe.get_traceback())
+			raise
+
+		future = self.executor.submit(_send_messages, pool, session, queue_doc.sender, messages)
+		self.pending[future] = (ctx, pool, server, messages)
+		return True
+
+	def get_pool(self, email_account) -> SMTPSessionPool:
+		if email_account.name not in self.pools:
+			self.pools[email_account.name] = SMTPSessionPool(
+				email_account, self.sessions_per_account, self.rate_limit
+			)
+		return self.pools[email_account.name]
+
+	def wait(self, return_when=ALL_COMPLETED):
+		"""Wait for sends to complete and update their status."""
+		if not self.pending:
+			return
+
+		done, _ = wait(self.pending, return_when=return_when)
+		for future in done:
+			ctx, pool, server, messages = self.pending.pop(future)
+			result: SendResult = future.result()
+			pool.release(server, disconnected=result.disconnected)
+			self.update_status(ctx, result, messages)
+
+	def update_status(self, ctx: SendMailContext, result: SendResult, messages: list):
+		ctx.update_recipients_status_to_sent(result.sent)
+		ctx.finish(error=result.error)
+
+		if result.error:
+			ctx.queue_doc.log_error(message=result.error)
+			self.failed.append(ctx.queue_doc.name)
+		elif messages and ctx.email_account_doc.append_emails_to_sent_folder:
+			ctx.email_account_doc.append_email_to_sent_folder(messages[-1][1])
+
+
+def _send_messages(pool: SMTPSessionPool, session: smtplib.SMTP, sender: str, messages: list) -> SendResult:
+	result = SendResult()
+	try:
+		for recipient, message in messages:
+			pool.throttle()
+			session.sendmail(
+				from_addr=sender,
+				to_addrs=recipient.recipient,
+				msg=message.decode("utf-8").encode(),
+			)
+			result.sent.append(recipient)
+	except Exception as e:
+		result.error = traceback.format_exc()
+		# rejection of a message doesn't affect the session, other errors (timeouts etc.) might have
+		result.disconnected = isinstance(e, OSError) and not isinstance(
+			e, smtplib.SMTPResponseException | smtplib.SMTPRecipientsRefused
+		)
+
+	return result
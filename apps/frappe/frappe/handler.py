@@ -13,6 +13,7 @@ import frappe.utils
 from frappe import _, is_whitelisted, ping
 from frappe.core.doctype.file.utils import find_file_by_url
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
+from frappe.database.replica import is_read_only_request
 from frappe.monitor import add_data_to_monitor
 from frappe.permissions import check_doctype_permission
 from frappe.utils import cint
@@ -83,6 +84,9 @@ def execute_cmd(cmd, from_async=False):
 		is_whitelisted(method)
 		is_valid_http_method(method)
 
+		if is_read_only_request(cmd, method):
+			method = frappe.read_only()(method)
+
 	return frappe.call(method, **frappe.form_dict)
 
 
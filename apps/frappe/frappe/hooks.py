@@ -528,10 +528,15 @@ default_log_clearing_doctypes = {
 	"Email Queue Recipient": 30,  # this is added as a dummy placeholder and clearing is handled by Email Queue itself
 }
 
+# Deferred inserts of these doctypes skip document lifecycle and are written in bulk
+bulk_deferred_insert = ["Access Log", "Route History", "View Log", "Web Page View"]
+
 # These keys will not be erased when doing frappe.clear_cache()
 persistent_cache_keys = [
 	"changelog-*",  # version update notifications
 	"insert_queue_for_*",  # Deferred Insert
+	"failed_insert_queue_for_*",
+	"deferred_insert_stats",
 	"recorder-*",  # Recorder
 	"global_search_queue",
 	"monitor-transactions",
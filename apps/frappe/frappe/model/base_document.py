@@ -47,6 +47,10 @@ DatetimeTypes = datetime.date | datetime.datetime | datetime.time | datetime.tim
 
 max_positive_value = {"smallint": 2**15 - 1, "int": 2**31 - 1, "bigint": 2**63 - 1}
 
+# Multi-row INSERTs are chunked well below MariaDB's default `max_allowed_packet` (16MB)
+MULTI_ROW_INSERT_MAX_ROWS = 1000
+MULTI_ROW_INSERT_MAX_SIZE = 4 * 1024 * 1024
+
 DOCTYPE_TABLE_FIELDS = [
 	_dict(fieldname="fields", options="DocField"),
 	_dict(fieldname="permissions", options="DocPerm"),
@@ -981,22 +985,7 @@ class BaseDocument:
 				notify_link_count(doctype, docname)
 
 			check_docstatus = is_submittable and frappe.get_meta(doctype).is_submittable
-
-			# get a map of values ot fetch along with this link query
-			# that are mapped as link_fieldname.source_fieldname in Options of
-			# Readonly or Data or Text type fields
-			fields_to_fetch = [
-				_df
-				for _df in self.meta.get_fields_to_fetch(df.fieldname)
-				if not _df.get("fetch_if_empty")
-				or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
-			]
-			values_to_fetch = (
-				"name",
-				*(_df.fetch_from.split(".")[-1] for _df in fields_to_fetch),
-			)
-			if check_docstatus:
-				values_to_fetch += ("docstatus",)
+			fields_to_fetch, values_to_fetch = self._get_values_to_fetch(df, check_docstatus)
 
 			if not meta.get("is_virtual"):
 				values = frappe.db.get_value(
@@ -1036,6 +1025,51 @@ class BaseDocument:
 
 		return invalid_links, cancelled_links
 
+	def _get_values_to_fetch(self, df, check_docstatus=False):
+		"""Return fields to be updated via `fetch_from` and the columns to query for link field `df`."""
+		# get a map of values ot fetch along with this link query
+		# that are mapped as link_fieldname.source_fieldname in Options of
+		# Readonly or Data or Text type fields
+		fields_to_fetch = [
+			_df
+			for _df in self.meta.get_fields_to_fetch(df.fieldname)
+			if not _df.get("fetch_if_empty") or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
+		]
+		values_to_fetch = (
+			"name",
+			*(_df.fetch_from.split(".")[-1] for _df in fields_to_fetch),
+		)
+		if check_docstatus:
+			values_to_fetch += ("docstatus",)
+
+		return fields_to_fetch, values_to_fetch
+
+	def get_links_to_prefetch(self, is_submittable=False):
+		"""Return `(doctype, docname, values_to_fetch)` for link fields that `get_invalid_links` will query.
+
+		Links which need special handling (singles, virtual doctypes, unset options) are skipped,
+		`get_invalid_links` resolves them individually as before."""
+		is_submittable = is_submittable or self.meta.is_submittable
+		out = []
+
+		for df in self.meta.get_link_fields() + self.meta.get("fields", {"fieldtype": ("=", "Dynamic Link")}):
+			docname = self.get(df.fieldname)
+			if not docname or not isinstance(docname, str | int):
+				continue
+
+			doctype = df.options if df.fieldtype == "Link" else self.get(df.options)
+			if not doctype or not isinstance(doctype, str):
+				continue
+
+			meta = frappe.get_meta(doctype)
+			if meta.issingle or meta.get("is_virtual"):
+				continue
+
+			check_docstatus = is_submittable and meta.is_submittable
+			out.append((doctype, docname, self._get_values_to_fetch(df, check_docstatus)[1]))
+
+		return out
+
 	def set_fetch_from_value(self, doctype, df, values):
 		fetch_from_fieldname = df.fetch_from.split(".")[-1]
 		value = values[fetch_from_fieldname]
@@ -1545,6 +1579,110 @@ def _filter(data, filters, limit=None):
 	return out
 
 
+def db_insert_multiple(docs: list["BaseDocument"]) -> None:
+	"""INSERT documents with one multi-row query per doctype instead of one query per row.
+
+	Used for child rows when a parent is inserted or its child tables are rewritten. Rows are
+	chunked by `MULTI_ROW_INSERT_MAX_ROWS` and approximate query size. If a chunk fails on a
+	primary key (hash collision) or unique key violation, its rows are inserted one at a time
+	with `db_insert` so that collisions are retried and errors are reported exactly as before."""
+	groups: dict[str, list[BaseDocument]] = {}
+	for doc in docs:
+		if type(doc).db_insert is not BaseDocument.db_insert:
+			# controller manages its own persistence (virtual doctypes etc.)
+			doc.db_insert()
+		else:
+			groups.setdefault(doc.doctype, []).append(doc)
+
+	for doctype, rows in groups.items():
+		if len(rows) == 1:
+			rows[0].db_insert()
+			continue
+
+		by_columns: dict[tuple, list[tuple[BaseDocument, list]]] = {}
+		for doc in rows:
+			if not doc.name:
+				set_new_name(doc)
+
+			if not doc.creation:
+				doc.creation = doc.modified = now()
+				doc.owner = doc.modified_by = frappe.session.user
+
+			d = doc.get_valid_dict(
+				convert_dates_to_str=True,
+				ignore_nulls=doctype in DOCTYPES_FOR_DOCTYPE,
+				ignore_virtual=True,
+			)
+			by_columns.setdefault(tuple(d), []).append((doc, list(d.values())))
+
+		for columns, values in by_columns.items():
+			for chunk in _get_multi_row_insert_chunks(values):
+				_db_insert_chunk(doctype, columns, chunk)
+
+
+def _get_multi_row_insert_chunks(values: list[tuple["BaseDocument", list]]):
+	chunk, chunk_size = [], 0
+	for doc, row in values:
+		row_size = sum(len(str(value)) for value in row if value is not None) + 4 * len(row)
+		if chunk and (
+			len(chunk) >= MULTI_ROW_INSERT_MAX_ROWS or chunk_size + row_size > MULTI_ROW_INSERT_MAX_SIZE
+		):
+			yield chunk
+			chunk, chunk_size = [], 0
+		chunk.append((doc, row))
+		chunk_size += row_size
+
+	if chunk:
+		yield chunk
+
+
+def _db_insert_chunk(doctype: str, columns: tuple[str, ...], chunk: list[tuple["BaseDocument", list]]):
+	if len(chunk) == 1:
+		chunk[0][0].db_insert()
+		return
+
+	is_postgres = frappe.db.db_type == "postgres"
+	is_hash = chunk[0][0].meta.autoname == "hash"
+	row_placeholder = "({})".format(", ".join(["%s"] * len(columns)))
+
+	query = "INSERT INTO `tab{doctype}` ({columns}) VALUES {values}".format(
+		doctype=doctype,
+		columns=", ".join("`" + c + "`" for c in columns),
+		values=", ".join([row_placeholder] * len(chunk)),
+	)
+	if is_postgres and is_hash:
+		# skip hash collisions instead of aborting the transaction, they are retried below
+		query += " on conflict (name) do nothing RETURNING name"
+
+	# a failed statement aborts the whole transaction on postgres, mariadb only rolls back the statement
+	save_point = f"multi_row_insert_{frappe.generate_hash(length=8)}" if is_postgres else None
+	if save_point:
+		frappe.db.savepoint(save_point)
+
+	try:
+		inserted = frappe.db.sql(query, [value for _doc, row in chunk for value in row])
+	except Exception as e:
+		if not (frappe.db.is_primary_key_violation(e) or frappe.db.is_unique_key_violation(e)):
+			raise
+
+		if save_point:
+			frappe.db.rollback(save_point=save_point)
+
+		for doc, _row in chunk:
+			doc.db_insert()
+		return
+
+	if save_point:
+		frappe.db.release_savepoint(save_point)
+
+	inserted_names = {row[0] for row in inserted} if is_postgres and is_hash else None
+	for doc, _row in chunk:
+		if inserted_names is not None and doc.name not in inserted_names:
+			doc.db_insert()  # hash collision, regenerate name
+		else:
+			doc.set("__islocal", False)
+
+
 CACHED_PROPERTIES = (prop for prop, value in vars(BaseDocument).items() if isinstance(value, cached_property))
 
 UNPICKLABLE_KEYS = frozenset(
@@ -20,12 +20,19 @@ import frappe.permissions
 import frappe.share
 from frappe import _
 from frappe.core.doctype.server_script.server_script_utils import get_server_script_map
-from frappe.database.utils import DefaultOrderBy, FallBackDateTimeStr, NestedSetHierarchy
+from frappe.database.pagination import InvalidCursor, decode_cursor, get_keyset_order
+from frappe.database.utils import (
+	DefaultOrderBy,
+	FallBackDateTimeStr,
+	NestedSetHierarchy,
+	cached_query_transform,
+)
 from frappe.model import OPTIONAL_FIELDS, get_permitted_fields
 from frappe.model.meta import get_table_columns
 from frappe.model.utils import is_virtual_doctype
 from frappe.model.utils.mask import mask_field_value
 from frappe.model.utils.user_settings import get_user_settings, update_user_settings
+from frappe.query_builder.terms import NamedParameterWrapper
 from frappe.query_builder.utils import Column
 from frappe.types import Filters, FilterSignature, FilterTuple
 from frappe.utils import (
@@ -70,6 +77,44 @@ ORDER_GROUP_PATTERN = re.compile(r".*[^a-z0-9-_ ,`'\"\.\(\)].*")
 SPECIAL_FIELD_CHARS = frozenset(("(", "`", ".", "'", '"', "*"))
 # XXX: These are just matching brackets to not confuse code formatters: ))
 
+BLACKLISTED_KEYWORDS = frozenset(("select", "create", "insert", "delete", "drop", "update", "case", "show"))
+BLACKLISTED_FUNCTIONS = frozenset(
+	(
+		"concat",
+		"concat_ws",
+		"if",
+		"coalesce",
+		"connection_id",
+		"current_user",
+		"database",
+		"last_insert_id",
+		"session_user",
+		"system_user",
+		"user",
+		"version",
+		"global",
+		"sleep",
+	)
+)
+BLACKLISTED_ORDER_BY_FUNCTIONS = frozenset(
+	(
+		"sleep",
+		"benchmark",
+		"extractvalue",
+		"database",
+		"user",
+		"current_user",
+		"version",
+		"substr",
+		"substring",
+		"updatexml",
+		"load_file",
+		"session_user",
+		"system_user",
+	)
+)
+ORDER_BY_SUBQUERY_PATTERNS = (r"union", r"intersect", r"select\b.*\bfrom")
+
 
 class DatabaseQuery:
 	def __init__(self, doctype, user=None):
@@ -88,6 +133,7 @@ class DatabaseQuery:
 		self.permission_map = {}
 		self.shared = []
 		self._fetch_shared_documents = False
+		self.cursor = None
 		self._metas = {}
 
 	@cached_property
@@ -136,6 +182,7 @@ class DatabaseQuery:
 		ignore_ddl=False,
 		*,
 		parent_doctype=None,
+		cursor: str | None = None,
 	) -> list:
 		self.user = user or frappe.session.user
 
@@ -196,6 +243,19 @@ class DatabaseQuery:
 		self.strict = strict
 		self.ignore_ddl = ignore_ddl
 		self.parent_doctype = parent_doctype
+		self.cursor = cursor
+
+		if cursor is not None:
+			# keyset pagination, rows after the cursor are selected instead of skipping rows
+			if group_by or distinct:
+				frappe.throw(_("Cannot paginate using a cursor with group by or distinct"), InvalidCursor)
+			self.keyset_order = get_keyset_order(self.doctype, order_by)
+			self.order_by = ", ".join(
+				f"`tab{self.doctype}`.`{fieldname}` {direction}" for fieldname, direction in self.keyset_order
+			)
+			if cursor:
+				# an empty cursor only asks for keyset order, rows are still skipped using `start`
+				self.limit_start = 0
 
 		# for contextual user permission check
 		# to determine which user permission is applicable on link field of specific doctype
@@ -447,98 +507,14 @@ from {tables}
 		As field contains `,` and mysql function `version()`, with the help of regex
 		the system will filter out this field.
 		"""
-		blacklisted_keywords = ["select", "create", "insert", "delete", "drop", "update", "case", "show"]
-		blacklisted_functions = [
-			"concat",
-			"concat_ws",
-			"if",
-			"coalesce",
-			"connection_id",
-			"current_user",
-			"database",
-			"last_insert_id",
-			"session_user",
-			"system_user",
-			"user",
-			"version",
-			"global",
-			"sleep",
-		]
-
-		def _find_subqueries(parsed: Statement) -> list:
-			"""
-			Recursively find all subqueries in a parsed SQL statement.
-			"""
-			subqueries = []
-
-			for token in parsed.tokens:
-				if isinstance(token, Parenthesis):
-					# Check for DML token for subquery check
-					is_subquery = False
-					for sub_token in token.tokens:
-						if sub_token.ttype is tokens.DML:
-							is_subquery = True
-							break
-					if is_subquery:
-						subqueries.append(token)
-					# Recursively check for nested subqueries
-					subqueries.extend(_find_subqueries(token))
-				elif token.is_group:
-					subqueries.extend(_find_subqueries(token))
-
-			return subqueries
-
-		def _check_sql_token(statement: Statement) -> None:
-			"""
-			Checks the output of `sqlparse.parse()` to detect blocked functions and subqueries.
-			"""
-			if _find_subqueries(statement):
-				_raise_exception()
-
-			for token in statement.tokens:
-				if isinstance(token, Function):
-					if (name := (token.get_name())) and name.lower() in blacklisted_functions:
-						_raise_exception()
-				if token.ttype == tokens.Keyword:
-					if token.value.lower() in blacklisted_keywords:
-						_raise_exception()
-				if token.is_group:
-					_check_sql_token(token)
-
-		def _raise_exception():
-			frappe.throw(_("Use of sub-query or function is restricted"), frappe.DataError)
-
-		def _is_query(field):
-			if IS_QUERY_PATTERN.match(field):
-				_raise_exception()
-
-			elif IS_QUERY_PREDICATE_PATTERN.match(field):
-				_raise_exception()
-
 		for field in self.fields:
-			lower_field = field.lower().strip()
-
-			if SUB_QUERY_PATTERN.match(field):
-				# Check all tokens for subquery detection
-				_check_sql_token(_parse_sql(field))
-
-				if "@" in lower_field:
-					# prevent access to global variables
-					_raise_exception()
-
-			if FIELD_QUOTE_PATTERN.match(field):
-				_raise_exception()
-
-			if FIELD_COMMA_PATTERN.match(field):
-				_raise_exception()
-
-			_is_query(field)
+			sanitize_field(field)
 
 			if self.strict:
 				if STRICT_FIELD_PATTERN.match(field):
 					frappe.throw(_("Illegal SQL Query"))
 
-				if STRICT_UNION_PATTERN.match(lower_field):
+				if STRICT_UNION_PATTERN.match(field.lower().strip()):
 					frappe.throw(_("Illegal SQL Query"))
 
 	def extract_tables(self):
@@ -668,6 +644,9 @@ from {tables}
 			if match_conditions:
 				self.conditions.append(f"({match_conditions})")
 
+		if self.cursor:
+			self.conditions.append(self.get_cursor_condition())
+
 	def build_filter_conditions(self, filters: Filters, conditions: list, ignore_permissions=None):
 		"""build conditions from user filters"""
 		if ignore_permissions is not None:
@@ -1012,15 +991,62 @@ from {tables}
 
 	def build_match_conditions(self, as_condition=True) -> str | list:
 		"""add match conditions if applicable"""
-		self.match_filters = []
-		self.match_conditions = []
-		only_if_shared = False
 		if not self.user:
 			self.user = frappe.session.user
 
 		if not self.tables:
 			self.extract_tables()
 
+		compiled = frappe.permissions.get_compiled_permission_conditions(
+			self.user,
+			(
+				"DatabaseQuery",
+				self.doctype,
+				self.reference_doctype,
+				bool(self.flags.ignore_permissions),
+				bool(frappe.get_system_settings("apply_strict_user_permissions")),
+				# decides if restrictions are compiled to subqueries
+				frappe.conf.get("permission_subquery_threshold"),
+			),
+			self.compile_match_conditions,
+		)
+		self.match_conditions = list(compiled.match_conditions)
+		self.match_filters = list(compiled.match_filters)
+		self.shared = compiled.shared
+		only_if_shared = compiled.only_if_shared
+
+		if only_if_shared:
+			if not self.shared:
+				frappe.throw(_("No permission to read {0}").format(_(self.doctype)), frappe.PermissionError)
+			self.conditions.append(self.get_share_condition())
+
+		if as_condition:
+			conditions = ""
+			if self.match_conditions:
+				# will turn out like ((blog_post in (..) and blogger in (...)) or (blog_category in (...)))
+				conditions = "((" + ") or (".join(self.match_conditions) + "))"
+
+			doctype_conditions = self.get_permission_query_conditions(compiled.permission_query_conditions)
+			if doctype_conditions:
+				conditions += (" and " + doctype_conditions) if conditions else doctype_conditions
+
+			# share is an OR condition, if there is a role permission
+			if not only_if_shared and self.shared and conditions:
+				conditions = f"(({conditions}) or ({self.get_share_condition()}))"
+
+			return conditions
+
+		else:
+			return self.match_filters
+
+	def compile_match_conditions(self) -> frappe._dict:
+		"""Evaluate role permissions, user permissions, shares and cacheable permission query hooks of
+		`self.user` on the doctype. The result is cached, see `get_compiled_permission_conditions`."""
+		self.match_filters = []
+		self.match_conditions = []
+		self.shared = []
+		only_if_shared = False
+
 		role_permissions = frappe.permissions.get_role_permissions(self.doctype_meta, user=self.user)
 		if (
 			not self.doctype_meta.istable
@@ -1031,10 +1057,6 @@ from {tables}
 		):
 			only_if_shared = True
 			self.shared = frappe.share.get_shared(self.doctype, self.user)
-			if not self.shared:
-				frappe.throw(_("No permission to read {0}").format(_(self.doctype)), frappe.PermissionError)
-			else:
-				self.conditions.append(self.get_share_condition())
 
 		else:
 			# skip user perm check if owner constraint is required
@@ -1058,26 +1080,37 @@ from {tables}
 			if self._fetch_shared_documents:
 				self.shared = frappe.share.get_shared(self.doctype, self.user)
 
-		if as_condition:
-			conditions = ""
-			if self.match_conditions:
-				# will turn out like ((blog_post in (..) and blogger in (...)) or (blog_category in (...)))
-				conditions = "((" + ") or (".join(self.match_conditions) + "))"
-
-			doctype_conditions = self.get_permission_query_conditions()
-			if doctype_conditions:
-				conditions += (" and " + doctype_conditions) if conditions else doctype_conditions
-
-			# share is an OR condition, if there is a role permission
-			if not only_if_shared and self.shared and conditions:
-				conditions = f"(({conditions}) or ({self.get_share_condition()}))"
+		return frappe._dict(
+			match_conditions=self.match_conditions,
+			match_filters=self.match_filters,
+			shared=self.shared,
+			only_if_shared=only_if_shared,
+			permission_query_conditions=self.get_cacheable_permission_query_conditions(),
+		)
 
-			return conditions
+	def get_cursor_condition(self) -> str:
+		"""Condition selecting rows after the position stored in `self.cursor`."""
+		conditions = []
+		preceding = []
+		for (fieldname, direction), value in zip(
+			self.keyset_order, decode_cursor(self.keyset_order, self.cursor), strict=True
+		):
+			column = f"`tab{self.doctype}`.`{fieldname}`"
+			if isinstance(value, str):
+				value = frappe.db.escape(value, percent=False)
+			operator = ">" if direction == "asc" else "<"
+			conditions.append(" and ".join([*preceding, f"{column} {operator} {value}"]))
+			preceding.append(f"{column} = {value}")
 
-		else:
-			return self.match_filters
+		return "(" + " or ".join(f"({condition})" for condition in conditions) + ")"
 
 	def get_share_condition(self):
+		if frappe.permissions.use_permission_subquery(self.shared):
+			return (
+				cast_name(f"`tab{self.doctype}`.name")
+				+ f" in ({get_shared_subquery(self.doctype, self.user)})"
+			)
+
 		return (
 			cast_name(f"`tab{self.doctype}`.name")
 			+ f" in ({', '.join(frappe.db.escape(s, percent=False) for s in self.shared)})"
@@ -1129,8 +1162,22 @@ from {tables}
 						docs.append(permission.get("doc"))
 
 				if docs:
-					values = ", ".join(frappe.db.escape(doc, percent=False) for doc in docs)
-					condition += cast_name(f"`tab{self.doctype}`.`{df.get('fieldname')}`") + f" in ({values})"
+					column = cast_name(f"`tab{self.doctype}`.`{df.get('fieldname')}`")
+					if frappe.permissions.use_permission_subquery(docs):
+						applicable_for = (
+							self.reference_doctype
+							if df.get("fieldname") == "name" and self.reference_doctype
+							else self.doctype
+						)
+						condition += " or ".join(
+							f"{column} in ({subquery})"
+							for subquery in get_user_permission_subqueries(
+								self.user, df.get("options"), applicable_for
+							)
+						)
+					else:
+						values = ", ".join(frappe.db.escape(doc, percent=False) for doc in docs)
+						condition += f"{column} in ({values})"
 					match_conditions.append(f"({condition})")
 					match_filters[df.get("options")] = docs
 
@@ -1142,12 +1189,13 @@ from {tables}
 			self._fetch_shared_documents = True
 			self.match_filters.append(match_filters)
 
-	def get_permission_query_conditions(self) -> str:
-		conditions = []
-		hooks = frappe.get_hooks("permission_query_conditions", {})
-		condition_methods = hooks.get(self.doctype, []) + hooks.get("*", [])
-		for method in condition_methods:
-			if c := frappe.call(frappe.get_attr(method), self.user, doctype=self.doctype):
+	def get_permission_query_conditions(self, cached_conditions: list[str] | None = None) -> str:
+		if cached_conditions is None:
+			cached_conditions = self.get_cacheable_permission_query_conditions()
+
+		conditions = list(cached_conditions)
+		for method in frappe.permissions.get_permission_query_methods(self.doctype, cacheable=False):
+			if c := frappe.call(method, self.user, doctype=self.doctype):
 				conditions.append(c)
 
 		if permission_script_name := get_server_script_map().get("permission_query", {}).get(self.doctype):
@@ -1157,6 +1205,13 @@ from {tables}
 
 		return " and ".join(conditions) if conditions else ""
 
+	def get_cacheable_permission_query_conditions(self) -> list[str]:
+		return [
+			c
+			for method in frappe.permissions.get_permission_query_methods(self.doctype, cacheable=True)
+			if (c := frappe.call(method, self.user, doctype=self.doctype))
+		]
+
 	def set_order_by(self, args):
 		if self.order_by and self.order_by != "KEEP_DEFAULT_ORDERING":
 			args.order_by = self.order_by
@@ -1202,56 +1257,11 @@ from {tables}
 		if not parameters:
 			return
 
-		_lower = parameters.lower()
-
-		if ORDER_GROUP_PATTERN.match(_lower):
-			frappe.throw(_("Illegal SQL Query"))
-
-		subquery_indicators = {
-			r"union",
-			r"intersect",
-			r"select\b.*\bfrom",
-		}
-
-		# Replace doctype names with a hardcoded string "doc"
-		# This is to avoid false positives based on doctype name
-		sanitized = re.sub(r"`tab[^`]*`", " doc ", _lower)
-
-		# Run the subquery checks against the sanitized string
-		if any(re.search(r"\b" + pattern + r"\b", sanitized) for pattern in subquery_indicators):
-			frappe.throw(_("Cannot use sub-query here."))
-
-		blacklisted_sql_functions = {
-			"sleep",
-			"benchmark",
-			"extractvalue",
-			"database",
-			"user",
-			"current_user",
-			"version",
-			"substr",
-			"substring",
-			"updatexml",
-			"load_file",
-			"session_user",
-			"system_user",
-		}
-
-		for field in parameters.split(","):
-			field = field.strip()
-			full_field_name = "." in field and field.startswith("`tab")
-
-			if full_field_name:
-				tbl = field.split(".", 1)[0]
-				if tbl not in self.tables:
-					if tbl.startswith("`"):
-						tbl = tbl[4:-1]
-					frappe.throw(_("Please select atleast 1 column from {0} to sort/group").format(tbl))
-
-			# Check for SQL function using regex with word boundaries and optional whitespace before parenthesis
-			for func in blacklisted_sql_functions:
-				if re.search(r"\b" + re.escape(func) + r"\W*\(", field.lower()):
-					frappe.throw(_("Cannot use {0} in order/group by").format(field))
+		for tbl in sanitize_order_by_and_group_by(parameters):
+			if tbl not in self.tables:
+				if tbl.startswith("`"):
+					tbl = tbl[4:-1]
+				frappe.throw(_("Please select atleast 1 column from {0} to sort/group").format(tbl))
 
 	def add_limit(self):
 		if self.limit_page_length:
@@ -1286,6 +1296,29 @@ from {tables}
 		update_user_settings(self.doctype, user_settings)
 
 
+def get_user_permission_subqueries(user: str, allow: str, applicable_for: str) -> list[str]:
+	"""Return SQL of `frappe.permissions.get_user_permission_subqueries`."""
+	return [
+		render_query(query)
+		for query in frappe.permissions.get_user_permission_subqueries(user, allow, applicable_for)
+	]
+
+
+def get_shared_subquery(doctype: str, user: str) -> str:
+	"""Return SQL of `frappe.share.get_shared_query`."""
+	return render_query(frappe.share.get_shared_query(doctype, user))
+
+
+def render_query(query) -> str:
+	"""Return SQL of query builder `query`, values are escaped inline like everywhere else in
+	DatabaseQuery."""
+	param_collector = NamedParameterWrapper()
+	sql = query.get_sql(param_wrapper=param_collector)
+	return sql % {
+		key: frappe.db.escape(value, percent=False) for key, value in param_collector.get_parameters().items()
+	}
+
+
 def cast_name(column: str) -> str:
 	"""Casts name field to varchar for postgres
 
@@ -1482,3 +1515,104 @@ def strip_alias(field: str) -> str:
 	if " as " in field.lower():
 		return field.split(" as ", 1)[0]
 	return field
+
+
+@cached_query_transform
+def sanitize_field(field: str) -> None:
+	"""Raise if `field` contains a sub-query, restricted function or keyword.
+
+	Fields are checked once per process, dashboards and list views keep requesting the same ones."""
+	lower_field = field.lower().strip()
+
+	if SUB_QUERY_PATTERN.match(field):
+		# Check all tokens for subquery detection
+		_check_sql_token(_parse_sql(field))
+
+		if "@" in lower_field:
+			# prevent access to global variables
+			_raise_restricted_sql()
+
+	if FIELD_QUOTE_PATTERN.match(field):
+		_raise_restricted_sql()
+
+	if FIELD_COMMA_PATTERN.match(field):
+		_raise_restricted_sql()
+
+	if IS_QUERY_PATTERN.match(field) or IS_QUERY_PREDICATE_PATTERN.match(field):
+		_raise_restricted_sql()
+
+
+def _find_subqueries(parsed: Statement) -> list:
+	"""
+	Recursively find all subqueries in a parsed SQL statement.
+	"""
+	subqueries = []
+
+	for token in parsed.tokens:
+		if isinstance(token, Parenthesis):
+			# Check for DML token for subquery check
+			is_subquery = False
+			for sub_token in token.tokens:
+				if sub_token.ttype is tokens.DML:
+					is_subquery = True
+					break
+			if is_subquery:
+				subqueries.append(token)
+			# Recursively check for nested subqueries
+			subqueries.extend(_find_subqueries(token))
+		elif token.is_group:
+			subqueries.extend(_find_subqueries(token))
+
+	return subqueries
+
+
+def _check_sql_token(statement: Statement) -> None:
+	"""
+	Checks the output of `sqlparse.parse()` to detect blocked functions and subqueries.
+	"""
+	if _find_subqueries(statement):
+		_raise_restricted_sql()
+
+	for token in statement.tokens:
+		if isinstance(token, Function):
+			if (name := (token.get_name())) and name.lower() in BLACKLISTED_FUNCTIONS:
+				_raise_restricted_sql()
+		if token.ttype == tokens.Keyword:
+			if token.value.lower() in BLACKLISTED_KEYWORDS:
+				_raise_restricted_sql()
+		if token.is_group:
+			_check_sql_token(token)
+
+
+def _raise_restricted_sql():
+	frappe.throw(_("Use of sub-query or function is restricted"), frappe.DataError)
+
+
+@cached_query_transform
+def sanitize_order_by_and_group_by(parameters: str) -> tuple[str, ...]:
+	"""Raise if order by / group by clause has a sub-query or restricted function, return tables it uses."""
+	_lower = parameters.lower()
+
+	if ORDER_GROUP_PATTERN.match(_lower):
+		frappe.throw(_("Illegal SQL Query"))
+
+	# Replace doctype names with a hardcoded string "doc"
+	# This is to avoid false positives based on doctype name
+	sanitized = re.sub(r"`tab[^`]*`", " doc ", _lower)
+
+	# Run the subquery checks against the sanitized string
+	if any(re.search(r"\b" + pattern + r"\b", sanitized) for pattern in ORDER_BY_SUBQUERY_PATTERNS):
+		frappe.throw(_("Cannot use sub-query here."))
+
+	tables = []
+	for field in parameters.split(","):
+		field = field.strip()
+		if "." in field and field.startswith("`tab"):
+			tables.append(field.split(".", 1)[0])
+
+		# Check for SQL function using regex with word boundaries and optional whitespace before parenthesis
+		for func in BLACKLISTED_ORDER_BY_FUNCTIONS:
+			if re.search(r"\b" + re.escape(func) + r"\W*\(", field.lower()):
+				frappe.throw(_("Cannot use {0} in order/group by").format(field))
+
+	return tuple(tables)
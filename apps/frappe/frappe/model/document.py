@@ -5,7 +5,7 @@ import itertools
 import json
 import time
 import warnings
-from collections.abc import Generator, Iterable
+from collections.abc import Callable, Generator, Iterable
 from contextlib import contextmanager
 from functools import wraps
 from types import MappingProxyType
@@ -15,20 +15,21 @@ from werkzeug.exceptions import NotFound
 
 import frappe
 from frappe import _, is_whitelisted, msgprint
+from frappe.cache_manager import mark_doctype_modified
 from frappe.core.doctype.file.utils import relink_mismatched_files
 from frappe.core.doctype.server_script.server_script_utils import run_server_script_for_doc_event
 from frappe.database.utils import commit_after_response
 from frappe.desk.form.document_follow import follow_document
 from frappe.integrations.doctype.webhook import run_webhooks
-from frappe.model import optional_fields, table_fields
-from frappe.model.base_document import BaseDocument, D, get_controller
+from frappe.model import default_fields, optional_fields, table_fields
+from frappe.model.base_document import BaseDocument, D, db_insert_multiple, get_controller
 from frappe.model.docstatus import DocStatus
 from frappe.model.naming import set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype, simple_singledispatch
 from frappe.model.workflow import set_workflow_state_on_action, validate_workflow
 from frappe.types import DF
 from frappe.types.filter import FilterSignature
-from frappe.utils import compare, cstr, date_diff, file_lock, flt, get_table_name, now
+from frappe.utils import compare, create_batch, cstr, date_diff, file_lock, flt, get_table_name, now
 from frappe.utils.data import get_absolute_url, get_datetime, get_timedelta, getdate
 from frappe.utils.global_search import update_global_search
 
@@ -156,6 +157,101 @@ def get_lazy_doc(
 	raise ImportError(doctype)
 
 
+def get_docs(
+	doctype: str,
+	names: Iterable[str | int],
+	*,
+	for_update: bool | None = None,
+	check_permission: str | bool | None = None,
+) -> list["Document"]:
+	"""Return documents of `doctype` for all `names`, in the same order.
+
+	Parents are loaded with a single query and child tables with one query per child doctype,
+	instead of one query per document and table when calling `get_doc` in a loop.
+
+	Example:
+
+	        users = frappe.get_docs("User", ["Administrator", "Guest"])
+	"""
+	names = list(names)
+	meta = frappe.get_meta(doctype)
+	if doctype == "DocType" or meta.issingle or meta.is_virtual or not names:
+		return [
+			get_doc(doctype, name, for_update=for_update, check_permission=check_permission) for name in names
+		]
+
+	for_update_clause = "FOR UPDATE" if for_update and frappe.db.db_type != "sqlite" else ""
+	case_insensitive = frappe.db.db_type != "postgres"
+
+	rows = {}
+	for batch in create_batch(list(dict.fromkeys(names)), 1000):
+		for d in frappe.db.sql(
+			"SELECT * FROM {table_name} WHERE `name` IN ({names}) {for_update}".format(
+				table_name=get_table_name(doctype, wrap_in_backticks=True),
+				names=", ".join(["%s"] * len(batch)),
+				for_update=for_update_clause,
+			),
+			[str(name) for name in batch],
+			as_dict=True,
+		):
+			rows[str(d.name)] = d
+			if case_insensitive:
+				rows.setdefault(str(d.name).casefold(), d)
+
+	children = {str(d.name): {} for d in rows.values()}
+	parent_names = list(children)
+	child_tables = {}
+	for fieldname, child_doctype in meta._table_doctypes.items():
+		if not is_virtual_doctype(child_doctype):
+			child_tables.setdefault(child_doctype, []).append(fieldname)
+
+	for child_doctype, fieldnames in child_tables.items():
+		for batch in create_batch(parent_names, 1000):
+			for d in frappe.db.sql(
+				"""SELECT * FROM {table_name}
+				WHERE `parenttype` = %s
+					AND `parentfield` IN ({fieldnames})
+					AND `parent` IN ({parents})
+				ORDER BY `idx` ASC {for_update}""".format(
+					table_name=get_table_name(child_doctype, wrap_in_backticks=True),
+					fieldnames=", ".join(["%s"] * len(fieldnames)),
+					parents=", ".join(["%s"] * len(batch)),
+					for_update=for_update_clause,
+				),
+				[doctype, *fieldnames, *batch],
+				as_dict=True,
+			):
+				if d.parent in children:
+					children[d.parent].setdefault(d.parentfield, []).append(d)
+
+	prefetched_docs = getattr(frappe.local, "prefetched_docs", None)
+	if prefetched_docs is None:
+		prefetched_docs = frappe.local.prefetched_docs = {}
+
+	prefetched_keys = []
+	for name in names:
+		d = rows.get(str(name))
+		if not d and case_insensitive:
+			d = rows.get(str(name).casefold())
+		if d:
+			prefetched_docs[(doctype, name)] = (d, children[str(d.name)])
+			prefetched_keys.append((doctype, name))
+
+	try:
+		# missing names are loaded individually, which raises `DoesNotExistError` as usual
+		return [
+			get_doc(doctype, name, for_update=for_update, check_permission=check_permission) for name in names
+		]
+	finally:
+		for key in prefetched_keys:
+			prefetched_docs.pop(key, None)
+
+
+def _get_prefetched_doc(doctype: str, name: str | int) -> tuple[dict, dict[str, list]] | None:
+	if prefetched_docs := getattr(frappe.local, "prefetched_docs", None):
+		return prefetched_docs.get((doctype, name))
+
+
 def get_doc_permission_check(doc: "Document", check_permission: str | bool | None = None) -> "Document":
 	"""
 	Checks permissions for the given document, if specified.
@@ -249,7 +345,10 @@ class Document(BaseDocument):
 			self._fix_numeric_types()
 
 		else:
-			if not is_doctype and isinstance(self.name, str | int):
+			if not is_doctype and (prefetched := _get_prefetched_doc(self.doctype, self.name)):
+				# rows already loaded in bulk by `get_docs`
+				d, self.flags.prefetched_children = prefetched
+			elif not is_doctype and isinstance(self.name, str | int):
 				for_update = ""
 				if self.flags.for_update and frappe.db.db_type != "sqlite":
 					for_update = "FOR UPDATE"
@@ -303,6 +402,7 @@ class Document(BaseDocument):
 
 	def load_children_from_db(self):
 		is_doctype = self.doctype == "DocType"
+		prefetched_children = self.flags.pop("prefetched_children", None)
 
 		for fieldname, child_doctype in self._table_fieldnames.items():
 			# Make sure not to query the DB for a child table, if it is a virtual one.
@@ -311,7 +411,9 @@ class Document(BaseDocument):
 				self.__dict__.pop(fieldname, None)
 				continue
 
-			if is_doctype:
+			if prefetched_children is not None:
+				children = prefetched_children.get(fieldname)
+			elif is_doctype:
 				# This special handling is required because of bootstrapping code that doesn't
 				# handle failures correctly.
 				children = frappe.db.get_values(
@@ -459,8 +561,7 @@ class Document(BaseDocument):
 
 		# children
 		if not getattr(self.meta, "is_virtual", False):
-			for d in self.get_all_children():
-				d.db_insert()
+			db_insert_multiple(self.get_all_children())
 
 		self.reset_computed_child_tables()
 		self.run_method("after_insert")
@@ -643,9 +744,15 @@ class Document(BaseDocument):
 			qry.run()
 
 		# update / insert
+		new_rows = []
 		for d in all_rows:
 			d: Document
-			d.db_update()
+			if (d.get("__islocal") or not d.name) and type(d).db_update is BaseDocument.db_update:
+				new_rows.append(d)
+			else:
+				d.db_update()
+
+		db_insert_multiple(new_rows)
 
 	def reset_computed_child_tables(self):
 		"""Reset computed child tables so that they are reloaded next time"""
@@ -1133,6 +1240,7 @@ class Document(BaseDocument):
 		if self.flags.ignore_links or self._action == "cancel":
 			return
 
+		self._prefetch_link_values()
 		invalid_links, cancelled_links = self.get_invalid_links()
 
 		for d in self.get_all_children():
@@ -1148,6 +1256,49 @@ class Document(BaseDocument):
 			msg = ", ".join(each[2] for each in cancelled_links)
 			frappe.throw(_("Cannot link cancelled document: {0}").format(msg), frappe.CancelledLinkError)
 
+	def _prefetch_link_values(self):
+		"""Resolve links of this document and its children with one query per linked doctype.
+
+		Fetched rows are stored in `frappe.db.value_cache` exactly as `get_invalid_links` would
+		have cached them, so the per-field lookups that follow are served from memory."""
+		links = self.get_links_to_prefetch()
+		for d in self.get_all_children():
+			links.extend(d.get_links_to_prefetch(is_submittable=self.meta.is_submittable))
+
+		case_insensitive = frappe.db.db_type != "postgres"
+		to_fetch = {}
+		for doctype, docname, values_to_fetch in links:
+			if values_to_fetch in frappe.db.value_cache[doctype][docname]:
+				continue
+			columns, requested = to_fetch.setdefault(doctype, (set(), set()))
+			columns.update(values_to_fetch)
+			requested.add((docname, values_to_fetch))
+
+		for doctype, (columns, requested) in to_fetch.items():
+			meta = frappe.get_meta(doctype)
+			if not all(meta.has_field(column) or column in default_fields for column in columns):
+				# invalid `fetch_from`, let `get_invalid_links` report it
+				continue
+
+			docnames = list({docname for docname, _values in requested})
+			rows = {}
+			for batch in create_batch(docnames, 1000):
+				for row in frappe.db.get_values(
+					doctype, {"name": ("in", batch)}, list(columns), as_dict=True, order_by=None
+				):
+					rows[str(row.name)] = row
+					if case_insensitive:
+						rows.setdefault(str(row.name).casefold(), row)
+
+			for docname, values_to_fetch in requested:
+				row = rows.get(str(docname))
+				if not row and case_insensitive:
+					row = rows.get(str(docname).casefold())
+				if row:
+					frappe.db.value_cache[doctype][docname][values_to_fetch] = [
+						frappe._dict({column: row[column] for column in values_to_fetch})
+					]
+
 	def get_all_children(self, parenttype=None, *, include_computed=False) -> list["Document"]:
 		"""
 		Return all child documents from **Table** type fields in a list.
@@ -1945,8 +2096,11 @@ def bulk_insert(
 	doctype: str,
 	documents: Iterable["Document"],
 	ignore_duplicates: bool = False,
-	chunk_size=1000,
+	chunk_size=None,
 	commit_chunks=False,
+	*,
+	stream: bool = False,
+	progress_callback: Callable[[int, float], None] | None = None,
 ):
 	"""Insert simple Documents objects to database in bulk.
 
@@ -1954,6 +2108,9 @@ def bulk_insert(
 	        - All documents are inserted without triggering ANY hooks.
 	        - This function assumes you've done the due dilligence and inserts in similar fashion as db_insert
 	        - Documents can be any iterable / generator containing Document objects
+	        - `chunk_size` defaults to 1000 documents, or to chunk size of `frappe.db.bulk_insert` with `stream`
+	        - `stream` loads rows using the database's bulk loading protocol, see `frappe.db.bulk_insert`
+	        - `progress_callback` is called after every chunk with documents inserted and documents per second
 	"""
 
 	doctype_meta = frappe.get_meta(doctype)
@@ -1966,6 +2123,21 @@ def bulk_insert(
 	for child_table in child_table_fields:
 		valid_column_map[child_table.options] = frappe.get_meta(child_table.options).get_valid_columns()
 
+	if stream:
+		return _stream_documents(
+			doctype,
+			documents,
+			valid_column_map,
+			child_table_fields,
+			ignore_duplicates,
+			chunk_size,
+			commit_chunks,
+			progress_callback,
+		)
+
+	chunk_size = chunk_size or 1000
+	start_time = time.monotonic()
+	inserted_docs = 0
 	documents = iter(documents)
 	while document_batch := list(itertools.islice(documents, chunk_size)):
 		values_map = {
@@ -1984,12 +2156,72 @@ def bulk_insert(
 			)
 
 		for dt, docs in values_map.items():
-			frappe.db.bulk_insert(dt, valid_column_map[dt], docs, ignore_duplicates=ignore_duplicates)
+			frappe.db.bulk_insert(
+				dt,
+				valid_column_map[dt],
+				docs,
+				ignore_duplicates=ignore_duplicates,
+				chunk_size=chunk_size,
+			)
+
+		if progress_callback:
+			inserted_docs += len(document_batch)
+			progress_callback(inserted_docs, inserted_docs / max(time.monotonic() - start_time, 1e-6))
 
 		if commit_chunks:
 			frappe.db.commit()
 
 
+def _stream_documents(
+	doctype: str,
+	documents: Iterable["Document"],
+	valid_column_map: dict[str, list[str]],
+	child_table_fields: list,
+	ignore_duplicates: bool,
+	chunk_size: int | None,
+	commit_chunks: bool,
+	progress_callback: Callable[[int, float], None] | None,
+):
+	"""Stream rows of `documents` as one generator so that `frappe.db.bulk_insert` decides chunk size.
+
+	Child rows of documents in each chunk are collected while parent rows are read and written after
+	that chunk is loaded."""
+	child_docs_map = {child_table.options: [] for child_table in child_table_fields}
+
+	def parent_values():
+		for doc in documents:
+			for child_table in child_table_fields:
+				child_docs_map[child_table.options].extend(doc.get(child_table.fieldname))
+			yield from _document_values_generator((doc,), valid_column_map[doctype])
+
+	def after_chunk(inserted_docs: int, rate: float):
+		for dt, child_docs in child_docs_map.items():
+			frappe.db.bulk_insert(
+				dt,
+				valid_column_map[dt],
+				_document_values_generator(child_docs, valid_column_map[dt]),
+				ignore_duplicates=ignore_duplicates,
+				stream=True,
+			)
+			child_docs.clear()
+
+		if progress_callback:
+			progress_callback(inserted_docs, rate)
+
+		if commit_chunks:
+			frappe.db.commit()
+
+	frappe.db.bulk_insert(
+		doctype,
+		valid_column_map[doctype],
+		parent_values(),
+		ignore_duplicates=ignore_duplicates,
+		chunk_size=chunk_size,
+		stream=True,
+		progress_callback=after_chunk,
+	)
+
+
 def _document_values_generator(
 	documents: Iterable["Document"],
 	columns: list[str],
@@ -2210,6 +2442,7 @@ def clear_document_cache(doctype: str, name: str | None = None) -> None:
 			frappe.cache.delete_value(get_document_cache_key(doctype, name))
 		else:
 			frappe.cache.delete_keys(get_document_cache_key(doctype, ""))
+		mark_doctype_modified(doctype)
 
 	clear_in_redis()
 	if hasattr(frappe.db, "after_commit"):
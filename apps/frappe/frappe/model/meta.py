@@ -101,6 +101,20 @@ def clear_meta_cache(doctype: str = "*"):
 		frappe.client_cache.delete_value(key)
 
 
+def preload_meta_cache(site: str, sites_path: str = ".") -> None:
+	"""Load metas of all doctypes of a site and freeze them in client cache.
+
+	This is meant to be called in master process before forking workers, see
+	`frappe._optimizations.preload_meta_cache`."""
+	frappe.init(site, sites_path=sites_path, force=True)
+	try:
+		frappe.connect()
+		for doctype in frappe.get_all("DocType", pluck="name", order_by=None):
+			frappe.client_cache.freeze(f"doctype_meta::{doctype}", Meta(doctype))
+	finally:
+		frappe.destroy()
+
+
 def load_meta(doctype):
 	return Meta(doctype)
 
@@ -57,7 +57,9 @@ class DatabaseQuery:
 		*,
 		parent_doctype: str | None = None,
 		ignore_user_permissions: bool = False,
-	) -> list:
+		cursor: str | None = None,
+		as_columns: bool = False,
+	) -> list | dict[str, list]:
 		"""Execute a database query using the Query Builder engine.
 
 		Args:
@@ -93,9 +95,14 @@ class DatabaseQuery:
 			parent_doctype: Parent doctype for child table queries.
 			ignore_user_permissions: Ignore user permissions for the query.
 				Useful for link search queries when the link field has `ignore_user_permissions` set.
+			cursor: Return rows after this position instead of skipping `offset` rows, an empty string
+				requests the first page. See `frappe.database.pagination.get_next_cursor`.
+			as_columns: Return results as dict of field name and list of its values, this avoids
+				creating a dict per row and is much faster for large results.
 
 		Returns:
-			Query results as list of dicts (default) or list of lists (as_list=True).
+			Query results as list of dicts (default), list of lists (as_list=True) or dict of lists
+			(as_columns=True).
 			If pluck is specified, returns list of field values.
 			If run=False, returns query object instead of results.
 
@@ -198,6 +205,7 @@ class DatabaseQuery:
 			"parent_doctype": parent_doctype,
 			"reference_doctype": reference_doctype,
 			"db_query_compat": True,
+			"cursor": cursor,
 		}
 
 		query = frappe.qb.get_query(**kwargs)
@@ -208,11 +216,13 @@ class DatabaseQuery:
 		# Run the query
 		if pluck:
 			result = query.run(debug=debug, as_dict=True, pluck=pluck)
+		elif as_columns:
+			result = query.run(debug=debug, as_columns=True)
 		else:
 			result = query.run(debug=debug, as_dict=not as_list, update=update)
 
 		# Add comment count if requested and not as_list
-		if sbool(with_comment_count) and not as_list and self.doctype:
+		if sbool(with_comment_count) and not as_list and not as_columns and self.doctype:
 			self._add_comment_count(result)
 
 		# Save user settings if requested
@@ -75,3 +75,19 @@ def mask_list_results(result, masked_fields, field_index_map):
 				row[idx] = mask_field_value(field, row[idx])
 		masked_result.append(tuple(row))  # Convert back to tuple
 	return masked_result
+
+
+def mask_column_results(result, masked_fields):
+	"""Mask fields in column results.
+
+	Args:
+		result: Dict of column name and list of its values
+		masked_fields: List of DocField objects with masking configuration
+
+	Returns:
+		Result with masked field values
+	"""
+	for field in masked_fields:
+		if field.fieldname in result:
+			result[field.fieldname] = [mask_field_value(field, value) for value in result[field.fieldname]]
+	return result
@@ -39,6 +39,19 @@ ADMIN_ROLE = "Administrator"
 # These roles are automatically assigned based on user type
 AUTOMATIC_ROLES = (GUEST_ROLE, ALL_USER_ROLE, SYSTEM_USER_ROLE, ADMIN_ROLE)
 
+# Restrictions with more permitted or shared documents than this are applied using subqueries on
+# `tabUser Permission` and `tabDocShare` instead of listing every document name in the query.
+# Can be changed using `permission_subquery_threshold` in site config, 0 disables subqueries.
+PERMISSION_SUBQUERY_THRESHOLD = 500
+
+# Redis hash holding the current generation of compiled permission conditions, keyed by user. Conditions
+# are invalidated by removing the user (or all users) from it, entries of older generations are ignored.
+PERMISSION_CONDITIONS_CACHE_KEY = "permission_conditions"
+# Prefix of per-user redis hashes holding compiled conditions, one field per key. Hashes are deleted when
+# conditions are cleared, expiry removes ones left behind when only the generation is dropped.
+COMPILED_CONDITIONS_CACHE_PREFIX = "compiled_permission_conditions::"
+COMPILED_CONDITIONS_CACHE_EXPIRY = 24 * 60 * 60
+
 
 def print_has_permission_check_logs(func):
 	@functools.wraps(func)
@@ -329,6 +342,109 @@ def get_role_permissions(doctype_meta, user=None, is_owner=None, debug=False):
 	return frappe.local.role_permissions[cache_key]
 
 
+def use_permission_subquery(documents: list) -> bool:
+	"""Check if restriction to `documents` should be applied using a subquery, see `PERMISSION_SUBQUERY_THRESHOLD`."""
+	threshold = cint(frappe.conf.get("permission_subquery_threshold", PERMISSION_SUBQUERY_THRESHOLD))
+	return bool(threshold) and len(documents) > threshold
+
+
+def get_user_permission_subqueries(user: str, allow: str, applicable_for: str) -> list:
+	"""Return queries selecting documents of `allow` that user permissions of `user` applicable on
+	`applicable_for` permit.
+
+	Together these select the same documents as listed by `get_user_permissions`, including descendants
+	of tree doctypes."""
+	from frappe.query_builder.functions import IfNull
+
+	UserPermission = DocType("User Permission")
+	conditions = (
+		(UserPermission.user == user)
+		& (UserPermission.allow == allow)
+		& (
+			(IfNull(UserPermission.applicable_for, "") == "")
+			| (UserPermission.applicable_for == applicable_for)
+		)
+	)
+	queries = [frappe.qb.from_(UserPermission).select(UserPermission.for_value).where(conditions)]
+
+	if frappe.get_meta(allow).is_nested_set():
+		child = DocType(allow).as_("child")
+		ancestor = DocType(allow).as_("ancestor")
+		queries.append(
+			frappe.qb.from_(child)
+			.join(ancestor)
+			.on((child.lft > ancestor.lft) & (child.rgt < ancestor.rgt))
+			.join(UserPermission)
+			.on(UserPermission.for_value == ancestor.name)
+			.select(child.name)
+			.where(conditions & (UserPermission.hide_descendants == 0))
+		)
+
+	return queries
+
+
+def cacheable_permission_query(fn):
+	"""Mark a `permission_query_conditions` hook as cacheable.
+
+	Conditions returned by cacheable hooks are compiled along with role permissions, user permissions
+	and shares and reused until any of those change. Only use this for hooks whose result depends
+	solely on the user, their roles and the doctype."""
+	fn.cacheable_permission_query = True
+	return fn
+
+
+def get_permission_query_methods(doctype: str, cacheable: bool) -> list:
+	"""Return either the cacheable or the other `permission_query_conditions` hooks of `doctype`."""
+	hooks = frappe.get_hooks("permission_query_conditions", {})
+	return [
+		method
+		for method in map(frappe.get_attr, hooks.get(doctype, []) + hooks.get("*", []))
+		if getattr(method, "cacheable_permission_query", False) == cacheable
+	]
+
+
+def get_compiled_permission_conditions(user: str, key: tuple, compile):
+	"""Return permission conditions of `user` stored for `key`, `compile()` is called to build them
+	if they aren't cached yet.
+
+	Compiled conditions are cleared along with other caches of the user, when user permissions or shares
+	of the user change and when permissions of any doctype change."""
+	generation = frappe.cache.hget(PERMISSION_CONDITIONS_CACHE_KEY, user)
+	if not generation:
+		generation = frappe.generate_hash(length=10)
+		frappe.cache.hset(PERMISSION_CONDITIONS_CACHE_KEY, user, generation)
+
+	name = f"{COMPILED_CONDITIONS_CACHE_PREFIX}{user}"
+	field = repr(key)
+	cached = frappe.cache.hget(name, field)
+	if cached and cached[0] == generation:
+		return cached[1]
+
+	# generation is read before compiling, if conditions are invalidated meanwhile they are stored
+	# with the older generation and won't be used.
+	compiled = compile()
+	frappe.cache.hset(name, field, (generation, compiled))
+	frappe.cache.expire_key(name, COMPILED_CONDITIONS_CACHE_EXPIRY)
+	return compiled
+
+
+def clear_compiled_permission_conditions(user: str | None = None):
+	"""Clear compiled permission conditions of `user` or of all users, again after the transaction ends."""
+
+	def clear():
+		if user:
+			frappe.cache.hdel(PERMISSION_CONDITIONS_CACHE_KEY, user)
+			frappe.cache.delete_value(f"{COMPILED_CONDITIONS_CACHE_PREFIX}{user}")
+		else:
+			frappe.cache.delete_value(PERMISSION_CONDITIONS_CACHE_KEY)
+			frappe.cache.delete_keys(COMPILED_CONDITIONS_CACHE_PREFIX)
+
+	clear()
+	if hasattr(frappe.db, "after_commit"):
+		frappe.db.after_commit.add(clear)
+		frappe.db.after_rollback.add(clear)
+
+
 def get_user_permissions(user):
 	from frappe.core.doctype.user_permission.user_permission import get_user_permissions
 
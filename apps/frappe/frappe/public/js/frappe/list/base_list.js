@@ -503,6 +503,14 @@ frappe.views.BaseList = class BaseList {
 
 	get_call_args() {
 		const args = this.get_args();
+		// seek to the end of loaded data instead of skipping rows when loading more,
+		// server falls back to `start` if the sort order doesn't allow it
+		if (!this.start) {
+			// empty cursor, only asks for a cursor to load the next page with
+			args.cursor = "";
+		} else if (this.next_cursor) {
+			args.cursor = this.next_cursor;
+		}
 		return {
 			method: this.method,
 			args: args,
@@ -560,6 +568,9 @@ frappe.views.BaseList = class BaseList {
 		Object.assign(frappe.boot.user_info, data.user_info);
 		delete data.user_info;
 
+		this.next_cursor = data.next_cursor;
+		delete data.next_cursor;
+
 		data = !Array.isArray(data) ? frappe.utils.dict(data.keys, data.values) : data;
 
 		if (this.start === 0) {
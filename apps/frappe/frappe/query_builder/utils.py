@@ -82,9 +82,10 @@ def Table(*args, **kwargs):
 def mask_fields(
 	doctype: str,
 	fields: list[Any],
-	result: list[dict] | list[tuple],
+	result: list[dict] | list[tuple] | dict[str, list],
 	as_dict: bool = True,
-) -> list[dict] | list[tuple]:
+	as_columns: bool = False,
+) -> list[dict] | list[tuple] | dict[str, list]:
 	"""Mask fields in the result based on the doctype's masked fields.
 
 	Args:
@@ -92,12 +93,13 @@ def mask_fields(
 		fields: List of field objects from the query
 		result: Query results as list of dicts or tuples
 		as_dict: Whether results are dictionaries (True) or tuples (False)
+		as_columns: Whether result is a dict of column name and its values
 
 	Returns:
 		Result with masked field values applied based on user permissions
 	"""
 	from frappe.database.query import CORE_DOCTYPES
-	from frappe.model.utils.mask import mask_dict_results, mask_list_results
+	from frappe.model.utils.mask import mask_column_results, mask_dict_results, mask_list_results
 
 	# We can't query meta for core doctypes here
 	if doctype in CORE_DOCTYPES:
@@ -108,6 +110,9 @@ def mask_fields(
 	if not masked_fields:
 		return result
 
+	if as_columns:
+		return mask_column_results(result, masked_fields)
+
 	if not as_dict:
 		field_index_map = {}
 		for idx, field in enumerate(fields):
@@ -130,12 +135,13 @@ def execute_query(query, *args, **kwargs):
 	query, params = prepare_query(query)
 	result = frappe.local.db.sql(query, params, *args, **kwargs)  # nosemgrep
 
-	if child_queries and isinstance(child_queries, list) and result:
+	as_columns = kwargs.get("as_columns", False)
+	if child_queries and isinstance(child_queries, list) and result and not as_columns:
 		execute_child_queries(child_queries, result)
 
 	if result and dt and fields:
 		as_dict = kwargs.get("as_dict", not kwargs.get("as_list", False))
-		result = mask_fields(dt, fields, result, as_dict=as_dict)
+		result = mask_fields(dt, fields, result, as_dict=as_dict, as_columns=as_columns)
 
 	return result
 
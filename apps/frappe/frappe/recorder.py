@@ -6,6 +6,7 @@ import inspect
 import io
 import json
 import pstats
+import random
 import re
 import time
 import typing
@@ -13,12 +14,13 @@ from collections import Counter
 from collections.abc import Callable
 from dataclasses import dataclass
 
+import redis
 import sqlparse
 
 import frappe
 from frappe import _
-from frappe.database.utils import is_query_type
-from frappe.utils import now_datetime
+from frappe.database.utils import get_query_cache_info, is_query_type
+from frappe.utils import now_datetime, sha256_hash
 
 RECORDER_INTERCEPT_FLAG = "recorder-intercept"
 RECORDER_CONFIG_FLAG = "recorder-config"
@@ -27,6 +29,16 @@ RECORDER_REQUEST_HASH = "recorder-requests"
 TRACEBACK_PATH_PATTERN = re.compile(".*/apps/")
 RECORDER_AUTO_DISABLE = 10 * 60
 
+# Statistics of queries sampled across requests and jobs, see `QuerySampler`
+QUERY_STATS_DURATION = "recorder-query-duration"  # sorted set, query hash -> total time in ms
+QUERY_STATS_CALLS = "recorder-query-calls"  # hash, query hash -> number of calls
+QUERY_STATS_SAMPLES = "recorder-query-samples"  # hash, query hash -> [query, query with values]
+QUERY_STATS_EXPIRY = 7 * 24 * 60 * 60
+# Only this many queries with most total time are kept. Queries are trimmed once twice as many are
+# tracked, so that new queries get some time to add up before they can be evicted.
+QUERY_STATS_MAX_QUERIES = 2000
+SAMPLED_QUERY_TYPES = ("select", "update", "delete")
+
 
 if typing.TYPE_CHECKING:
 	from frappe.database.database import Database
@@ -188,10 +200,15 @@ def record(force=False):
 		# Explicitly set it once so next requests can use client-side cache
 		frappe.client_cache.set_value(RECORDER_INTERCEPT_FLAG, False)
 
+	if (sample_rate := frappe.conf.query_sample_rate) and random.random() < float(sample_rate):
+		frappe.local._query_sampler = QuerySampler(frappe.db)
+
 
 def dump():
 	if hasattr(frappe.local, "_recorder"):
 		frappe.local._recorder.dump()
+	if hasattr(frappe.local, "_query_sampler"):
+		frappe.local._query_sampler.dump()
 
 
 class Recorder:
@@ -233,6 +250,8 @@ class Recorder:
 
 		self.uuid = frappe.generate_hash(length=10)
 		self.time = now_datetime()
+		self.query_cache_info = get_query_cache_info()
+		self.identity_map_hits = frappe.db.identity_map.hits
 
 		self._patch_sql(frappe.db)
 
@@ -261,6 +280,7 @@ class Recorder:
 		if not self._recording:
 			return
 		profiler_output = self.process_profiler()
+		query_cache_info = get_query_cache_info()
 
 		request_data = {
 			"uuid": self.uuid,
@@ -272,6 +292,10 @@ class Recorder:
 			"duration": float(f"{(now_datetime() - self.time).total_seconds() * 1000:0.3f}"),
 			"method": self.method,
 			"event_type": self.event_type,
+			# process-wide counters, concurrent requests in threaded workers are included
+			"query_cache_hits": query_cache_info["hits"] - self.query_cache_info["hits"],
+			"query_cache_misses": query_cache_info["misses"] - self.query_cache_info["misses"],
+			"identity_map_hits": frappe.db.identity_map.hits - self.identity_map_hits,
 		}
 		frappe.cache.hset(RECORDER_REQUEST_SPARSE_HASH, self.uuid, request_data)
 
@@ -296,6 +320,118 @@ class Recorder:
 			db.sql = db._sql
 
 
+class QuerySampler:
+	"""Aggregate number of calls and time spent per query, statistics of all sampled requests and jobs
+	are added up in redis.
+
+	Unlike `Recorder` nothing else is captured, overhead is low enough to keep it enabled on a fraction of
+	requests and jobs using `query_sample_rate` in site config. Statistics are used for suggesting
+	indexes, see `frappe.core.doctype.recorder.index_advisor`."""
+
+	def __init__(self, db: "Database"):
+		# query -> [calls, total time in ms, query with values]
+		self.stats: dict[str, list] = {}
+		self.db = db
+		self._sql = db.sql
+		db.sql = self.sql
+
+	def sql(self, query, *args, **kwargs):
+		start_time = time.monotonic()
+		result = self._sql(query, *args, **kwargs)
+		duration = (time.monotonic() - start_time) * 1000
+
+		if isinstance(result, str) or not isinstance(query, str):
+			return result
+
+		if stat := self.stats.get(query):
+			stat[0] += 1
+			stat[1] += duration
+		elif is_query_type(query, SAMPLED_QUERY_TYPES):
+			self.stats[query] = [1, duration, str(getattr(self.db, "last_query", None) or query)]
+
+		return result
+
+	def cleanup(self):
+		self.db.sql = self._sql
+
+	def dump(self):
+		self.cleanup()
+		if not self.stats:
+			return
+
+		duration_key, calls_key, samples_key = (
+			frappe.cache.make_key(key)
+			for key in (QUERY_STATS_DURATION, QUERY_STATS_CALLS, QUERY_STATS_SAMPLES)
+		)
+		pipeline = frappe.cache.pipeline(transaction=False)
+		for query, (calls, duration, sample) in self.stats.items():
+			query_hash = sha256_hash(query)
+			pipeline.zincrby(duration_key, duration, query_hash)
+			pipeline.hincrby(calls_key, query_hash, calls)
+			pipeline.hsetnx(samples_key, query_hash, json.dumps([query, sample]))
+
+		for key in (duration_key, calls_key, samples_key):
+			pipeline.expire(key, QUERY_STATS_EXPIRY)
+		pipeline.zcard(duration_key)
+
+		try:
+			if pipeline.execute()[-1] > 2 * QUERY_STATS_MAX_QUERIES:
+				trim_query_stats(duration_key, calls_key, samples_key)
+		except redis.exceptions.ConnectionError:
+			pass
+
+
+def trim_query_stats(duration_key: str, calls_key: str, samples_key: str):
+	"""Keep only `QUERY_STATS_MAX_QUERIES` queries with most total time."""
+	# transaction, so that queries read for eviction are the ones removed from sorted set
+	pipeline = frappe.cache.pipeline(transaction=True)
+	pipeline.zrange(duration_key, 0, -QUERY_STATS_MAX_QUERIES - 1)
+	pipeline.zremrangebyrank(duration_key, 0, -QUERY_STATS_MAX_QUERIES - 1)
+	evicted = pipeline.execute()[0]
+	if evicted:
+		# calls and samples of queries evicted from sorted set aren't needed anymore
+		pipeline = frappe.cache.pipeline(transaction=False)
+		pipeline.hdel(calls_key, *evicted)
+		pipeline.hdel(samples_key, *evicted)
+		pipeline.execute()
+
+
+def get_query_stats(limit: int = 100) -> list[frappe._dict]:
+	"""Return sampled queries with most total time, queries with same normalized form are merged.
+
+	Every query is returned as `{"query": normalized query, "sample": query with values, "calls": int,
+	"duration": total time in ms}`."""
+	duration_key, calls_key, samples_key = (
+		frappe.cache.make_key(key) for key in (QUERY_STATS_DURATION, QUERY_STATS_CALLS, QUERY_STATS_SAMPLES)
+	)
+	# Queries differing only in inlined values have to be merged, read more than required.
+	durations = frappe.cache.zrevrange(duration_key, 0, limit * 10 - 1, withscores=True)
+	if not durations:
+		return []
+
+	query_hashes = [query_hash for query_hash, _duration in durations]
+	calls = frappe.cache.hmget(calls_key, query_hashes)
+	samples = frappe.cache.hmget(samples_key, query_hashes)
+
+	stats: dict[str, frappe._dict] = {}
+	for (_query_hash, duration), query_calls, sample in zip(durations, calls, samples, strict=True):
+		if not sample:
+			continue
+		query, sample = json.loads(sample)
+		normalized_query = normalize_query(query)
+		stat = stats.setdefault(
+			normalized_query, frappe._dict(query=normalized_query, sample=sample, calls=0, duration=0.0)
+		)
+		stat.calls += int(query_calls or 0)
+		stat.duration += duration
+
+	return sorted(stats.values(), key=lambda stat: stat.duration, reverse=True)[:limit]
+
+
+def reset_query_stats():
+	frappe.cache.delete_value([QUERY_STATS_DURATION, QUERY_STATS_CALLS, QUERY_STATS_SAMPLES])
+
+
 def do_not_record(function):
 	@functools.wraps(function)
 	def wrapper(*args, **kwargs):
@@ -181,6 +181,23 @@ def get_shared(doctype, user=None, rights=None, *, filters=None, limit=None):
 	return [doc.share_name for doc in shared_docs]
 
 
+def get_shared_query(doctype, user=None):
+	"""Return query selecting names of documents shared with user for reading, see `get_shared`."""
+	if not user:
+		user = frappe.session.user
+
+	table = frappe.qb.DocType("DocShare")
+	user_condition = table.user == user
+	if user != "Guest":
+		user_condition |= table.everyone == 1
+
+	return (
+		frappe.qb.from_(table)
+		.select(table.share_name)
+		.where((table.share_doctype == doctype) & (table["read"] == 1) & user_condition)
+	)
+
+
 def get_shared_doctypes(user=None):
 	"""Return list of doctypes in which documents are shared for the given user."""
 	if not user:
@@ -7,14 +7,18 @@ from werkzeug.local import Local
 
 import frappe
 from frappe.core.doctype.rq_job.rq_job import remove_failed_jobs
+from frappe.database.pool import pool
 from frappe.tests import IntegrationTestCase
 from frappe.utils.background_jobs import (
 	RQ_JOB_FAILURE_TTL,
 	RQ_RESULTS_TTL,
+	WarmContext,
 	create_job_id,
+	enqueue_many,
 	execute_job,
 	generate_qname,
 	get_redis_conn,
+	run_job_batch,
 )
 
 
@@ -54,6 +58,34 @@ class TestBackgroundJobs(IntegrationTestCase):
 		# lesser is earlier
 		self.assertTrue(high_priority_job.get_position() < low_priority_job.get_position())
 
+	def test_enqueue_many(self):
+		kwargs_list = [{"description": f"_Test enqueue_many {i}"} for i in range(5)]
+
+		jobs = enqueue_many("frappe.tests.test_background_jobs.create_todo", kwargs_list, queue="short")
+		self.assertEqual(len(jobs), 5)
+		self.assertEqual(jobs[0].kwargs["kwargs"], kwargs_list[0])
+
+		jobs = enqueue_many(
+			"frappe.tests.test_background_jobs.create_todo", kwargs_list, queue="short", chunk_size=2
+		)
+		self.assertEqual(len(jobs), 3)
+		self.assertEqual(jobs[0].kwargs["method"], "frappe.utils.background_jobs.run_job_batch")
+		self.assertEqual(jobs[-1].kwargs["kwargs"]["kwargs_list"], kwargs_list[4:])
+
+	def test_run_job_batch(self):
+		kwargs_list = [
+			{"description": "_Test job batch"},
+			# commit is ignored, so that changes of the failing call can still be rolled back
+			{"description": None, "commit": True},
+			{"description": "_Test job batch"},
+		]
+
+		result = run_job_batch("frappe.tests.test_background_jobs.create_todo", kwargs_list)
+
+		self.assertEqual(result, {"succeeded": 2, "failed": 1})
+		self.assertEqual(frappe.db.count("ToDo", {"description": "_Test job batch"}), 2)
+		frappe.db.rollback()
+
 	def test_job_hooks(self):
 		self.addCleanup(lambda: _test_JOB_HOOK.clear())
 		with (
@@ -75,11 +107,48 @@ class TestBackgroundJobs(IntegrationTestCase):
 			self.assertEqual(r, "pong")
 			self.assertLess(_test_JOB_HOOK.get("before_job"), _test_JOB_HOOK.get("after_job"))
 
+	def test_warm_context(self):
+		if frappe.conf.db_type == "sqlite":
+			self.skipTest("Connection pooling isn't supported by SQLite")
+
+		pool.clear()
+		self.addCleanup(pool.clear)
+		with (
+			freeze_local() as locals,
+			frappe.init_site(locals.site),
+			patch("frappe.utils.background_jobs._warm_context", WarmContext()),
+		):
+			reused = pool.get_stats()["reused"]
+			for _ in range(2):
+				r = execute_job(
+					site=frappe.local.site,
+					user="Administrator",
+					method="frappe.handler.ping",
+					event=None,
+					job_name="frappe.handler.ping",
+					is_async=True,
+					kwargs={},
+				)
+				self.assertEqual(r, "pong")
+
+			# connection of first job is used by the second one
+			self.assertEqual(pool.get_stats()["reused"], reused + 1)
+			self.assertEqual(pool.get_stats()["idle"], 1)
+
 
 def fail_function():
 	return 1 / 0
 
 
+def create_todo(description, commit=False):
+	todo = frappe.get_doc(doctype="ToDo", description=description or "_Test job batch").insert()
+	if commit:
+		frappe.db.commit()
+	if not description:
+		raise ValueError("Changes of failed call should be rolled back")
+	return todo
+
+
 _test_JOB_HOOK = {}
 
 
@@ -1,5 +1,5 @@
 import time
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import frappe
 from frappe.core.doctype.doctype.test_doctype import new_doctype
@@ -179,6 +179,80 @@ class TestRedisCache(FrappeAPITestCase):
 		# kwargs should hit cache too
 		self.assertEqual(function_call_count, 4)
 
+	def test_redis_cache_soft_ttl(self):
+		function_call_count = 0
+
+		@redis_cache(ttl=CACHE_TTL * 10, soft_ttl=1)
+		def get_call_count() -> int:
+			nonlocal function_call_count
+			function_call_count += 1
+			return function_call_count
+
+		get_call_count.clear_cache()
+		self.assertEqual(get_call_count(), 1)
+		frappe.local.cache.clear()
+		self.assertEqual(get_call_count(), 1)
+
+		time.sleep(1.5)
+		frappe.local.cache.clear()
+		# Stale value is returned and refreshed
+		self.assertEqual(get_call_count(), 1)
+		self.assertEqual(function_call_count, 2)
+		frappe.local.cache.clear()
+		self.assertEqual(get_call_count(), 2)
+		get_call_count.clear_cache()
+
+	def test_single_flight_waits_for_value(self):
+		import pickle
+		import threading
+
+		key = "test_single_flight"
+		name = frappe.cache.make_key(key)
+		frappe.cache.delete_value(key)
+		lock = frappe.cache._get_regenerate_lock(key)
+		self.addCleanup(lock.release)
+
+		def regenerate():
+			time.sleep(0.2)
+			frappe.cache.set(name, pickle.dumps("regenerated"))
+
+		thread = threading.Thread(target=regenerate)
+		thread.start()
+		generator = MagicMock(return_value="generated")
+		self.assertEqual(frappe.cache.get_value(key, generator, single_flight=True), "regenerated")
+		generator.assert_not_called()
+		thread.join()
+		frappe.cache.delete_value(key)
+
+	def test_multi_key_reads_and_writes(self):
+		keys = ["test_multi_key_1", "test_multi_key_2"]
+		self.addCleanup(frappe.cache.delete_value, keys, user=True)
+		frappe.cache.set_values({"test_multi_key_1": 1, "test_multi_key_2": {"a": 2}}, user=True)
+		frappe.local.cache.clear()
+
+		values = frappe.cache.get_values([*keys, "test_multi_key_missing"], user=True)
+		self.assertEqual(
+			values, {"test_multi_key_1": 1, "test_multi_key_2": {"a": 2}, "test_multi_key_missing": None}
+		)
+		self.assertEqual(frappe.cache.get_value("test_multi_key_1", user=True), 1)
+		# Misses aren't cached locally
+		self.assertEqual(frappe.cache.get_value("test_multi_key_missing", lambda: 3, user=True), 3)
+		frappe.cache.delete_value("test_multi_key_missing", user=True)
+
+		names = ["test_multi_hash_1", "test_multi_hash_2"]
+		self.addCleanup(frappe.cache.delete_value, names)
+		frappe.cache.hset("test_multi_hash_1", "a", 1)
+		frappe.cache.hset("test_multi_hash_1", "b", 2)
+		frappe.cache.hset("test_multi_hash_2", "a", 3)
+		frappe.local.cache.clear()
+
+		self.assertEqual(
+			frappe.cache.hget_many("test_multi_hash_1", ["a", "b", "c"]), {"a": 1, "b": 2, "c": None}
+		)
+		self.assertEqual(
+			frappe.cache.hget_names(names, "a"), {"test_multi_hash_1": 1, "test_multi_hash_2": 3}
+		)
+
 	def test_global_clear_cache(self):
 		function_call_count = 0
 
@@ -362,6 +436,37 @@ class TestRedisWrapper(FrappeAPITestCase):
 	def test_backward_compat_cache(self):
 		self.assertEqual(frappe.cache, frappe.cache())
 
+	def test_cache_codecs(self):
+		import pickle
+
+		from frappe.utils.cache_codec import HEADER_SIZE, decode_value, encode_value
+
+		plain = {"a": [1, 2.5, None, True, "x" * 100_000]}
+		values = [plain, frappe._dict(plain), ("tuple",), frappe.utils.now_datetime(), None, 2**100]
+		configs = [
+			{},
+			{"cache_serializer": "auto"},
+			{"cache_compression": "zlib", "cache_compression_threshold": 10},
+			{"cache_serializer": "auto", "cache_compression": "zstd"},
+		]
+		for conf in configs:
+			with patch.dict(frappe.local.conf, conf):
+				for value in values:
+					decoded = decode_value(encode_value(value))
+					self.assertEqual(decoded, value)
+					self.assertIs(type(decoded), type(value))
+
+		with patch.dict(frappe.local.conf, {"cache_compression": "zlib"}):
+			self.assertLess(len(encode_value(plain)), 1000)
+
+		# Values written without header are still readable
+		self.assertEqual(decode_value(pickle.dumps(plain)), plain)
+		# Unknown formats are treated as cache miss
+		self.assertIsNone(decode_value(bytes((0, 99, 0, 0)) + pickle.dumps(plain)))
+		self.assertIsNone(
+			decode_value(encode_value(plain)[: HEADER_SIZE - 1] + b"\x09" + pickle.dumps(plain))
+		)
+
 
 class TestHttpCache(FrappeAPITestCase):
 	def test_http_headers(self):
@@ -92,6 +92,43 @@ class TestClientCache(IntegrationTestCase):
 
 		self.assertEqual(len(c.cache), 2)
 
+	def test_client_cache_lru_and_namespaces(self):
+		c = ClientCache(maxsize=10)
+		c.set_value(TEST_KEY, 42)
+		for i in range(20):
+			c.set_value(f"doctype_meta::_Test {i}", i)
+
+		# Meta can only use its share, default namespace isn't evicted by it
+		stats = c.statistics.namespaces
+		self.assertEqual(stats["meta"].used, 6)
+		self.assertGreater(stats["meta"].evictions, 0)
+		self.assertEqual(c.get_value(TEST_KEY), 42)
+
+		# Recently used keys survive eviction
+		c.get_value("doctype_meta::_Test 14")
+		c.set_value("doctype_meta::_Test 20", 20)
+		self.assertIn(c.redis.make_key("doctype_meta::_Test 14"), c.cache)
+		self.assertNotIn(c.redis.make_key("doctype_meta::_Test 15"), c.cache)
+
+		# Values larger than namespace's byte quota are never kept locally
+		c = ClientCache(maxsize=10, max_bytes=1000)
+		c.set_value(TEST_KEY, "x" * 2000)
+		self.assertNotIn(c.redis.make_key(TEST_KEY), c.cache)
+		self.assertEqual(c.statistics.namespaces["default"].size, 0)
+
+	def test_frozen_values(self):
+		val = {"frozen": frappe.generate_hash()}
+		frappe.client_cache.freeze(TEST_KEY, val)
+
+		# Fresh client cache, like a forked worker, reuses the same object.
+		c = ClientCache()
+		self.assertIs(c.get_value(TEST_KEY), val)
+
+		# Modified values are read from redis
+		frappe.cache.set_value(TEST_KEY, {"frozen": "changed"})
+		c.clear_cache()
+		self.assertEqual(c.get_value(TEST_KEY), {"frozen": "changed"})
+
 	def test_shared_keyspace(self):
 		val = frappe.generate_hash()
 		frappe.client_cache.set_value(TEST_KEY, val)
@@ -9,9 +9,11 @@ from unittest.mock import patch
 import frappe
 from frappe.core.utils import find
 from frappe.custom.doctype.custom_field.custom_field import create_custom_field
-from frappe.database import savepoint
+from frappe.database import get_db, savepoint
 from frappe.database.database import get_query_execution_timeout
-from frappe.database.utils import FallBackDateTimeStr
+from frappe.database.pool import PoolStats, pool
+from frappe.database.replica import REPLICA_LAG_CACHE_KEY
+from frappe.database.utils import FallBackDateTimeStr, get_query_cache_info
 from frappe.query_builder import Field
 from frappe.query_builder.functions import Concat_ws
 from frappe.tests import IntegrationTestCase, timeout
@@ -36,6 +38,45 @@ class TestDB(IntegrationTestCase):
 	def test_get_database_size(self):
 		self.assertIsInstance(frappe.db.get_database_size(), (float, int))
 
+	def test_query_preprocessing_cache(self):
+		query = f"select ifnull(name, '') from tabUser where name = %s -- {frappe.generate_hash()}"
+		frappe.db.sql(query, "Administrator")
+
+		before = get_query_cache_info()
+		for _ in range(3):
+			self.assertEqual(frappe.db.sql(query, "Administrator"), (("Administrator",),))
+		after = get_query_cache_info()
+
+		self.assertGreaterEqual(after["hits"] - before["hits"], 3)
+		self.assertEqual(after["misses"], before["misses"])
+
+	def test_identity_map(self):
+		note = frappe.get_doc(doctype="Note", title=frappe.generate_hash(), content="identity map").insert()
+		frappe.db.identity_map.enabled = True
+		self.addCleanup(setattr, frappe.db.identity_map, "enabled", False)
+
+		self.assertEqual(frappe.db.get_value("Note", note.name, "title"), note.title)
+		with self.assertQueryCount(0):
+			self.assertEqual(frappe.db.get_value("Note", note.name, "title"), note.title)
+
+		# only missing fields are read and merged
+		with self.assertQueryCount(1):
+			title, content = frappe.db.get_value("Note", note.name, ["title", "content"])
+		self.assertEqual((title, content), (note.title, "identity map"))
+		self.assertIsNone(frappe.db.get_value("Note", "not a note", "title"))
+		with self.assertQueryCount(0):
+			self.assertEqual(
+				frappe.db.get_value("Note", note.name, ["content", "title"], as_dict=True),
+				{"content": "identity map", "title": note.title},
+			)
+			self.assertIsNone(frappe.db.get_value("Note", "not a note", "title"))
+
+		# writes invalidate the map
+		frappe.db.set_value("Note", note.name, "title", "changed")
+		self.assertEqual(frappe.db.get_value("Note", note.name, "title"), "changed")
+		frappe.db.delete("Note", note.name)
+		self.assertIsNone(frappe.db.get_value("Note", note.name, "title"))
+
 	def test_db_statement_execution_timeout(self):
 		frappe.db.set_execution_timeout(2)
 		# Setting 0 means no timeout.
@@ -582,6 +623,56 @@ class TestDB(IntegrationTestCase):
 
 		frappe.db.delete("ToDo", {"description": test_body})
 
+	def test_streaming_bulk_insert(self):
+		test_body = f"test_streaming_bulk_insert - {random_string(10)}"
+		descriptions = ["plain", "tab\tnew line\nback\\slash", None]
+		progress = []
+
+		def values():
+			for i in range(30):
+				yield (f"ToDo Test Stream Insert {i}", test_body, descriptions[i % 3])
+
+		transaction_writes = frappe.db.transaction_writes
+		frappe.db.bulk_insert(
+			"ToDo",
+			["name", "description", "reference_name"],
+			values(),
+			chunk_size=7,
+			stream=True,
+			progress_callback=lambda rows, rate: progress.append(rows),
+		)
+		# every chunk counts as a write, e.g. for replica stickiness
+		self.assertEqual(frappe.db.transaction_writes - transaction_writes, 5)
+
+		self.assertEqual(frappe.db.count("ToDo", {"description": test_body}), 30)
+		self.assertEqual(
+			frappe.db.get_value("ToDo", "ToDo Test Stream Insert 1", "reference_name"), descriptions[1]
+		)
+		self.assertIsNone(frappe.db.get_value("ToDo", "ToDo Test Stream Insert 2", "reference_name"))
+		self.assertEqual(progress, [7, 14, 21, 28, 30])
+
+		frappe.db.delete("ToDo", {"description": test_body})
+
+	def test_streaming_bulk_insert_duplicates(self):
+		test_body = f"test_streaming_bulk_insert_duplicates - {random_string(10)}"
+		rows = [("ToDo Test Stream Duplicate", test_body)] * 2
+		other_row = ("ToDo Test Stream Other", test_body)
+
+		# duplicates fail irrespective of how rows are written, without writing any row of the chunk
+		with self.assertRaises(Exception) as context:
+			frappe.db.bulk_insert("ToDo", ["name", "description"], [*rows, other_row], stream=True)
+		self.assertTrue(
+			isinstance(context.exception, frappe.DuplicateEntryError)
+			or frappe.db.is_primary_key_violation(context.exception)
+		)
+		if isinstance(context.exception, frappe.DuplicateEntryError):
+			self.assertFalse(frappe.db.exists("ToDo", other_row[0]))
+		frappe.db.rollback()
+
+		frappe.db.bulk_insert("ToDo", ["name", "description"], rows, stream=True, ignore_duplicates=True)
+		self.assertEqual(frappe.db.count("ToDo", {"description": test_body}), 1)
+		frappe.db.delete("ToDo", {"description": test_body})
+
 	def test_bulk_update(self):
 		test_body = f"test_bulk_update - {random_string(10)}"
 
@@ -1076,8 +1167,21 @@ class TestTransactionManagement(IntegrationTestCase):
 
 # Treat same DB as replica for tests, a separate connection will be opened
 class TestReplicaConnections(IntegrationTestCase):
+	def setUp(self):
+		# replica isn't used once current request has written something
+		frappe.db.rollback()
+		frappe.local.committed_writes = False
+		frappe.cache.delete_value(REPLICA_LAG_CACHE_KEY)
+
+	def tearDown(self):
+		if replica_db := getattr(frappe.local, "replica_db", None):
+			replica_db.close()
+			del frappe.local.replica_db
+
 	def test_switching_to_replica(self):
-		with patch.dict(frappe.local.conf, {"read_from_replica": 1, "replica_host": "127.0.0.1"}):
+		with patch.dict(
+			frappe.local.conf, {"read_from_replica": 1, "replica_host": "127.0.0.1", "replica_max_lag": 0}
+		):
 
 			def db_id():
 				return id(frappe.local.db)
@@ -1104,6 +1208,137 @@ class TestReplicaConnections(IntegrationTestCase):
 			outer()
 			self.assertEqual(write_connection, db_id())
 
+	def test_fallback_to_primary(self):
+		@frappe.read_only()
+		def get_connection():
+			return frappe.local.db
+
+		primary_db = frappe.local.db
+		with patch.dict(frappe.local.conf, {"read_from_replica": 1, "replica_host": "127.0.0.1"}):
+			with patch.object(type(frappe.db), "get_replication_lag", return_value=0.5):
+				self.assertIsNot(get_connection(), primary_db)
+
+			# lagging replica
+			frappe.cache.delete_value(REPLICA_LAG_CACHE_KEY)
+			with patch.object(type(frappe.db), "get_replication_lag", return_value=60.0):
+				self.assertIs(get_connection(), primary_db)
+
+			# broken replication
+			frappe.cache.delete_value(REPLICA_LAG_CACHE_KEY)
+			with patch.object(type(frappe.db), "get_replication_lag", return_value=None):
+				self.assertIs(get_connection(), primary_db)
+
+			# lag can't be checked, e.g. missing privilege
+			frappe.cache.delete_value(REPLICA_LAG_CACHE_KEY)
+			with patch.object(type(frappe.db), "get_replication_lag", side_effect=Exception("access denied")):
+				self.assertIsNot(get_connection(), primary_db)
+
+			# reads stick to primary after a write
+			frappe.cache.delete_value(REPLICA_LAG_CACHE_KEY)
+			with patch.object(type(frappe.db), "get_replication_lag", return_value=0.5):
+				bio = frappe.db.get_value("User", "Administrator", "bio")
+				frappe.db.set_value("User", "Administrator", "bio", "replica test")
+				self.assertIs(get_connection(), primary_db)
+
+				# even after they are committed
+				frappe.db.commit()
+				self.assertIs(get_connection(), primary_db)
+				frappe.db.set_value("User", "Administrator", "bio", bio)
+				frappe.db.commit()
+
+
+@unimplemented_for(db_type_is.SQLITE)
+class TestConnectionPool(IntegrationTestCase):
+	def setUp(self):
+		pool.clear()
+		pool.stats = PoolStats()
+
+	def tearDown(self):
+		pool.clear()
+
+	def get_db(self):
+		conf = frappe.conf
+		return get_db(
+			socket=conf.db_socket,
+			host=conf.db_host,
+			port=conf.db_port,
+			user=conf.db_user,
+			password=conf.db_password,
+			cur_db_name=conf.db_name,
+		)
+
+	def test_connection_reuse(self):
+		with patch.dict(frappe.conf, {"db_pool_size": 1}):
+			db = self.get_db()
+			db.connect()
+			conn = db._conn
+			db.close()
+			self.assertEqual(pool.get_stats()["idle"], 1)
+
+			db = self.get_db()
+			db.connect()
+			self.assertIs(db._conn, conn)
+
+			# pool is empty while connection is in use
+			other_db = self.get_db()
+			other_db.connect()
+			self.assertIsNot(other_db._conn, conn)
+
+			# only `db_pool_size` connections are kept
+			db.close()
+			other_db.close()
+			self.assertEqual(
+				pool.get_stats(), {"created": 2, "reused": 1, "discarded": 1, "health_checks": 0, "idle": 1}
+			)
+
+	def test_rollback_on_release(self):
+		with patch.dict(frappe.conf, {"db_pool_size": 1}):
+			db = self.get_db()
+			db.sql("insert into `tabNote` (name, title) values ('pooled-note', 'pooled-note')")
+			db.close()
+
+			db = self.get_db()
+			self.assertFalse(db.sql("select name from `tabNote` where name = 'pooled-note'"))
+			db.close()
+
+	def test_expired_and_broken_connections(self):
+		with patch.dict(frappe.conf, {"db_pool_size": 1}):
+			db = self.get_db()
+			db.connect()
+			conn = db._conn
+			db.close()
+
+			with patch.object(type(db), "is_connection_usable", return_value=False):
+				with patch("frappe.database.pool.HEALTH_CHECK_INTERVAL", -1):
+					db = self.get_db()
+					db.connect()
+			self.assertIsNot(db._conn, conn)
+			conn = db._conn
+			db.close()
+
+			with patch.dict(frappe.conf, {"db_pool_max_lifetime": -1}):
+				db = self.get_db()
+				db.connect()
+			self.assertIsNot(db._conn, conn)
+			db.close()
+
+	@run_only_if(db_type_is.MARIADB)
+	def test_session_timeout_kept_on_release(self):
+		with (
+			patch.dict(frappe.conf, {"db_pool_size": 1}),
+			patch("frappe.database.database.get_query_execution_timeout", return_value=10),
+		):
+			db = self.get_db()
+			db.connect()
+			db.close()
+
+			db = self.get_db()
+			with patch.object(type(db), "set_execution_timeout") as set_execution_timeout:
+				db.connect()
+			set_execution_timeout.assert_not_called()
+			self.assertEqual(float(db.sql("select @@max_statement_time")[0][0]), 10)
+			db.close()
+
 
 class TestConcurrency(IntegrationTestCase):
 	@timeout(5, "There shouldn't be any lock wait")
@@ -1181,6 +1416,24 @@ def bad_nested_hook(doc, *args, **kwargs):
 
 
 class TestSqlIterator(IntegrationTestCase):
+	def test_as_columns(self):
+		query = "select name, email, enabled from `tabUser` where name in ('Administrator', 'Guest') order by name"
+		rows = frappe.db.sql(query, as_dict=True)
+
+		columns = frappe.db.sql(query, as_columns=True)
+		self.assertEqual(list(columns), ["name", "email", "enabled"])
+		self.assertEqual(columns.name, [row.name for row in rows])
+		self.assertEqual(columns.enabled, [row.enabled for row in rows])
+
+		self.assertEqual(
+			frappe.db.sql(f"{query} limit 0", as_columns=True), {"name": [], "email": [], "enabled": []}
+		)
+
+		columns = frappe.get_all(
+			"User", filters={"name": ("in", ["Administrator", "Guest"])}, fields=["name"], as_columns=True
+		)
+		self.assertEqual(sorted(columns.name), ["Administrator", "Guest"])
+
 	def test_db_sql_iterator(self):
 		test_queries = [
 			"select * from `tabCountry` order by name",
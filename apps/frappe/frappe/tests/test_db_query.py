@@ -11,7 +11,12 @@ from frappe.custom.doctype.property_setter.property_setter import make_property_
 from frappe.database.utils import DefaultOrderBy
 from frappe.desk.reportview import get_filters_cond
 from frappe.handler import execute_cmd
-from frappe.model.db_query import DatabaseQuery, get_between_date_filter
+from frappe.model.db_query import (
+	DatabaseQuery,
+	get_between_date_filter,
+	sanitize_field,
+	sanitize_order_by_and_group_by,
+)
 from frappe.permissions import add_user_permission, clear_user_permissions_for_doctype
 from frappe.query_builder import Field
 from frappe.tests import IntegrationTestCase
@@ -605,6 +610,131 @@ class TestDBQuery(IntegrationTestCase):
 		self.assertFalse({"name": "Level 2 B"} in data)
 		update("Nested DocType", "All", 0, "if_owner", 1)
 
+	def test_user_permission_subqueries(self):
+		frappe.set_user("Administrator")
+		create_nested_doctype()
+		create_nested_doctype_records()
+		clear_user_permissions_for_doctype("Nested DocType")
+		add_user_permission("Nested DocType", "Level 1 A", "test2@example.com")
+		add_user_permission("Nested DocType", "Level 1 B", "test2@example.com", applicable_for="ToDo")
+		update("Nested DocType", "All", 0, "if_owner", 0)
+		self.addCleanup(update, "Nested DocType", "All", 0, "if_owner", 1)
+
+		def get_names():
+			with self.set_user("test2@example.com"):
+				return (
+					sorted(DatabaseQuery("Nested DocType").execute(pluck="name")),
+					sorted(
+						frappe.qb.get_query("Nested DocType", fields=["name"], ignore_permissions=False).run(
+							pluck=True
+						)
+					),
+				)
+
+		inlined = get_names()
+		with patch.dict(frappe.local.conf, {"permission_subquery_threshold": 1}):
+			with self.set_user("test2@example.com"):
+				self.assertIn(
+					"`tabUser Permission`", DatabaseQuery("Nested DocType").build_match_conditions()
+				)
+			self.assertEqual(get_names(), inlined)
+
+		self.assertIn("Level 2 A", inlined[0])
+		self.assertNotIn("Level 1 B", inlined[0])
+		self.assertEqual(inlined[0], inlined[1])
+
+	def test_compiled_permission_conditions(self):
+		frappe.set_user("Administrator")
+		create_nested_doctype()
+		create_nested_doctype_records()
+		clear_user_permissions_for_doctype("Nested DocType")
+		add_user_permission("Nested DocType", "Level 1 A", "test2@example.com")
+		update("Nested DocType", "All", 0, "if_owner", 0)
+		self.addCleanup(update, "Nested DocType", "All", 0, "if_owner", 1)
+
+		def get_names():
+			with self.set_user("test2@example.com"):
+				return (
+					sorted(DatabaseQuery("Nested DocType").execute(pluck="name")),
+					sorted(
+						frappe.qb.get_query("Nested DocType", fields=["name"], ignore_permissions=False).run(
+							pluck=True
+						)
+					),
+				)
+
+		names = get_names()
+		self.assertNotIn("Level 1 B", names[0])
+
+		# conditions are compiled once and reused by later queries
+		with (
+			patch.object(DatabaseQuery, "compile_match_conditions") as compile_match_conditions,
+			patch.object(frappe.share, "get_shared") as get_shared,
+		):
+			self.assertEqual(get_names(), names)
+			compile_match_conditions.assert_not_called()
+			get_shared.assert_not_called()
+
+		# changes to user permissions and shares invalidate them
+		add_user_permission("Nested DocType", "Level 1 B", "test2@example.com")
+		names = get_names()
+		self.assertIn("Level 1 B", names[0])
+		self.assertEqual(names[0], names[1])
+
+		clear_user_permissions_for_doctype("Nested DocType", "test2@example.com")
+		add_user_permission("Nested DocType", "Level 1 A", "test2@example.com")
+		frappe.share.add_docshare(
+			"Nested DocType", "Level 2 B", "test2@example.com", flags={"ignore_share_permission": True}
+		)
+		names = get_names()
+		self.assertIn("Level 2 B", names[0])
+		self.assertNotIn("Level 1 B", names[0])
+		self.assertEqual(names[0], names[1])
+
+		# conditions compiled while they are being invalidated aren't reused
+		def compile_stale():
+			frappe.permissions.clear_compiled_permission_conditions("test2@example.com")
+			return "stale"
+
+		key = ("_Test", "Nested DocType")
+		get_compiled = frappe.permissions.get_compiled_permission_conditions
+		self.assertEqual(get_compiled("test2@example.com", key, compile_stale), "stale")
+		self.assertEqual(get_compiled("test2@example.com", key, lambda: "fresh"), "fresh")
+		self.assertEqual(get_compiled("test2@example.com", key, lambda: "unused"), "fresh")
+
+		# compiled conditions don't stay in redis forever
+		name = f"{frappe.permissions.COMPILED_CONDITIONS_CACHE_PREFIX}test2@example.com"
+		self.assertGreater(frappe.cache.ttl(frappe.cache.make_key(name)), 0)
+		frappe.permissions.clear_compiled_permission_conditions("test2@example.com")
+		self.assertFalse(frappe.cache.exists(name))
+
+	def test_cursor_pagination(self):
+		from frappe.database.pagination import InvalidCursor, get_keyset_order, get_next_cursor
+
+		order_by = "modified desc"
+		keyset_order = get_keyset_order("Role", order_by)
+		self.assertEqual(keyset_order, [("modified", "desc"), ("name", "desc")])
+		expected = frappe.get_all("Role", order_by="modified desc, name desc", pluck="name")
+
+		for get_page in (
+			lambda cursor: frappe.get_all(
+				"Role", fields=["name", "modified"], order_by=order_by, limit=5, cursor=cursor
+			),
+			lambda cursor: DatabaseQuery("Role").execute(
+				fields=["name", "modified"], order_by=order_by, limit=5, cursor=cursor
+			),
+		):
+			names, cursor = [], ""
+			while cursor is not None:
+				page = get_page(cursor)
+				names.extend(row.name for row in page)
+				cursor = get_next_cursor(keyset_order, page, 5)
+			self.assertEqual(names, expected)
+
+		# NULL values can't be compared, sort order has to be changed to paginate
+		self.assertRaises(InvalidCursor, frappe.get_all, "Role", order_by="home_page desc", cursor="")
+		self.assertRaises(InvalidCursor, frappe.get_all, "Role", order_by=order_by, cursor="invalid")
+
 	def test_filter_sanitizer(self):
 		self.assertRaises(
 			frappe.DataError,
@@ -721,6 +851,27 @@ class TestDBQuery(IntegrationTestCase):
 				order_by="timestamp(modified)",
 			)
 
+	def test_sanitizer_cache(self):
+		def get_list():
+			return DatabaseQuery("DocType").execute(
+				fields=["name", "count(name) as count"],
+				order_by="`tabDocType`.name asc",
+				group_by="name",
+			)
+
+		get_list()
+		fields_before = sanitize_field.cache_info()
+		order_by_before = sanitize_order_by_and_group_by.cache_info()
+
+		get_list()
+		self.assertGreaterEqual(sanitize_field.cache_info().hits - fields_before.hits, 2)
+		self.assertGreaterEqual(sanitize_order_by_and_group_by.cache_info().hits - order_by_before.hits, 2)
+		self.assertEqual(sanitize_field.cache_info().misses, fields_before.misses)
+
+		# tables used in order by are still checked against the query
+		with self.assertRaises(frappe.ValidationError):
+			DatabaseQuery("ToDo").execute(fields=["name"], order_by="`tabDocType`.name asc")
+
 	def test_of_not_of_descendant_ancestors(self):
 		frappe.set_user("Administrator")
 		clear_user_permissions_for_doctype("Nested DocType")
@@ -1239,6 +1390,23 @@ class TestReportView(IntegrationTestCase):
 		self.assertIsInstance(count, int)
 		self.assertLessEqual(count, limit)
 
+	def test_cached_count(self):
+		frappe.local.request = frappe._dict()
+		frappe.local.request.method = "GET"
+		frappe.local.form_dict = frappe._dict(
+			{"doctype": "ToDo", "filters": {"description": "_Test cached count"}, "distinct": "false"}
+		)
+
+		count = execute_cmd("frappe.desk.reportview.get_count")
+		frappe.db.sql(
+			"insert into tabToDo (name, description) values ('_Test cached count', '_Test cached count')"
+		)
+		# raw SQL writes aren't tracked, cached count is reused
+		self.assertEqual(execute_cmd("frappe.desk.reportview.get_count"), count)
+
+		frappe.get_doc(doctype="ToDo", description="_Test cached count").insert()
+		self.assertEqual(execute_cmd("frappe.desk.reportview.get_count"), count + 2)
+
 	def test_reportview_get(self):
 		user = frappe.get_doc("User", "test@example.com")
 		add_child_table_to_blog_post()
@@ -1,5 +1,14 @@
+from unittest.mock import patch
+
 import frappe
-from frappe.deferred_insert import deferred_insert, save_to_db
+from frappe.deferred_insert import (
+	deferred_insert,
+	failed_queue_prefix,
+	get_deferred_insert_stats,
+	queue_prefix,
+	retry_failed_inserts,
+	save_to_db,
+)
 from frappe.tests import IntegrationTestCase
 
 
@@ -16,3 +25,35 @@ class TestDeferredInsert(IntegrationTestCase):
 		frappe.clear_cache()  # deferred_insert cache keys are supposed to be persistent
 		save_to_db()
 		self.assertTrue(frappe.db.exists("Route History", route_history))
+
+	def test_bulk_deferred_insert(self):
+		self.assertIn("Route History", frappe.get_hooks("bulk_deferred_insert"))
+		routes = [{"route": frappe.generate_hash(), "user": "Administrator"} for _ in range(5)]
+		deferred_insert("Route History", routes[:2])
+		deferred_insert("Route History", routes[2])
+		deferred_insert("Route History", routes[3:])
+
+		save_to_db()
+		for route in routes:
+			self.assertTrue(frappe.db.exists("Route History", route))
+
+		stats = get_deferred_insert_stats()["Route History"]
+		self.assertEqual(stats["queued"], 0)
+		self.assertGreaterEqual(stats["last_run"]["inserted"], 5)
+
+	def test_failed_deferred_insert(self):
+		self.addCleanup(frappe.cache.delete_value, [f"{queue_prefix}ToDo", f"{failed_queue_prefix}ToDo"])
+
+		# description is mandatory
+		deferred_insert("ToDo", [{"description": None}, {"description": None}])
+		save_to_db()
+		self.assertEqual(get_deferred_insert_stats()["ToDo"]["failed"], 2)
+
+		retry_failed_inserts("ToDo")
+		stats = get_deferred_insert_stats()["ToDo"]
+		self.assertEqual((stats["queued"], stats["failed"]), (2, 0))
+
+		# only the most recent failed records are kept
+		with patch("frappe.deferred_insert.MAX_FAILED_RECORDS", 1):
+			save_to_db()
+		self.assertEqual(get_deferred_insert_stats()["ToDo"]["failed"], 1)
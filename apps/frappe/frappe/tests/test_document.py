@@ -66,6 +66,20 @@ class TestDocument(IntegrationTestCase):
 		self.assertEqual(d.send_reminder, 1)
 		return d
 
+	def test_get_docs(self):
+		names = frappe.get_all("User", pluck="name", limit=5)
+		tables = len(frappe.get_meta("User").get_table_fields())
+		frappe.get_docs("User", names)  # warm up meta
+
+		with self.assertQueryCount(1 + tables):
+			docs = frappe.get_docs("User", list(reversed(names)))
+
+		self.assertEqual([doc.name for doc in docs], list(reversed(names)))
+		for doc in docs:
+			self.assertEqual(doc.as_dict(), frappe.get_doc("User", doc.name).as_dict())
+
+		self.assertRaises(frappe.DoesNotExistError, frappe.get_docs, "User", [names[0], "not-a-user"])
+
 	def test_website_route_default(self):
 		default = frappe.generate_hash()
 		child_table = new_doctype(default=default, istable=1).insert().name
@@ -661,16 +675,41 @@ class TestDocumentWebView(IntegrationTestCase):
 
 				yield doc
 
-		bulk_insert(doctype, doc_generator(), chunk_size=5)
-
-		all_docs = set(frappe.get_all(doctype, pluck="name"))
-		all_child_docs = set(
-			frappe.get_all(
-				child_doctype, filters={"parenttype": doctype, "parentfield": child_field}, pluck="name"
-			)
-		)
-		self.assertEqual(sent_docs - all_docs, set(), "All docs should be inserted")
-		self.assertEqual(sent_child_docs - all_child_docs, set(), "All child docs should be inserted")
+		for stream in (False, True):
+			with self.subTest(stream=stream):
+				bulk_insert(doctype, doc_generator(), chunk_size=5, stream=stream)
+
+				all_docs = set(frappe.get_all(doctype, pluck="name"))
+				all_child_docs = set(
+					frappe.get_all(
+						child_doctype,
+						filters={"parenttype": doctype, "parentfield": child_field},
+						pluck="name",
+					)
+				)
+				self.assertEqual(sent_docs - all_docs, set(), "All docs should be inserted")
+				self.assertEqual(sent_child_docs - all_child_docs, set(), "All child docs should be inserted")
+
+	def test_multi_row_child_inserts(self):
+		roles = frappe.get_all("Role", filters={"disabled": 0}, pluck="name", limit=10)
+		doc = frappe.new_doc("Role Profile", role_profile=frappe.generate_hash())
+		doc.flags.ignore_version = True
+		for role in roles[:5]:
+			doc.append("roles", {"role": role})
+
+		# parent + one query for all child rows
+		with self.assertQueryCount(2, query_type=("insert",)):
+			doc.insert()
+
+		for role in roles[5:]:
+			doc.append("roles", {"role": role})
+
+		with self.assertQueryCount(1, query_type=("insert",)):
+			doc.save()
+
+		doc.reload()
+		self.assertEqual([d.role for d in doc.roles], roles)
+		self.assertEqual([d.idx for d in doc.roles], list(range(1, len(roles) + 1)))
 
 
 class TestLazyDocument(IntegrationTestCase):
@@ -3,7 +3,8 @@
 
 import email
 import re
-from unittest.mock import patch
+import smtplib
+from unittest.mock import MagicMock, patch
 
 import requests
 
@@ -15,6 +16,7 @@ from frappe.email.doctype.email_queue.email_queue import QueueBuilder
 from frappe.query_builder.utils import db_type_is
 from frappe.tests import IntegrationTestCase
 from frappe.tests.test_query_builder import run_only_if
+from frappe.utils import add_to_date, now_datetime
 
 EXTRA_TEST_RECORD_DEPENDENCIES = ["Email Account"]
 
@@ -82,6 +84,73 @@ class TestEmail(IntegrationTestCase):
 		self.assertEqual(len(queue_recipients), 2)
 		self.assertTrue("Unsubscribe" in frappe.safe_decode(frappe.flags.sent_mail))
 
+	def test_flush_with_email_sender(self):
+		from frappe.email.queue import flush
+
+		for idx in range(3):
+			frappe.sendmail(
+				recipients=[f"test{idx}@example.com"],
+				sender="admin@example.com",
+				reference_doctype="User",
+				reference_name="Administrator",
+				subject="Testing Email Sender",
+				message="This mail is queued!",
+			)
+
+		smtp_server = MagicMock()
+		frappe.flags.testing_email = True
+		try:
+			with (
+				patch("frappe.email.sender.SMTPServer", return_value=smtp_server) as SMTPServer,
+				patch.dict(frappe.conf, {"email_sender_threads": 2, "smtp_sessions_per_account": 1}),
+			):
+				flush()
+		finally:
+			frappe.flags.testing_email = False
+
+		# one session is reused for all emails
+		self.assertEqual(SMTPServer.call_count, 1)
+		self.assertEqual(smtp_server.session.sendmail.call_count, 3)
+		self.assertEqual(frappe.db.count("Email Queue", {"status": "Sent"}), 3)
+		self.assertEqual(frappe.db.count("Email Queue Recipient", {"status": ("!=", "Sent")}), 0)
+
+		# failed sends are retried later
+		frappe.db.set_value("Email Queue Recipient", {"recipient": "test0@example.com"}, "status", "Not Sent")
+		frappe.db.set_value("Email Queue", {"status": "Sent"}, "status", "Not Sent")
+		smtp_server.session.sendmail.side_effect = smtplib.SMTPRecipientsRefused({})
+		frappe.flags.testing_email = True
+		try:
+			with patch("frappe.email.sender.SMTPServer", return_value=smtp_server):
+				flush()
+		finally:
+			frappe.flags.testing_email = False
+
+		self.assertEqual(frappe.db.count("Email Queue", {"status": "Not Sent", "retry": 1}), 1)
+
+	def test_claim_renewal(self):
+		from frappe.email.queue import claim_queue, renew_claim, retry_sending_emails
+
+		frappe.sendmail(
+			recipients=["test@example.com"],
+			sender="admin@example.com",
+			subject="Testing Email Queue Claims",
+			message="This mail is queued!",
+		)
+		claimed_at = add_to_date(now_datetime(), minutes=-20)
+		batch = claim_queue(claimed_at)
+		self.assertEqual(len(batch), 1)
+		name = batch[0].name
+		self.assertEqual(frappe.db.get_value("Email Queue", name, "status"), "Sending")
+
+		# stuck claim is put back in queue, worker that claimed it can't send it anymore
+		retry_sending_emails()
+		self.assertEqual(frappe.db.get_value("Email Queue", name, "status"), "Not Sent")
+		self.assertFalse(renew_claim(name, claimed_at))
+
+		claimed_at = now_datetime()
+		claim_queue(claimed_at)
+		self.assertTrue(renew_claim(name, claimed_at))
+
 	def test_cc_header(self):
 		# test if sending with cc's makes it into header
 		frappe.sendmail(
@@ -123,6 +123,21 @@ class TestPerformance(IntegrationTestCase):
 		with self.assertQueryCount(0):
 			doc.get_invalid_links()
 
+	def test_batched_link_validation(self):
+		"""Links of parent and all child rows should be resolved with one query per linked doctype"""
+		doc = frappe.get_doc("User", "Administrator")
+		doc._validate_links()  # warm up meta
+
+		links = doc.get_links_to_prefetch()
+		for d in doc.get_all_children():
+			links.extend(d.get_links_to_prefetch())
+		linked_doctypes = {doctype for doctype, *_ in links}
+		self.assertGreater(len(links), len(linked_doctypes))
+
+		frappe.db.value_cache.clear()
+		with self.assertQueryCount(len(linked_doctypes)):
+			doc._validate_links()
+
 	@retry(
 		retry=retry_if_exception_type(AssertionError),
 		stop=stop_after_attempt(3),
@@ -347,6 +347,23 @@ class TestQuery(IntegrationTestCase):
 			):
 				frappe.qb.get_query("User", order_by=order_by_str).get_sql()
 
+	def test_parsing_cache(self):
+		from frappe.database.query import _split_group_by, _split_order_by, _split_select_fields
+
+		def get_sql():
+			return frappe.qb.get_query(
+				"User", fields="name, email", order_by="name asc, email desc", group_by="name, email"
+			).get_sql()
+
+		parsers = (_split_select_fields, _split_order_by, _split_group_by)
+		sql = get_sql()
+		before = [parser.cache_info() for parser in parsers]
+
+		self.assertEqual(get_sql(), sql)
+		for parser, info in zip(parsers, before, strict=True):
+			self.assertEqual(parser.cache_info().hits, info.hits + 1)
+			self.assertEqual(parser.cache_info().misses, info.misses)
+
 	def test_aliasing(self):
 		user_doctype = frappe.qb.DocType("User")
 		self.assertEqual(
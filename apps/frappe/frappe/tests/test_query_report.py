@@ -3,7 +3,7 @@
 
 import frappe
 import frappe.utils
-from frappe.desk.query_report import build_xlsx_data, export_query, run
+from frappe.desk.query_report import build_xlsx_data, export_query, normalize_result, run
 from frappe.tests import IntegrationTestCase
 from frappe.utils.xlsxutils import make_xlsx
 
@@ -131,6 +131,14 @@ class TestQueryReport(IntegrationTestCase):
 
 		frappe.delete_doc("Report", REPORT_NAME, delete_permanently=True)
 
+	def test_normalize_result(self):
+		columns = [{"fieldname": "name"}, {"fieldname": "count"}]
+		expected = [{"name": "a", "count": 1}, {"name": "b", "count": 2}]
+
+		self.assertEqual(normalize_result([("a", 1), ("b", 2)], columns), expected)
+		self.assertEqual(normalize_result({"name": ["a", "b"], "count": [1, 2]}, columns), expected)
+		self.assertEqual(normalize_result(expected, columns), expected)
+
 	def test_report_for_duplicate_column_names(self):
 		"""Test report with duplicate column names"""
 
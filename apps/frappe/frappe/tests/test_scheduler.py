@@ -6,14 +6,17 @@ from unittest.mock import patch
 import frappe
 from frappe.core.doctype.scheduled_job_type.scheduled_job_type import ScheduledJobType, sync_jobs
 from frappe.tests import IntegrationTestCase
-from frappe.utils import add_days, get_datetime
+from frappe.utils import add_days, add_to_date, get_datetime, now_datetime
 from frappe.utils.doctor import purge_pending_jobs
 from frappe.utils.scheduler import (
 	DEFAULT_SCHEDULER_TICK,
+	NEXT_DUE_CACHE_KEY,
 	enqueue_events,
 	is_dormant,
+	is_site_due,
 	schedule_jobs_based_on_activity,
 	sleep_duration,
+	update_timetable,
 )
 
 
@@ -51,6 +54,22 @@ class TestScheduler(IntegrationTestCase):
 			enqueued_jobs,
 		)
 
+	def test_site_timetable(self):
+		current_time = now_datetime()
+		frappe.cache.delete_value(NEXT_DUE_CACHE_KEY)
+		self.assertTrue(is_site_due())
+
+		update_timetable(add_to_date(current_time, minutes=10), current_time)
+		self.assertFalse(is_site_due())
+		self.assertLessEqual(frappe.cache.ttl(frappe.cache.make_key(NEXT_DUE_CACHE_KEY)), 10 * 60)
+
+		# changes to job types are picked up in next tick
+		get_test_job().save()
+		self.assertTrue(is_site_due())
+
+		update_timetable(add_to_date(current_time, seconds=-1), current_time)
+		self.assertTrue(is_site_due())
+
 	def test_queue_peeking(self):
 		job = get_test_job()
 
@@ -209,6 +209,140 @@ def enqueue(
 	return enqueue_call()
 
 
+def enqueue_many(
+	method: str | Callable,
+	kwargs_list: list[dict],
+	queue: str = "default",
+	timeout: int | None = None,
+	chunk_size: int | None = None,
+	is_async: bool = True,
+	now: bool = False,
+	enqueue_after_commit: bool = False,
+	*,
+	on_success: Callable | None = None,
+	on_failure: Callable | None = None,
+	at_front: bool = False,
+) -> list[Job] | None:
+	"""
+	Enqueue `method` once for every set of keyword arguments in `kwargs_list`, all jobs are pushed to
+	redis in a single pipeline.
+
+	With `chunk_size`, arguments are split in chunks and each job calls `method` for a whole chunk of
+	them (see `run_job_batch`), so the cost of setting up a job is paid once per chunk. Failure of one call
+	doesn't affect others in the chunk. `timeout` applies to the whole chunk.
+
+	:param method: method string or method object
+	:param kwargs_list: list of keyword arguments, `method` is called once with each of them
+	:param queue: should be either long, default or short
+	:param timeout: should be set according to the functions
+	:param chunk_size: number of calls made by each job, one job per call if not set
+	:param is_async: if is_async=False, the method is executed immediately, else via a worker
+	:param now: if now=True, the calls are made right away via frappe.call()
+	:param enqueue_after_commit: if True, the jobs will be enqueued after the current transaction is
+	committed
+	:param on_success: Success callback, called for every job
+	:param on_failure: Failure callback, called for every job
+	:param at_front: Enqueue the jobs at the front of the queue or not
+	"""
+	if now:
+		return [frappe.call(method, **kwargs) for kwargs in kwargs_list]
+
+	if not kwargs_list:
+		return []
+
+	if isinstance(method, Callable):
+		method_name = f"{method.__module__}.{method.__qualname__}"
+	else:
+		method_name = method
+
+	if chunk_size:
+		job_kwargs = [
+			{"method": method, "kwargs_list": kwargs_list[i : i + chunk_size]}
+			for i in range(0, len(kwargs_list), chunk_size)
+		]
+		method = "frappe.utils.background_jobs.run_job_batch"
+	else:
+		job_kwargs = kwargs_list
+
+	q = get_queue(queue, is_async=is_async)
+	_check_queue_size(q, new_jobs=len(job_kwargs))
+
+	if not timeout:
+		timeout = get_queues_timeout().get(queue) or 300
+
+	jobs = [
+		Queue.prepare_data(
+			"frappe.utils.background_jobs.execute_job",
+			kwargs={
+				"site": frappe.local.site,
+				"user": frappe.session.user,
+				"method": method,
+				"event": None,
+				"job_name": method_name,
+				"is_async": is_async,
+				"kwargs": kwargs,
+			},
+			timeout=timeout,
+			on_success=Callback(func=on_success) if on_success else None,
+			on_failure=Callback(func=on_failure or truncate_failed_registry),
+			at_front=at_front,
+			failure_ttl=frappe.conf.get("rq_job_failure_ttl") or RQ_JOB_FAILURE_TTL,
+			result_ttl=frappe.conf.get("rq_results_ttl") or RQ_RESULTS_TTL,
+			job_id=create_job_id(),
+		)
+		for kwargs in job_kwargs
+	]
+
+	def enqueue_call():
+		return q.enqueue_many(jobs)
+
+	if enqueue_after_commit:
+		frappe.db.after_commit.add(enqueue_call)
+		return
+
+	return enqueue_call()
+
+
+def run_job_batch(method: str | Callable, kwargs_list: list[dict]) -> dict:
+	"""Call `method` with each set of keyword arguments, used by `enqueue_many` with `chunk_size`.
+
+	Every call is made in its own savepoint, changes of a failing call are rolled back and the error is
+	logged without affecting other calls. Deadlocks and lock wait timeouts roll back the whole transaction
+	in MariaDB, those are raised so that the whole batch is retried by `execute_job`.
+
+	Commit and rollback are disabled while calling `method`, committing would release the savepoint. Whole
+	chunk is committed together by `execute_job`."""
+	if isinstance(method, str):
+		method_name = method
+		method = frappe.get_attr(method)
+	else:
+		method_name = f"{method.__module__}.{method.__qualname__}"
+
+	save_point = "job_batch_item"
+	failed = 0
+	for kwargs in kwargs_list:
+		frappe.db.savepoint(save_point)
+		try:
+			frappe.db._disable_transaction_control += 1
+			method(**kwargs)
+		except frappe.RetryBackgroundJobError:
+			raise
+		except Exception as e:
+			if isinstance(e, frappe.db.InternalError) and (
+				frappe.db.is_deadlocked(e) or frappe.db.is_timedout(e)
+			):
+				raise
+			frappe.db.rollback(save_point=save_point)
+			frappe.log_error(title=method_name)
+			failed += 1
+		else:
+			frappe.db.release_savepoint(save_point)
+		finally:
+			frappe.db._disable_transaction_control -= 1
+
+	return {"succeeded": len(kwargs_list) - failed, "failed": failed}
+
+
 def enqueue_doc(doctype, name=None, method=None, queue="default", timeout=300, now=False, **kwargs):
 	"""
 	Enqueue a method to be run on a document
@@ -236,13 +370,51 @@ def run_doc_method(doctype, name, doc_method, **kwargs):
 	getattr(frappe.get_doc(doctype, name), doc_method)(**kwargs)
 
 
+class WarmContext:
+	"""Site context kept warm between consecutive jobs of the same site, used by no-fork workers.
+
+	Site config is read from the process' cache (refreshed every minute) and the database connection of
+	previous job is reused by next job of the same site. It's rolled back and reset after every job and
+	checked before being reused, see `frappe.database.pool`. Only connection of the last site is kept
+	unless `db_pool_size` is set. Everything else in `frappe.local` is still reset after every job.
+
+	Enable it by setting `FRAPPE_BACKGROUND_WORKERS_WARM_CONTEXT` env variable along with
+	`FRAPPE_BACKGROUND_WORKERS_NOFORK`."""
+
+	def __init__(self):
+		self.site = None
+
+	def init_site(self, site: str):
+		from frappe.database.pool import pool
+
+		frappe.init(site, force=True, cached_config=True)
+		if not cint(frappe.conf.db_pool_size):
+			if site != self.site:
+				pool.clear()
+			frappe.local.conf.db_pool_size = 1
+
+		self.site = site
+		frappe.connect()
+
+
+# Set by no-fork workers in warm context mode
+_warm_context: WarmContext | None = None
+
+
+def _init_site_for_job(site: str):
+	if _warm_context:
+		_warm_context.init_site(site)
+	else:
+		frappe.init(site, force=True)
+		frappe.connect()
+
+
 def execute_job(site, method, event, job_name, kwargs, user=None, is_async=True, retry=0):
 	"""Executes job in a worker, performs commit/rollback and logs if there is any error"""
 	retval = None
 
 	if is_async:
-		frappe.init(site, force=True)
-		frappe.connect()
+		_init_site_for_job(site)
 		if os.environ.get("CI"):
 			from frappe.tests.utils import toggle_test_mode
 
@@ -307,8 +479,7 @@ def execute_job(site, method, event, job_name, kwargs, user=None, is_async=True,
 
 	finally:
 		if not hasattr(frappe.local, "site"):
-			frappe.init(site, force=True)
-			frappe.connect()
+			_init_site_for_job(site)
 		for after_job_task in frappe.get_hooks("after_job"):
 			frappe.call(after_job_task, method=method_name, kwargs=kwargs, result=retval)
 		frappe.local.job.after_job.run()
@@ -384,7 +555,11 @@ class FrappeWorkerNoFork(FrappeWorker):
 		self.push_exc_handler(self.no_fork_exception_handler)
 
 	def work(self, *args, **kwargs):
+		global _warm_context
+
 		kwargs["max_jobs"] = RQ_MAX_JOBS + random.randint(0, RQ_MAX_JOBS_JITTER)
+		if sbool(os.environ.get("FRAPPE_BACKGROUND_WORKERS_WARM_CONTEXT", False)):
+			_warm_context = WarmContext()
 		return super().work(*args, **kwargs)
 
 	def execute_job(self, job: "Job", queue: "Queue"):
@@ -720,13 +895,13 @@ def truncate_failed_registry(job, connection, type, value, traceback):
 				job_obj and fail_registry.remove(job_obj, delete_job=True)
 
 
-def _check_queue_size(q: Queue):
+def _check_queue_size(q: Queue, new_jobs: int = 1):
 	max_jobs = cint(frappe.conf.max_queued_jobs) or MAX_QUEUED_JOBS
 	# Workaround for arbitrarily sized benches,
 	# TODO: Some concept of site-based fairness on consumption of queue
 	max_jobs += _site_count() * 50
 
-	if cint(q.count) >= max_jobs:
+	if cint(q.count) + new_jobs > max_jobs:
 		primary_action = {
 			"label": "Monitor System Health",
 			"client_action": "frappe.set_route",
@@ -0,0 +1,148 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""Serialization of values stored in redis cache.
+
+Every value is prefixed with a small header that describes how it was encoded:
+
+	| marker (0x00) | format version | serializer | compressor | payload ... |
+
+This allows changing serializer or compression without flushing the cache, values are always decoded
+using the codec they were written with. Values written before the header was introduced are plain
+pickles, these are still read as is. Values with an unknown format version or codec (e.g. written by
+a newer version of Frappe during a rolling deploy) are treated as cache misses.
+
+Configuration (common_site_config.json):
+	- `cache_serializer`: "pickle" (default) or "auto". "auto" uses orjson for plain dict/list values.
+	- `cache_compression`: "zstd", "lz4" (needs `lz4` package) or "zlib". Disabled by default.
+	- `cache_compression_threshold`: only values larger than this many bytes are compressed.
+"""
+
+import math
+import pickle
+import zlib
+
+import orjson
+
+import frappe
+
+try:
+	from compression import zstd
+except ImportError:
+	zstd = None
+
+try:
+	import lz4.frame as lz4
+except ImportError:
+	lz4 = None
+
+# 5 is faster than default which is 4.
+# Python uses old protocol for backward compatibility, we don't support anything <3.10.
+DEFAULT_PICKLE_PROTOCOL = 5
+
+HEADER_MARKER = 0x00  # Pickles always start with PROTO opcode (0x80), so there's no ambiguity.
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+DEFAULT_COMPRESSION_THRESHOLD = 16 * 1024
+
+PICKLE, JSON = 0, 1
+SERIALIZERS = {"pickle": PICKLE, "auto": JSON}
+
+NO_COMPRESSION, ZLIB, ZSTD, LZ4 = 0, 1, 2, 3
+COMPRESSORS = {"zlib": ZLIB, "zstd": ZSTD, "lz4": LZ4}
+
+# Maximum depth of nested values that are considered for JSON serialization.
+MAX_JSON_DEPTH = 32
+
+
+class UnsupportedFormat(Exception):
+	pass
+
+
+def encode_value(val) -> bytes:
+	"""Serialize value for storing in redis."""
+	conf = getattr(frappe.local, "conf", None) or {}
+
+	serializer = PICKLE
+	if SERIALIZERS.get(conf.get("cache_serializer")) == JSON and _is_plain(val):
+		try:
+			payload = orjson.dumps(val)
+			serializer = JSON
+		except orjson.JSONEncodeError:
+			pass
+
+	if serializer == PICKLE:
+		payload = pickle.dumps(val, protocol=DEFAULT_PICKLE_PROTOCOL)
+
+	compressor = COMPRESSORS.get(conf.get("cache_compression"), NO_COMPRESSION)
+	threshold = conf.get("cache_compression_threshold") or DEFAULT_COMPRESSION_THRESHOLD
+	if compressor and len(payload) > threshold:
+		if compressed := _compress(compressor, payload):
+			payload = compressed
+		else:
+			compressor = NO_COMPRESSION
+
+	return bytes((HEADER_MARKER, FORMAT_VERSION, serializer, compressor)) + payload
+
+
+def decode_value(payload: bytes):
+	"""Deserialize value read from redis, returns `None` if the value can't be decoded by this process."""
+	try:
+		return _decode(payload)
+	except UnsupportedFormat:
+		return None
+
+
+def _decode(payload: bytes):
+	if payload[0] != HEADER_MARKER:
+		return pickle.loads(payload)
+
+	version, serializer, compressor = payload[1:HEADER_SIZE]
+	if version != FORMAT_VERSION:
+		raise UnsupportedFormat(f"Unsupported cache format version: {version}")
+
+	data = memoryview(payload)[HEADER_SIZE:]
+	if compressor:
+		data = _decompress(compressor, data)
+
+	if serializer == PICKLE:
+		return pickle.loads(data)
+	elif serializer == JSON:
+		return orjson.loads(data)
+	raise UnsupportedFormat(f"Unsupported cache serializer: {serializer}")
+
+
+def _compress(compressor: int, data: bytes) -> bytes | None:
+	if compressor == ZSTD and zstd:
+		return zstd.compress(data)
+	elif compressor == LZ4 and lz4:
+		return lz4.compress(data)
+	elif compressor == ZLIB:
+		return zlib.compress(data, 1)
+
+
+def _decompress(compressor: int, data) -> bytes:
+	if compressor == ZSTD and zstd:
+		return zstd.decompress(data)
+	elif compressor == LZ4 and lz4:
+		return lz4.decompress(data)
+	elif compressor == ZLIB:
+		return zlib.decompress(data)
+	raise UnsupportedFormat(f"Unsupported cache compression: {compressor}")
+
+
+def _is_plain(val, depth: int = 0) -> bool:
+	"""Check if value survives a round trip through JSON unchanged."""
+	if depth > MAX_JSON_DEPTH:
+		return False
+
+	value_type = type(val)
+	if value_type is str or value_type is int or value_type is bool or val is None:
+		return True
+	elif value_type is float:
+		return math.isfinite(val)
+	elif value_type is list:
+		return all(_is_plain(v, depth + 1) for v in val)
+	elif value_type is dict:
+		return all(type(k) is str and _is_plain(v, depth + 1) for k, v in val.items())
+	return False
@@ -167,13 +167,26 @@ def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
 	return time_cache_wrapper
 
 
-def redis_cache(ttl: int | None = 3600, user: str | bool | None = None, shared: bool = False) -> Callable:
+def redis_cache(
+	ttl: int | None = 3600,
+	user: str | bool | None = None,
+	shared: bool = False,
+	*,
+	single_flight: bool = False,
+	soft_ttl: int | None = None,
+) -> Callable:
 	"""Decorator to cache method calls and its return values in Redis
 
 	args:
 	        ttl: time to expiry in seconds, defaults to 1 hour
 	        user: `true` should cache be specific to session user.
 	        shared: `true` should cache be shared across sites
+	        single_flight: `true` if only one process should call the function on cache miss, others
+	                wait briefly for the result instead of calling it at the same time.
+	        soft_ttl: seconds after which cached value is stale, stale values are returned as is and
+	                refreshed in background. Implies `single_flight`. Should be lower than `ttl`.
+
+	Note: `None` return values are not cached with `single_flight` or `soft_ttl`.
 	"""
 
 	def wrapper(func: Callable | None = None) -> Callable:
@@ -188,6 +201,17 @@ def redis_cache(ttl: int | None = 3600, user: str | bool | None = None, shared:
 		@wraps(func)
 		def redis_cache_wrapper(*args, **kwargs):
 			func_call_key = f"{func_key}::{hash(__generate_request_cache_key(args, kwargs))}"
+			if single_flight or soft_ttl:
+				return frappe.cache.get_value(
+					func_call_key,
+					generator=lambda: func(*args, **kwargs),
+					user=user,
+					shared=shared,
+					single_flight=True,
+					soft_ttl=soft_ttl,
+					expires_in_sec=getattr(func, "ttl", 3600),
+				)
+
 			cached_val = frappe.cache.get_value(func_call_key, user=user, shared=shared)
 			if cached_val is not None:
 				return cached_val
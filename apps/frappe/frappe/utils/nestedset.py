@@ -273,6 +273,7 @@ class NestedSet(Document):
 		# Clear user permissions cache, otherwise user can't access the new document
 		if frappe.db.exists("User Permission", {"user": frappe.session.user, "allow": self.doctype}):
 			frappe.cache.hdel("user_permissions", frappe.session.user)
+			frappe.permissions.clear_compiled_permission_conditions(frappe.session.user)
 
 	def on_update(self):
 		update_nsm(self)
@@ -1,11 +1,11 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+import hashlib
 import json
-import pickle
 import re
 import threading
 import time
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from contextlib import suppress
 
 import redis
@@ -15,10 +15,22 @@ from redis.exceptions import ResponseError
 
 import frappe
 from frappe.utils import cstr
+from frappe.utils.cache_codec import DEFAULT_PICKLE_PROTOCOL as DEFAULT_PICKLE_PROTOCOL
+from frappe.utils.cache_codec import decode_value, encode_value
 
-# 5 is faster than default which is 4.
-# Python uses old protocol for backward compatibility, we don't support anything <3.10.
-DEFAULT_PICKLE_PROTOCOL = 5
+# Single-flight regeneration of cache values, see `RedisWrapper.get_value`.
+# Lock expires automatically if the process regenerating value dies or takes too long.
+REGENERATE_LOCK_TIMEOUT = 30
+# Others wait this long for the value to be regenerated before running generator themselves.
+REGENERATE_WAIT_TIMEOUT = 3
+REGENERATE_POLL_INTERVAL = 0.05
+
+
+def _related_key(key: bytes | str, suffix: str) -> bytes:
+	"""Key used for storing metadata of another (already prefixed) key."""
+	if isinstance(key, str):
+		key = key.encode()
+	return key + suffix.encode()
 
 
 class RedisearchWrapper(Search):
@@ -61,28 +73,53 @@ class RedisWrapper(redis.Redis):
 
 		return f"{frappe.local.conf.get('db_name')}|{key}".encode()
 
-	def set_value(self, key, val, user=None, expires_in_sec=None, shared=False):
+	def set_value(self, key, val, user=None, expires_in_sec=None, shared=False, *, soft_ttl=None):
 		"""Sets cache value.
 
 		:param key: Cache key
 		:param val: Value to be cached
 		:param user: Prepends key with User
 		:param expires_in_sec: Expire value of this key in X seconds
+		:param soft_ttl: Value is considered fresh for X seconds, see `get_value`
 		"""
 		key = self.make_key(key, user, shared)
 
 		frappe.local.cache[key] = val
 
 		with suppress(redis.exceptions.ConnectionError):
-			self.set(name=key, value=pickle.dumps(val, protocol=DEFAULT_PICKLE_PROTOCOL), ex=expires_in_sec)
+			payload = encode_value(val)
+			if soft_ttl:
+				pipe = self.pipeline()
+				pipe.set(name=key, value=payload, ex=expires_in_sec)
+				pipe.set(name=_related_key(key, "::fresh"), value=1, ex=soft_ttl)
+				pipe.execute()
+			else:
+				self.set(name=key, value=payload, ex=expires_in_sec)
 
-	def get_value(self, key, generator=None, user=None, expires=False, shared=False, *, use_local_cache=True):
+	def get_value(
+		self,
+		key,
+		generator=None,
+		user=None,
+		expires=False,
+		shared=False,
+		*,
+		use_local_cache=True,
+		single_flight=False,
+		soft_ttl=None,
+		expires_in_sec=None,
+	):
 		"""Return cache value. If not found and generator function is
 		        given, call the generator.
 
 		:param key: Cache key.
 		:param generator: Function to be called to generate a value if `None` is returned.
 		:param expires: If the key is supposed to be with an expiry, don't store it in frappe.local
+		:param single_flight: Only one process runs `generator` at a time, others wait briefly for
+		        the regenerated value. Use this for hot keys that are expensive to generate.
+		:param soft_ttl: Value generated by `generator` is considered fresh for X seconds. Stale
+		        values are returned as is and refreshed in background by one of the processes.
+		:param expires_in_sec: Expiry of value generated by `generator`.
 		"""
 		original_key = key
 		key = self.make_key(key, user, shared)
@@ -93,24 +130,156 @@ class RedisWrapper(redis.Redis):
 
 		else:
 			val = None
+			is_fresh = True
 			try:
-				val = self.get(key)
+				if soft_ttl and generator:
+					val, is_fresh = self.pipeline().get(key).exists(_related_key(key, "::fresh")).execute()
+				else:
+					val = self.get(key)
 			except redis.exceptions.ConnectionError:
 				pass
 
 			if val is not None:
-				val = pickle.loads(val)
+				val = decode_value(val)
+				if not is_fresh:
+					self._revalidate(original_key, generator, user, shared, soft_ttl, expires_in_sec)
 
 			if not expires:
 				if val is None and generator:
-					val = generator()
-					self.set_value(original_key, val, user=user, shared=shared)
+					val = self._generate_value(
+						original_key,
+						generator,
+						user=user,
+						shared=shared,
+						single_flight=single_flight or bool(soft_ttl),
+						soft_ttl=soft_ttl,
+						expires_in_sec=expires_in_sec,
+					)
 
 				else:
 					local_cache[key] = val
 
 		return val
 
+	def _get_regenerate_lock(self, key, user=None, shared=False):
+		"""Try to acquire lock for regenerating value of `key`, returns None if it's held by someone else."""
+		lock = self.lock(
+			_related_key(self.make_key(key, user, shared), "::regenerate_lock"),
+			timeout=REGENERATE_LOCK_TIMEOUT,
+		)
+		try:
+			if lock.acquire(blocking=False):
+				return lock
+		except redis.exceptions.ConnectionError:
+			pass
+
+	def _generate_value(
+		self,
+		key,
+		generator,
+		*,
+		user=None,
+		shared=False,
+		single_flight=False,
+		soft_ttl=None,
+		expires_in_sec=None,
+	):
+		lock = None
+		if single_flight and not (lock := self._get_regenerate_lock(key, user, shared)):
+			# Someone else is regenerating the value, wait for it.
+			name = self.make_key(key, user, shared)
+			deadline = time.monotonic() + REGENERATE_WAIT_TIMEOUT
+			with suppress(redis.exceptions.ConnectionError):
+				while time.monotonic() < deadline:
+					time.sleep(REGENERATE_POLL_INTERVAL)
+					if (val := self.get(name)) is not None:
+						val = decode_value(val)
+						frappe.local.cache[name] = val
+						return val
+					if not self.exists(_related_key(name, "::regenerate_lock"), shared=True):
+						break
+
+		try:
+			val = generator()
+			self.set_value(
+				key, val, user=user, shared=shared, expires_in_sec=expires_in_sec, soft_ttl=soft_ttl
+			)
+		finally:
+			if lock:
+				with suppress(redis.exceptions.RedisError):
+					lock.release()
+		return val
+
+	def _revalidate(self, key, generator, user, shared, soft_ttl, expires_in_sec):
+		"""Refresh stale value after current request/job, only one process does this at a time."""
+		if not (lock := self._get_regenerate_lock(key, user, shared)):
+			return
+
+		def refresh():
+			try:
+				self.set_value(
+					key,
+					generator(),
+					user=user,
+					shared=shared,
+					expires_in_sec=expires_in_sec,
+					soft_ttl=soft_ttl,
+				)
+			finally:
+				with suppress(redis.exceptions.RedisError):
+					lock.release()
+
+		if frappe.request and hasattr(frappe.request, "after_response"):
+			frappe.request.after_response.add(refresh)
+		elif frappe.job:
+			frappe.job.after_job.add(refresh)
+		else:
+			refresh()
+
+	def get_values(self, keys, user=None, shared=False) -> dict:
+		"""Return values of multiple keys as `{key: value}` using a single MGET.
+
+		Values found in redis are stored in `frappe.local.cache` like `get_value` does, so
+		subsequent `get_value` calls for these keys don't need a round trip.
+		"""
+		local_cache = frappe.local.cache
+		values = {}
+		to_fetch = {}
+		for key in keys:
+			_key = self.make_key(key, user, shared)
+			if _key in local_cache:
+				values[key] = local_cache[_key]
+			else:
+				values[key] = None
+				to_fetch[_key] = key
+
+		if not to_fetch:
+			return values
+
+		try:
+			fetched = self.mget(list(to_fetch))
+		except redis.exceptions.ConnectionError:
+			return values
+
+		for _key, val in zip(to_fetch, fetched, strict=True):
+			if val is not None:
+				# Note: cache misses are not stored locally, `get_value` might have a generator for them.
+				values[to_fetch[_key]] = local_cache[_key] = decode_value(val)
+
+		return values
+
+	def set_values(self, mapping: dict, user=None, expires_in_sec=None, shared=False):
+		"""Set multiple values in a single round trip, see `set_value`."""
+		local_cache = frappe.local.cache
+		pipeline = self.pipeline(transaction=False)
+		for key, val in mapping.items():
+			_key = self.make_key(key, user, shared)
+			local_cache[_key] = val
+			pipeline.set(name=_key, value=encode_value(val), ex=expires_in_sec)
+
+		with suppress(redis.exceptions.ConnectionError):
+			pipeline.execute()
+
 	def expire_key(self, key, time, *, user=None, shared=False):
 		key = self.make_key(key, user, shared)
 		try:
@@ -202,7 +371,7 @@ class RedisWrapper(redis.Redis):
 
 		# set in redis
 		try:
-			super().hset(_name, key, pickle.dumps(value, protocol=DEFAULT_PICKLE_PROTOCOL), *args, **kwargs)
+			super().hset(_name, key, encode_value(value), *args, **kwargs)
 		except redis.exceptions.ConnectionError:
 			pass
 
@@ -225,7 +394,7 @@ class RedisWrapper(redis.Redis):
 
 	def hgetall(self, name):
 		value = super().hgetall(self.make_key(name))
-		return {key: pickle.loads(value) for key, value in value.items()}
+		return {key: decode_value(value) for key, value in value.items()}
 
 	def hget(self, name, key, generator=None, shared=False):
 		_name = self.make_key(name, shared=shared)
@@ -247,13 +416,62 @@ class RedisWrapper(redis.Redis):
 			pass
 
 		if value is not None:
-			value = pickle.loads(value)
+			value = decode_value(value)
 			local_cache[_name][key] = value
 		elif generator:
 			value = generator()
 			self.hset(name, key, value, shared=shared)
 		return value
 
+	def hget_many(self, name, keys, shared=False) -> dict:
+		"""Return values of multiple keys of a hash as `{key: value}` using a single HMGET."""
+		_name = self.make_key(name, shared=shared)
+		local_cache = frappe.local.cache.setdefault(_name, {})
+
+		values = {key: local_cache.get(key) for key in keys}
+		if not (to_fetch := [key for key in values if key not in local_cache]):
+			return values
+
+		try:
+			fetched = super().hmget(_name, to_fetch)
+		except redis.exceptions.ConnectionError:
+			return values
+
+		for key, value in zip(to_fetch, fetched, strict=True):
+			if value is not None:
+				values[key] = local_cache[key] = decode_value(value)
+		return values
+
+	def hget_names(self, names: list | tuple, key: str, shared=False) -> dict:
+		"""Return value of a common key from multiple hash names as `{name: value}`, run in a
+		single pipeline."""
+		local_cache = frappe.local.cache
+		values = {}
+		to_fetch = {}
+		for name in names:
+			_name = self.make_key(name, shared=shared)
+			if key in local_cache.get(_name, ()):
+				values[name] = local_cache[_name][key]
+			else:
+				values[name] = None
+				to_fetch[_name] = name
+
+		if not to_fetch:
+			return values
+
+		pipeline = self.pipeline(transaction=False)
+		for _name in to_fetch:
+			pipeline.hget(_name, key)
+		try:
+			fetched = pipeline.execute()
+		except redis.exceptions.ConnectionError:
+			return values
+
+		for _name, value in zip(to_fetch, fetched, strict=True):
+			if value is not None:
+				values[to_fetch[_name]] = local_cache.setdefault(_name, {})[key] = decode_value(value)
+		return values
+
 	def hdel(
 		self,
 		name: str,
@@ -427,12 +645,46 @@ class _TrackedConnection(redis.Connection):
 				raise
 
 
-CachedValue = namedtuple("CachedValue", ["value", "expiry"])
+CachedValue = namedtuple("CachedValue", ["value", "expiry", "namespace", "size"], defaults=(None, 0))
 CacheStatistics = namedtuple(
-	"CacheStatistics", ["hits", "misses", "capacity", "used", "utilization", "hit_ratio", "healthy"]
+	"CacheStatistics",
+	["hits", "misses", "capacity", "used", "utilization", "hit_ratio", "healthy", "namespaces"],
+	defaults=(None,),
+)
+NamespaceStatistics = namedtuple(
+	"NamespaceStatistics", ["hits", "misses", "evictions", "capacity", "used", "max_size", "size"]
 )
 _PLACEHOLDER_VALUE = CachedValue(value=None, expiry=-1)
 
+# Keys are grouped in namespaces by prefix. A namespace can use at most the given share of
+# `ClientCache.maxsize` entries and `ClientCache.max_bytes`, so one kind of value (e.g. large meta
+# objects) can't push out everything else.
+CLIENT_CACHE_NAMESPACES = {
+	"meta": (("doctype_meta::", "doctype_form_meta::", "table_columns::"), 0.6),
+	"documents": (("document_cache::",), 0.25),
+	"defaults": (("defaults::",), 0.1),
+	"hooks": (("app_hooks", "installed_app_modules"), 0.05),
+}
+DEFAULT_NAMESPACE = "default"
+
+# Values written using `ClientCache.freeze` along with digest of their serialized form.
+# These are module level so they survive forking and recreating client cache in workers.
+_frozen_values: dict[bytes, tuple] = {}
+
+
+def _digest(payload: bytes) -> bytes:
+	return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+class _ClientCacheNamespace:
+	__slots__ = ("capacity", "evictions", "hits", "max_size", "misses", "size", "used")
+
+	def __init__(self, capacity: int, max_size: int) -> None:
+		self.capacity = capacity
+		self.max_size = max_size
+		self.used = self.size = 0
+		self.hits = self.misses = self.evictions = 0
+
 
 class ClientCache:
 	"""A subset of RedisWrapper that keeps "local" cache across requests.
@@ -451,6 +703,8 @@ class ClientCache:
 		  there but not go crazy with caching large values in this cache.
 		- We have hardcoded 10 minutes "local" ttl and max 1024 keys.
 			You're not supposed to work with these numbers, not change them.
+		- Total (serialized) size of values is also capped to `max_bytes`, 128MB by default. This is
+		  only a guard against few huge values, 1024 keys of ~4kb are far below it.
 		- Same keys can be accessed with `frappe.cache` too, but that won't implement invalidation.
 		- Invalidate things as usual using `delete_value`. Local invalidation should be instant.
 		  Do not expect sub-second invalidation guarantees across processes.
@@ -460,16 +714,40 @@ class ClientCache:
 		  default Redis cache behaviour.
 		- Never use `frappe.cache`'s request local cache along with client-side cache. Two
 		  different copies of same key are a big source of data races.
-		- This cache uses simple FIFO eviction policy. Make sure your access patterns don't cause
-		  the worst case behaviour for this policy. E.g. looping over `maxsize` items repeatedly.
+		- This cache uses LRU eviction. Keys are grouped in namespaces (see
+		  `CLIENT_CACHE_NAMESPACES`) and each namespace can only use its share of the capacity, so
+		  looping over all doctype metas can't evict hooks or defaults.
 	"""
 
-	def __init__(self, maxsize: int = 1024, ttl=10 * 60, monitor: RedisWrapper | None = None) -> None:
+	def __init__(
+		self,
+		maxsize: int = 1024,
+		ttl=10 * 60,
+		monitor: RedisWrapper | None = None,
+		max_bytes: int = 128 * 1024 * 1024,
+	) -> None:
 		self.maxsize = maxsize or 1024  # Expect 1024 * 4kb objects ~ 4MB
+		self.max_bytes = max_bytes
 		self.local_ttl = ttl
-		# This guards writes to self.cache, reads are done without a lock.
+		# This guards writes to self.cache and LRU bookkeeping, lookups are done without a lock.
 		self.lock = threading.RLock()
-		self.cache: dict[bytes, CachedValue] = {}
+		self.cache: OrderedDict[bytes, CachedValue] = OrderedDict()
+		self.used_bytes = 0
+
+		self.namespace_prefixes = tuple(
+			(prefix, namespace)
+			for namespace, (prefixes, _share) in CLIENT_CACHE_NAMESPACES.items()
+			for prefix in prefixes
+		)
+		self.namespaces = {
+			namespace: _ClientCacheNamespace(
+				capacity=max(1, int(self.maxsize * share)), max_size=int(self.max_bytes * share)
+			)
+			for namespace, (_prefixes, share) in CLIENT_CACHE_NAMESPACES.items()
+		}
+		self.namespaces[DEFAULT_NAMESPACE] = _ClientCacheNamespace(
+			capacity=self.maxsize, max_size=self.max_bytes
+		)
 
 		self.invalidator = frappe.cache
 		self.healthy = True
@@ -509,22 +787,30 @@ class ClientCache:
 			val = self.cache[key]
 			if time.monotonic() < val.expiry:
 				self.hits += 1
+				self.namespaces[val.namespace].hits += 1
+				with self.lock, suppress(KeyError):
+					self.cache.move_to_end(key)
 				return val.value
 		except KeyError:
 			pass
 
 		self.misses += 1
+		namespace = self.get_namespace(key)
+		self.namespaces[namespace].misses += 1
 
 		# Store a placeholder value to detect race between GET and parallel invalidation.
 		with self.lock:
+			self._remove(key)
 			self.cache[key] = _PLACEHOLDER_VALUE
 
-		val = self.redis.get_value(key, shared=True, use_local_cache=not self.healthy)
+		val, size = self._fetch(key)
 
 		# Note: We should not "cache" the cache-misses in client cache.
 		# This cache is long lived and "misses" are not tracked by redis so they'll never get
 		# invalidated.
 		if val is None:
+			with self.lock:
+				self._remove(key)
 			if generator:
 				val = generator()
 				self.set_value(key, val, shared=True)
@@ -532,27 +818,98 @@ class ClientCache:
 			else:
 				return None
 
-		self.ensure_max_size()
 		with self.lock:
 			# Note: If our placeholder value is not present then it's possible that value we just
 			# got is invalidated, so we should not store it in local cache.
 			if key in self.cache:
-				self.cache[key] = CachedValue(value=val, expiry=time.monotonic() + self.local_ttl)
+				self._store(key, val, namespace, size)
 
 		return val
 
 	def set_value(self, key, val, *, shared=False):
 		key = self.redis.make_key(key, shared=shared)
-		self.ensure_max_size()
-		self.redis.set_value(key, val, shared=True)
+		payload = encode_value(val)
+		frappe.local.cache[key] = val
+		with suppress(redis.exceptions.ConnectionError):
+			self.redis.set(name=key, value=payload)
+
 		with self.lock:
-			self.cache[key] = CachedValue(value=val, expiry=time.monotonic() + self.local_ttl)
+			self._store(key, val, self.get_namespace(key), len(payload))
 		# XXX: We need to tell redis that we indeed read this key we just wrote
 		# This is an edge case:
 		# - Client A writes a key and reads it again from local cache
 		# - Client B overwrites this key, but since client A never "read" it from Redis, Redis
 		#   doesn't send invalidation.
-		_ = self.redis.get_value(key, shared=True, use_local_cache=not self.healthy)
+		self._fetch(key, load=False)
+
+	def _fetch(self, key, *, load=True):
+		"""Return value of `key` from redis along with its serialized size."""
+		try:
+			payload = self.redis.get(key)
+		except redis.exceptions.ConnectionError:
+			return None, 0
+
+		if payload is None or not load:
+			return None, 0
+		if (frozen := _frozen_values.get(key)) and frozen[1] == _digest(payload):
+			# Value is unchanged since it was frozen, reuse the shared copy.
+			return frozen[0], len(payload)
+		return decode_value(payload), len(payload)
+
+	def freeze(self, key, val, *, shared=False):
+		"""Write value to redis and keep it in process memory until it's modified.
+
+		This is meant to be used in master process before forking workers. Frozen values are
+		shared by all forked workers (copy-on-write) and are used instead of deserializing the value
+		from redis as long as the value stored in redis doesn't change."""
+		key = self.redis.make_key(key, shared=shared)
+		payload = encode_value(val)
+		self.redis.set(name=key, value=payload)
+		_frozen_values[key] = (val, _digest(payload))
+
+	def get_namespace(self, key: bytes | str) -> str:
+		if isinstance(key, bytes):
+			key = key.decode()
+		key = key.split("|", 1)[-1]
+		for prefix, namespace in self.namespace_prefixes:
+			if key.startswith(prefix):
+				return namespace
+		return DEFAULT_NAMESPACE
+
+	def _store(self, key, val, namespace: str, size: int):
+		"""Add value to local cache, evicting least recently used values as required. Call with lock."""
+		self._remove(key)
+		ns = self.namespaces[namespace]
+		if size > ns.max_size:
+			return  # Too large to be kept in memory, always read from redis.
+
+		while self.cache and (len(self.cache) >= self.maxsize or self.used_bytes + size > self.max_bytes):
+			self._evict(next(iter(self.cache)))
+
+		while ns.used and (ns.used >= ns.capacity or ns.size + size > ns.max_size):
+			self._evict(next(k for k, v in self.cache.items() if v.namespace == namespace))
+
+		self.cache[key] = CachedValue(
+			value=val, expiry=time.monotonic() + self.local_ttl, namespace=namespace, size=size
+		)
+		ns.used += 1
+		ns.size += size
+		self.used_bytes += size
+
+	def _remove(self, key) -> CachedValue | None:
+		"""Remove key from local cache and update usage. Call with lock."""
+		val = self.cache.pop(key, None)
+		if val is not None and val.namespace:
+			ns = self.namespaces[val.namespace]
+			ns.used -= 1
+			ns.size -= val.size
+			self.used_bytes -= val.size
+		return val
+
+	def _evict(self, key):
+		val = self._remove(key)
+		if val is not None and val.namespace:
+			self.namespaces[val.namespace].evictions += 1
 
 	def get_doc(self, doctype: str, name: str | None = None):
 		"""Utility to fetch and store documents in client cache.
@@ -565,23 +922,23 @@ class ClientCache:
 		key = frappe.get_document_cache_key(doctype, name)
 		return self.get_value(key, generator=lambda: frappe.get_doc(doctype, name))
 
-	def ensure_max_size(self):
-		if len(self.cache) >= self.maxsize:
-			with self.lock, suppress(RuntimeError):
-				self.cache.pop(next(iter(self.cache)), None)
-
 	def delete_value(self, key, *, shared=False):
-		key = self.redis.make_key(key, shared=shared)
-		self.redis.delete_value(key, shared=True)
+		"""Delete value, list of values."""
+		keys = key if isinstance(key, list | tuple) else (key,)
+		keys = [self.redis.make_key(k, shared=shared) for k in keys]
+		self.redis.delete_value(keys, shared=True)
 		with self.lock:
-			self.cache.pop(key, None)
+			for key in keys:
+				_frozen_values.pop(key, None)
+				self._remove(key)
 
 	def delete_keys(self, pattern):
 		keys = self.redis.get_keys(pattern)
 		self.redis.delete_value(keys, shared=True, make_keys=False)
 		with self.lock:
 			for key in keys:
-				self.cache.pop(key, None)
+				_frozen_values.pop(key, None)
+				self._remove(key)
 
 	def run_invalidator_thread(self):
 		self._watcher = self.invalidator.pubsub()
@@ -615,11 +972,13 @@ class ClientCache:
 	def _handle_invalidation(self, message):
 		if message["data"] is None:
 			# Flushall
+			_frozen_values.clear()
 			self.clear_cache()
 			return
 		with self.lock:
 			for key in message["data"]:
-				self.cache.pop(key, None)
+				_frozen_values.pop(key, None)
+				self._remove(key)
 
 	def _handle_persistent_cache_invalidation(self, message):
 		import frappe.utils.caching
@@ -646,9 +1005,19 @@ class ClientCache:
 			self.healthy = False
 			raise
 
+	def close(self):
+		"""Stop invalidator thread and close all connections, e.g. before forking."""
+		if self.invalidator_id:
+			self.invalidator_thread.stop()
+			self.redis.connection_pool.disconnect()
+		self.healthy = False
+
 	def clear_cache(self):
 		with self.lock:
 			self.cache.clear()
+			self.used_bytes = 0
+			for ns in self.namespaces.values():
+				ns.used = ns.size = 0
 
 	@property
 	def statistics(self) -> CacheStatistics:
@@ -660,7 +1029,21 @@ class ClientCache:
 			healthy=self.healthy,
 			utilization=round(len(self.cache) / self.maxsize, 2),
 			hit_ratio=round(self.hits / (self.hits + self.misses), 2) if self.hits else None,
+			namespaces={
+				name: NamespaceStatistics(
+					hits=ns.hits,
+					misses=ns.misses,
+					evictions=ns.evictions,
+					capacity=ns.capacity,
+					used=ns.used,
+					max_size=ns.max_size,
+					size=ns.size,
+				)
+				for name, ns in self.namespaces.items()
+			},
 		)
 
 	def reset_statistics(self):
 		self.hits = self.misses = 0
+		for ns in self.namespaces.values():
+			ns.hits = ns.misses = ns.evictions = 0
@@ -25,6 +25,13 @@ from frappe.utils.caching import redis_cache
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 DEFAULT_SCHEDULER_TICK = 4 * 60
 
+# Present (with a TTL) while no scheduled job of the site is due, sites aren't connected to until it expires.
+NEXT_DUE_CACHE_KEY = "scheduler_next_due"
+# Sites are checked at least this often even if nothing is due
+MAX_TIMETABLE_AGE = 60 * 60
+# Only these fields are needed to find out if a job type is due and enqueue it
+JOB_TYPE_FIELDS = ["name", "method", "frequency", "cron_format", "last_execution", "creation"]
+
 
 def cprint(*args, **kwargs):
 	"""Prints only if called from STDOUT"""
@@ -113,6 +120,9 @@ def enqueue_events_for_site(site: str) -> None:
 
 	try:
 		frappe.init(site)
+		if not is_site_due():
+			return
+
 		frappe.connect()
 		if is_scheduler_inactive():
 			return
@@ -130,21 +140,63 @@ def enqueue_events_for_site(site: str) -> None:
 
 
 def enqueue_events() -> list[str] | None:
-	if schedule_jobs_based_on_activity():
-		enqueued_jobs = []
-		all_jobs = frappe.get_all("Scheduled Job Type", filters={"stopped": 0}, fields="*")
-		random.shuffle(all_jobs)
-		for job_type in all_jobs:
-			job_type = frappe.get_doc(doctype="Scheduled Job Type", **job_type)
-			try:
-				if job_type.enqueue():
-					enqueued_jobs.append(job_type.method)
-			except CroniterBadCronError:
-				frappe.logger("scheduler").error(
-					f"Invalid Job on {frappe.local.site} - {job_type.name}", exc_info=True
-				)
-
-		return enqueued_jobs
+	if not schedule_jobs_based_on_activity():
+		# activity isn't checked again until cached result of `schedule_jobs_based_on_activity` expires
+		update_timetable(None)
+		return
+
+	enqueued_jobs = []
+	current_time = now_datetime()
+	next_due = None
+	all_jobs = frappe.get_all("Scheduled Job Type", filters={"stopped": 0}, fields=JOB_TYPE_FIELDS)
+	random.shuffle(all_jobs)
+	for job_type in all_jobs:
+		job_type = frappe.get_doc(doctype="Scheduled Job Type", **job_type)
+		try:
+			if job_type.enqueue():
+				enqueued_jobs.append(job_type.method)
+
+			next_execution = job_type.get_next_execution()
+			if next_execution <= current_time:
+				# job is queued now (or already was), `last_execution` will be set once it runs
+				next_execution = job_type.get_next_execution(last_execution=current_time)
+		except CroniterBadCronError:
+			frappe.logger("scheduler").error(
+				f"Invalid Job on {frappe.local.site} - {job_type.name}", exc_info=True
+			)
+			continue
+
+		next_due = min(next_due or next_execution, next_execution)
+
+	update_timetable(next_due, current_time)
+	return enqueued_jobs
+
+
+def is_site_due() -> bool:
+	"""Check if any scheduled job of current site might be due, doesn't need a database connection."""
+	try:
+		return not frappe.cache.get_value(NEXT_DUE_CACHE_KEY)
+	except Exception:
+		return True
+
+
+def update_timetable(next_due: datetime.datetime | None, current_time: datetime.datetime | None = None):
+	"""Skip current site in scheduler ticks until `next_due`, or for `MAX_TIMETABLE_AGE` if it's not set."""
+	current_time = current_time or now_datetime()
+	wait = MAX_TIMETABLE_AGE
+	if next_due:
+		wait = min(int((next_due - current_time).total_seconds()), MAX_TIMETABLE_AGE)
+
+	if wait > 0:
+		wake_at = current_time + datetime.timedelta(seconds=wait)
+		frappe.cache.set_value(NEXT_DUE_CACHE_KEY, str(wake_at), expires_in_sec=wait)
+	else:
+		clear_timetable()
+
+
+def clear_timetable():
+	"""Make scheduler check current site again in next tick, called when scheduled job types change."""
+	frappe.cache.delete_value(NEXT_DUE_CACHE_KEY)
 
 
 def is_scheduler_inactive(verbose=True) -> bool:
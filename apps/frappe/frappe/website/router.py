@@ -99,7 +99,7 @@ def get_pages(app=None):
 
 		return pages
 
-	return frappe.cache.get_value("website_pages", lambda: _build(app))
+	return frappe.cache.get_value("website_pages", lambda: _build(app), single_flight=True)
 
 
 def get_pages_from_path(start, app, app_path):